@@ -0,0 +1,146 @@
+"""
+JSON API for the kiosk and mobile clients, versioned under /api/v1.
+
+The routes live in app.py with the rest of the app and run the same queries as the
+passenger pages (flight_search, PASSENGER_BOOKINGS_SQL, the catalogue's vendors, the
+book_flight procedure). This module holds what the API sends and receives:
+msgspec Structs that fix each payload's fields and types, and the encoder that writes
+them. msgspec.convert() turns the query rows (dicts) into Structs, ignoring extra
+columns. The encoder writes straight to JSON bytes without building an intermediate
+dict per row. That is an order of magnitude faster than jsonify, with slightly smaller
+payloads (see benchmarks/bench_api.py).
+
+Fares and amounts are JSON numbers, times ISO 8601 local times without an offset (as
+stored). Errors are {"error": "..."} with a 4xx status, or 500 when a query failed.
+
+Clients log in the same way as the website (POST /login/passenger) and send the
+session cookie.
+"""
+import datetime
+import decimal
+
+import msgspec
+from flask import Response
+
+API_PREFIX = '/api/v1'
+
+encoder = msgspec.json.Encoder(decimal_format='number')
+
+
+# ============================================
+# Payloads
+# ============================================
+
+class Flight(msgspec.Struct):
+    """A row of the upcoming_flights view."""
+    flight_id: int
+    flight_no: str
+    airline: str | None
+    route_id: int
+    source_code: str | None
+    source_name: str | None
+    dest_code: str | None
+    dest_name: str | None
+    departure_time: datetime.datetime | None
+    arrival_time: datetime.datetime | None
+    current_fare: decimal.Decimal | None
+    status: str | None
+    gate: str | None
+    aircraft_model: str | None
+    capacity: int | None
+    seats_booked: int
+    seats_remaining: int
+    load_factor: decimal.Decimal | None
+
+
+class FlightList(msgspec.Struct):
+    flights: list[Flight]
+
+
+class Seat(msgspec.Struct):
+    seat: str
+    taken: bool
+
+
+class SeatMap(msgspec.Struct):
+    """SeatMaps.for_flight()."""
+    layout: str
+    capacity: int
+    available_count: int
+    available: list[str]
+    next_free: str | None
+    rows: list[list[Seat]]
+
+
+class FlightDetail(msgspec.Struct):
+    flight: Flight
+    seats: SeatMap | None
+
+
+class Booking(msgspec.Struct):
+    """A row of PASSENGER_BOOKINGS_SQL."""
+    booking_id: int
+    status: str | None
+    booking_date: datetime.datetime | None
+    flight_no: str
+    airline: str | None
+    source_name: str | None
+    dest_name: str | None
+    departure_time: datetime.datetime | None
+    arrival_time: datetime.datetime | None
+    seat_no: str | None
+    amount: decimal.Decimal
+
+
+class BookingList(msgspec.Struct):
+    bookings: list[Booking]
+
+
+class BookingRequest(msgspec.Struct, forbid_unknown_fields=True):
+    """Body of POST /api/v1/bookings. Left blank, seat_no is auto-assigned."""
+    flight_id: int
+    seat_no: str = ''
+
+
+class BookingResult(msgspec.Struct):
+    booking_id: int
+    seat_no: str | None
+    status: str
+
+
+class Vendor(msgspec.Struct):
+    vendor_id: int
+    name: str | None
+    amenity_type: str | None
+    terminal: str | None
+    location_desc: str | None
+
+
+class VendorList(msgspec.Struct):
+    vendors: list[Vendor]
+
+
+class Error(msgspec.Struct):
+    error: str
+
+
+# ============================================
+# Encoding
+# ============================================
+
+def convert(rows, payload_type):
+    """Query rows (dicts, or a list of them) as the given Struct type; extra columns are ignored."""
+    return msgspec.convert(rows, payload_type)
+
+
+def respond(payload, status=200):
+    return Response(encoder.encode(payload), status=status, mimetype='application/json')
+
+
+def error(status, message):
+    return respond(Error(error=message), status)
+
+
+def decode(body, payload_type):
+    """A request body as the given Struct. Raises msgspec.ValidationError / DecodeError on bad input."""
+    return msgspec.json.decode(body, type=payload_type)
@@ -1,21 +1,154 @@
 import mysql.connector
-from mysql.connector import pooling
-from flask import Flask, render_template, request, redirect, url_for, session, flash, g
+from flask import Flask, render_template, request, redirect, url_for, session, flash, g, jsonify, Response, abort, has_request_context, get_flashed_messages
 from functools import wraps
+import click
 from db_config import config # Import config from db_config.py
+from flight_search import FlightSearch, full_scans
+from catalogue import CatalogueCache
+from dashboard_stats import CounterRefresh, DashboardStats
+from pagination import KeysetPager
+import exports
+from schedule_import import ScheduleImporter, read_schedule, read_upload
+from seat_map import SeatMaps, rebuild as rebuild_seat_maps
+from query_stats import QueryInstrumentation
+from metrics import Metrics
+from db_pool import ConnectionPool
+from db_router import DatabaseRouter, is_read, parse_replicas
+from query_batch import QueryBatch
+from audit_writer import AuditWriter
+from jobs import JobQueue, FlightStatusJob, Worker
+from pricing import FareRepricer
+from cachelib import FileSystemCache
+from flask_session import Session
+from user_profiles import UserProfiles
+from login_guard import RateLimiter, KnownLogins
+from render_cache import RenderCache
+import api
+import msgspec
+import passwords
 import datetime
+import math
+import os
+import tempfile
+import time
 
 app = Flask(__name__)
 app.secret_key = 'your_very_secret_key_for_flask_session'
 
+# ============================================
+# Settings (override with environment variables)
+# ============================================
+app.config.update(
+    # Directory of the cache shared by all worker processes on this host
+    SHARED_CACHE_DIR=os.environ.get('AIRLINE_SHARED_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'airline_cache')),
+    # Seconds the admin dashboard stats stay cached
+    STATS_CACHE_TTL=int(os.environ.get('AIRLINE_STATS_CACHE_TTL', 30)),
+    # Read the dashboard_counter table instead of counting rows, and seconds between the
+    # worker's recomputes of that table (only scheduled when the counters are read)
+    STATS_USE_COUNTERS=os.environ.get('AIRLINE_STATS_USE_COUNTERS', '0') == '1',
+    STATS_COUNTERS_INTERVAL=int(os.environ.get('AIRLINE_STATS_COUNTERS_INTERVAL', 60)),
+    # Statements slower than this many ms go to the slow-query log
+    SLOW_QUERY_MS=int(os.environ.get('AIRLINE_SLOW_QUERY_MS', 200)),
+    # Slow-query log file (JSON lines), stderr when unset
+    SLOW_QUERY_LOG=os.environ.get('AIRLINE_SLOW_QUERY_LOG'),
+    # Warn when one statement runs more than this many times in a request
+    N_PLUS_ONE_THRESHOLD=int(os.environ.get('AIRLINE_N_PLUS_ONE_THRESHOLD', 5)),
+    # Add a Server-Timing header with db / pool / app durations to every response
+    SERVER_TIMING=os.environ.get('AIRLINE_SERVER_TIMING', '1') == '1',
+    # Where each worker process writes its metrics snapshot for /metrics
+    METRICS_DIR=os.environ.get('AIRLINE_METRICS_DIR', os.path.join(tempfile.gettempdir(), 'airline_metrics')),
+    # Seconds between metrics snapshots
+    METRICS_FLUSH_SECONDS=float(os.environ.get('AIRLINE_METRICS_FLUSH_SECONDS', 5)),
+    # Connection pool: connections kept open, extra ones allowed under bursts,
+    # seconds a request waits for a free connection, and connection recycling
+    DB_POOL_SIZE=int(os.environ.get('AIRLINE_DB_POOL_SIZE', 10)),
+    DB_POOL_OVERFLOW=int(os.environ.get('AIRLINE_DB_POOL_OVERFLOW', 10)),
+    DB_POOL_TIMEOUT=float(os.environ.get('AIRLINE_DB_POOL_TIMEOUT', 5)),
+    DB_POOL_MAX_LIFETIME=int(os.environ.get('AIRLINE_DB_POOL_MAX_LIFETIME', 1800)),
+    DB_POOL_PING_AFTER=float(os.environ.get('AIRLINE_DB_POOL_PING_AFTER', 5)),
+    # Read replicas as 'host[:port],host[:port]' (same credentials as db_config), none by default
+    DB_REPLICAS=parse_replicas(os.environ.get('AIRLINE_DB_REPLICAS', '')),
+    # How reads pick a replica: round_robin or least_loaded
+    DB_REPLICA_STRATEGY=os.environ.get('AIRLINE_DB_REPLICA_STRATEGY', 'round_robin'),
+    # Seconds a session keeps reading from the primary after it writes (read-your-writes)
+    DB_STICKY_SECONDS=float(os.environ.get('AIRLINE_DB_STICKY_SECONDS', 5)),
+    # Threads that run the independent reads of a page concurrently (db_batch)
+    DB_BATCH_WORKERS=int(os.environ.get('AIRLINE_DB_BATCH_WORKERS', 8)),
+    # Audit rows the app writes are batched: rows per INSERT, and seconds a row may wait
+    AUDIT_BATCH_SIZE=int(os.environ.get('AIRLINE_AUDIT_BATCH_SIZE', 200)),
+    AUDIT_FLUSH_SECONDS=float(os.environ.get('AIRLINE_AUDIT_FLUSH_SECONDS', 1)),
+    # Months of audit_log kept by 'flask audit-retention' (older months are archived, then dropped)
+    AUDIT_RETENTION_MONTHS=int(os.environ.get('AIRLINE_AUDIT_RETENTION_MONTHS', 12)),
+    # Background worker (flask worker): seconds between flight status runs, seconds between
+    # looks at an empty job queue, and flights updated per transaction
+    JOB_STATUS_INTERVAL=int(os.environ.get('AIRLINE_JOB_STATUS_INTERVAL', 60)),
+    JOB_POLL_SECONDS=float(os.environ.get('AIRLINE_JOB_POLL_SECONDS', 1)),
+    JOB_STATUS_BATCH_SIZE=int(os.environ.get('AIRLINE_JOB_STATUS_BATCH_SIZE', 500)),
+    # Seconds between the worker's fare repricing runs (see pricing.py)
+    JOB_REPRICE_INTERVAL=int(os.environ.get('AIRLINE_JOB_REPRICE_INTERVAL', 300)),
+    # Server-side sessions: directory shared by the worker processes, hours a login lasts,
+    # and most sessions kept on disk
+    SESSION_DIR=os.environ.get('AIRLINE_SESSION_DIR', os.path.join(tempfile.gettempdir(), 'airline_sessions')),
+    PERMANENT_SESSION_LIFETIME=datetime.timedelta(hours=float(os.environ.get('AIRLINE_SESSION_HOURS', 12))),
+    SESSION_MAX_ENTRIES=int(os.environ.get('AIRLINE_SESSION_MAX_ENTRIES', 10000)),
+    # Seconds a logged-in user's profile stays cached (see user_profiles.py)
+    PROFILE_CACHE_TTL=int(os.environ.get('AIRLINE_PROFILE_CACHE_TTL', 3600)),
+    # How admin passwords are hashed, work factor included (see passwords.py)
+    PASSWORD_HASH_METHOD=os.environ.get('AIRLINE_PASSWORD_HASH_METHOD', passwords.DEFAULT_METHOD),
+    # Login attempts allowed per minute and in a row, per client IP and per account (see login_guard.py)
+    LOGIN_IP_PER_MINUTE=float(os.environ.get('AIRLINE_LOGIN_IP_PER_MINUTE', 30)),
+    LOGIN_IP_BURST=int(os.environ.get('AIRLINE_LOGIN_IP_BURST', 10)),
+    LOGIN_ACCOUNT_PER_MINUTE=float(os.environ.get('AIRLINE_LOGIN_ACCOUNT_PER_MINUTE', 5)),
+    LOGIN_ACCOUNT_BURST=int(os.environ.get('AIRLINE_LOGIN_ACCOUNT_BURST', 5)),
+    # Filter of known passport numbers and employee emails: shared directory, and seconds
+    # between the worker's rebuilds
+    LOGIN_FILTER_DIR=os.environ.get('AIRLINE_LOGIN_FILTER_DIR', os.path.join(tempfile.gettempdir(), 'airline_login_filter')),
+    LOGIN_FILTER_INTERVAL=int(os.environ.get('AIRLINE_LOGIN_FILTER_INTERVAL', 600)),
+    # Seconds a table's data version lives without a change, which bounds how long a cached
+    # template fragment or a browser's 304 can miss a change made outside the app (see render_cache.py)
+    RENDER_CACHE_TTL=int(os.environ.get('AIRLINE_RENDER_CACHE_TTL', 60)),
+)
+
+# Cache shared across worker processes
+shared_cache = FileSystemCache(app.config['SHARED_CACHE_DIR'], default_timeout=300)
+
+# Sessions live on the server, one file each; the cookie only holds the session id
+app.config.update(
+    SESSION_TYPE='cachelib',
+    SESSION_CACHELIB=FileSystemCache(app.config['SESSION_DIR'], threshold=app.config['SESSION_MAX_ENTRIES']),
+)
+Session(app)
+
+# Template fragments and dashboard ETags, keyed by the versions of the tables they show
+render_cache = RenderCache(shared_cache, ttl=app.config['RENDER_CACHE_TTL'])
+render_cache.init_app(app)
+
+# Per-request query counts, timings, slow-query log and N+1 warnings (see query_stats.py)
+instrumentation = QueryInstrumentation(app)
+
+# Prometheus metrics at /metrics, aggregated across worker processes (see metrics.py)
+metrics = Metrics(app.config['METRICS_DIR'], app.config['METRICS_FLUSH_SECONDS'])
+metrics.init_app(app)
+metrics.counter('airline_bookings_total', 'Successful flight bookings')
+metrics.counter('airline_cancellations_total', 'Bookings cancelled by passengers')
+metrics.counter('airline_booking_errors_total', 'Bookings rejected by the database (SQLSTATE 45000), by message')
+metrics.counter('airline_login_attempts_total', 'Login attempts by role and outcome')
+metrics.counter('airline_db_pool_exhausted_total', 'Requests that gave up waiting for a pooled connection')
+
 # =G===========================================
 # Database Connection Pool
 # =G===========================================
 try:
-    # Create a connection pool
-    pool = mysql.connector.pooling.MySQLConnectionPool(
+    # Create a connection pool (see db_pool.py)
+    pool = ConnectionPool(
         pool_name="airline_pool",
-        pool_size=10,
+        pool_size=app.config['DB_POOL_SIZE'],
+        max_overflow=app.config['DB_POOL_OVERFLOW'],
+        timeout=app.config['DB_POOL_TIMEOUT'],
+        max_lifetime=app.config['DB_POOL_MAX_LIFETIME'],
+        ping_after=app.config['DB_POOL_PING_AFTER'],
+        # book_flight and the cancellation trigger leave their audit rows to audit_writer
+        user_variables={'audit_deferred': 1},
         **config
     )
     print("✅ Database connection pool created successfully.")
@@ -23,22 +156,102 @@ except mysql.connector.Error as err:
     print(f"❌ Error creating connection pool: {err}")
     exit(1)
 
+# Replica pools connect lazily, so a replica that is down doesn't stop the app starting
+replica_pools = {
+    f"{host}:{port}": ConnectionPool(
+        pool_name=f"airline_replica_{n}",
+        pool_size=app.config['DB_POOL_SIZE'],
+        max_overflow=app.config['DB_POOL_OVERFLOW'],
+        timeout=app.config['DB_POOL_TIMEOUT'],
+        max_lifetime=app.config['DB_POOL_MAX_LIFETIME'],
+        ping_after=app.config['DB_POOL_PING_AFTER'],
+        prefill=False,
+        **dict(config, host=host, port=port)
+    )
+    for n, (host, port) in enumerate(app.config['DB_REPLICAS'], start=1)
+}
+
+# Routes reads to the replicas and writes / CALLs to the primary (see db_router.py)
+router = DatabaseRouter(pool, replica_pools,
+                        strategy=app.config['DB_REPLICA_STRATEGY'],
+                        sticky_seconds=app.config['DB_STICKY_SECONDS'])
+
+def pool_connections():
+    values = {}
+    for name, endpoint_pool in router.pools().items():
+        stats = endpoint_pool.stats()
+        values[(('pool', name), ('state', 'idle'))] = stats['idle']
+        values[(('pool', name), ('state', 'in_use'))] = stats['in_use']
+    return values
+
+metrics.gauge('airline_db_pool_connections', 'Pooled connections by endpoint and state', pool_connections)
+metrics.gauge('airline_db_pool_waiters', 'Requests waiting for a pooled connection',
+              lambda: {(('pool', name),): p.stats()['waiting'] for name, p in router.pools().items()})
+
+def pool_events():
+    values = {}
+    for name, endpoint_pool in router.pools().items():
+        stats = endpoint_pool.stats()
+        for event in ('checkouts', 'waits', 'timeouts', 'created', 'recycled', 'broken', 'overflow_closed'):
+            values[(('pool', name), ('event', event))] = stats[event]
+    return values
+
+metrics.gauge('airline_db_pool_events', 'Pool checkouts, waits, timeouts and recycled connections since start', pool_events)
+
 # Helper function to get a connection from the pool
-def get_db_connection():
+def get_db_connection(read=False):
+    """
+    The request's primary connection, or with read=True its replica connection
+    (which is the primary when no replica is configured or reachable).
+    """
     try:
+        if read:
+            if 'db_read' not in g:
+                started = time.perf_counter()
+                g.db_endpoint, g.db_read = router.read_connection()
+                instrumentation.record_pool_wait(time.perf_counter() - started)
+            return g.db_read
         if 'db' not in g:
+            started = time.perf_counter()
             g.db = pool.get_connection()
+            instrumentation.record_pool_wait(time.perf_counter() - started)
         return g.db
     except mysql.connector.Error as err:
+        if isinstance(err, mysql.connector.errors.PoolError):
+            metrics.inc('airline_db_pool_exhausted_total')
         print(f"❌ Error getting connection from pool: {err}")
         return None
 
 # Helper function to close connection
 @app.teardown_appcontext
 def close_db_connection(exception=None):
-    db = g.pop('db', None)
-    if db is not None:
-        db.close()
+    for name in ('db', 'db_read'):
+        db = g.pop(name, None)
+        if db is not None:
+            db.close()
+
+def replica_reads_allowed():
+    """False once this request or the user's session has written (read-your-writes)."""
+    return (bool(router.replicas) and not g.get('_wrote')
+            and not (has_request_context() and router.is_sticky(session)))
+
+def borrow_connection(read):
+    """
+    A connection of its own for a db_batch statement, given back by close(). It doesn't
+    wait for one to free up: db_batch runs the statement on the request's connection instead.
+    """
+    return router.read_connection(timeout=0)[1] if read else pool.get_connection(timeout=0)
+
+# Runs independent reads concurrently on their own connections (see query_batch.py)
+query_batch = QueryBatch(borrow_connection, max_workers=app.config['DB_BATCH_WORKERS'])
+
+# Batched, background audit_log writes (see audit_writer.py)
+audit = AuditWriter(pool.get_connection,
+                    batch_size=app.config['AUDIT_BATCH_SIZE'],
+                    flush_interval=app.config['AUDIT_FLUSH_SECONDS'])
+
+metrics.gauge('airline_audit_rows', 'Audit rows logged, written and still queued by the background writer',
+              lambda: {(('state', state),): audit.stats()[state] for state in ('logged', 'written', 'queued')})
 
 # =G===========================================
 # Database Query Helper
@@ -54,7 +267,10 @@ def db_query(query, params=None, commit=False, fetchone=False, fetchall=False):
     :param fetchall: Boolean, True if all results are expected
     :return: Query result or last insert ID
     """
-    conn = get_db_connection()
+    # Plain reads go to a replica, unless this request or session has just written
+    write = commit or not is_read(query)
+    read = not write and replica_reads_allowed()
+    conn = get_db_connection(read=read)
     if not conn:
         flash("Database connection error.", "danger")
         return None
@@ -62,6 +278,7 @@ def db_query(query, params=None, commit=False, fetchone=False, fetchall=False):
     cursor = conn.cursor(dictionary=True) # dictionary=True returns results as dicts
     last_id = None
     
+    started = time.perf_counter()
     try:
         cursor.execute(query, params or ())
         
@@ -76,14 +293,24 @@ def db_query(query, params=None, commit=False, fetchone=False, fetchall=False):
             result = cursor.fetchone()
         elif fetchall:
             result = cursor.fetchall()
-            
+        
+        if write:
+            # Read-your-writes: keep this request and the session on the primary
+            g._wrote = True
+            if has_request_context():
+                router.stick(session)
+        
+        rows = len(result) if fetchall and result else (1 if result else cursor.rowcount)
+        instrumentation.record(query, params, time.perf_counter() - started, rows)
         return last_id or result
 
     except mysql.connector.Error as err:
+        instrumentation.record(query, params, time.perf_counter() - started, 0)
         conn.rollback() # Rollback on error
         print(f"❌ SQL Error: {err}")
         # Check for specific SQLSTATE errors from procedures
         if err.sqlstate == '45000':
+            metrics.inc('airline_booking_errors_total', message=err.msg)
             flash(f"Booking Error: {err.msg}", "danger")
         else:
             flash(f"Database error: {err.msg}", "danger")
@@ -91,10 +318,105 @@ def db_query(query, params=None, commit=False, fetchone=False, fetchall=False):
     finally:
         cursor.close()
 
+def db_batch(**statements):
+    """
+    Runs independent reads at the same time, each on its own pooled connection, so a page
+    waits for its slowest query instead of the sum of them (see query_batch.py).
+    :param statements: name=(sql, params) for all rows, name=(sql, params, 'one') for one row
+    :return: {name: result}, None for a statement that failed (the error is flashed like db_query does)
+    """
+    for spec in statements.values():
+        if not is_read(spec[0]):
+            raise ValueError(f"db_batch only runs plain reads, got: {spec[0].split()[0]}")
+    if len(statements) < 2:
+        return {name: db_query(spec[0], spec[1], fetchone=spec[2:] == ('one',), fetchall=spec[2:] != ('one',))
+                for name, spec in statements.items()}
+
+    results = {}
+    for name, outcome in query_batch.run(statements, read=replica_reads_allowed()).items():
+        sql, params = statements[name][:2]
+        if isinstance(outcome.error, mysql.connector.errors.PoolError):
+            # No spare connection right now: run it on the request's own connection instead
+            one = statements[name][2:] == ('one',)
+            results[name] = db_query(sql, params, fetchone=one, fetchall=not one)
+            continue
+        instrumentation.record_pool_wait(outcome.wait)
+        instrumentation.record(sql, params, outcome.seconds, outcome.rows)
+        if outcome.error is not None:
+            print(f"❌ SQL Error: {outcome.error}")
+            flash(f"Database error: {outcome.error.msg}", "danger")
+        results[name] = outcome.result
+    return results
+
+# Cached route / aircraft / vendor catalogue (see catalogue.py)
+catalogue = CatalogueCache(db_query, versions=render_cache.versions)
+
+# Shared passenger flight search (index-backed, see flight_search.py)
+flight_search = FlightSearch(db_query, catalogue)
+
+# Per-flight seat bitmaps behind the seat picker and auto-assign
+seat_maps = SeatMaps(db_query)
+
+def db_batch_with_catalogue(sections, **statements):
+    """
+    db_batch that also loads any of the given catalogue sections which aren't cached,
+    alongside the page's own queries.
+    """
+    pending = catalogue.pending(*sections)
+    results = db_batch(**statements, **{f'_catalogue_{name}': (sql, ()) for name, sql in pending.items()})
+    for name in pending:
+        catalogue.fill(name, results.pop(f'_catalogue_{name}'))
+    return results
+
+# Admin dashboard stats: one query, TTL-cached across workers (see dashboard_stats.py)
+dashboard_stats = DashboardStats(db_query, shared_cache,
+                                 ttl=app.config['STATS_CACHE_TTL'],
+                                 use_counters=app.config['STATS_USE_COUNTERS'])
+
+# Background jobs, run by 'flask worker' (see jobs.py)
+def flight_statuses_changed():
+    dashboard_stats.invalidate()
+    render_cache.bump('flight', 'booking')
+
+job_queue = JobQueue(pool)
+flight_status_job = FlightStatusJob(pool, batch_size=app.config['JOB_STATUS_BATCH_SIZE'],
+                                    on_change=flight_statuses_changed, queue=job_queue)
+fare_repricer = FareRepricer(pool, on_change=lambda: render_cache.bump('flight'))
+# Bloom filter of the passport numbers and employee emails logins may use (see login_guard.py)
+known_logins = KnownLogins(pool, app.config['LOGIN_FILTER_DIR'])
+# dashboard_counter is recomputed here rather than by triggers on every write
+counter_refresh = CounterRefresh(pool, on_change=dashboard_stats.invalidate)
+JOBS = {'flight_status': flight_status_job, 'reprice': fare_repricer, 'login_filter': known_logins,
+        'dashboard_counters': counter_refresh}
+
+# Profiles of logged-in users, cached at login (see user_profiles.py)
+profiles = UserProfiles(db_query, shared_cache, ttl=app.config['PROFILE_CACHE_TTL'])
+
+# Login attempts are rate limited per client IP and per account, in this process's memory
+login_ip_limiter = RateLimiter(app.config['LOGIN_IP_PER_MINUTE'] / 60, app.config['LOGIN_IP_BURST'])
+login_account_limiter = RateLimiter(app.config['LOGIN_ACCOUNT_PER_MINUTE'] / 60, app.config['LOGIN_ACCOUNT_BURST'])
+
 # ============================================
 # Authentication & Decorators
 # ============================================
 
+def current_user():
+    """The logged-in user's cached profile (see user_profiles.py), None when logged out."""
+    if 'user_id' not in session:
+        return None
+    return profiles.get(session['role'], session['user_id'])
+
+def login_throttle(role, account):
+    """Seconds the client has to wait before this login attempt is allowed, 0 when it may go ahead."""
+    return (login_ip_limiter.acquire(request.remote_addr or '-')
+            or login_account_limiter.acquire(f"{role}:{account.strip().casefold()}"))
+
+def login_throttled(role, template, wait):
+    """The login page again with 429 Too Many Requests, without touching the database."""
+    metrics.inc('airline_login_attempts_total', role=role, outcome='throttled')
+    flash(f"Too many login attempts. Please try again in {math.ceil(wait)} seconds.", "danger")
+    return render_template(template), 429, {'Retry-After': str(math.ceil(wait))}
+
 def login_required(role=None):
     """Decorator to protect routes based on user role."""
     def decorator(f):
@@ -114,6 +436,19 @@ def login_required(role=None):
         return decorated_function
     return decorator
 
+def api_login_required(role):
+    """login_required for the JSON API: 401 / 403 errors instead of redirects."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if 'user_id' not in session:
+                return api.error(401, "Please log in first (POST /login/passenger).")
+            if session.get('role') != role:
+                return api.error(403, f"Requires '{role}' role.")
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
 # ============================================
 # Main & Login Routes
 # ============================================
@@ -130,13 +465,27 @@ def login_admin():
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
+        wait = login_throttle('admin', username)
+        if wait:
+            return login_throttled('admin', 'login_admin.html', wait)
         
-        admin = db_query("SELECT * FROM admin WHERE username = %s AND password = %s", (username, password), fetchone=True)
+        admin = db_query("SELECT * FROM admin WHERE username = %s", (username,), fetchone=True)
+        method = app.config['PASSWORD_HASH_METHOD']
+        matches, rehash = passwords.verify(admin['password'] if admin else None, password, method)
+        if not matches:
+            admin = None
+        elif rehash:
+            # Plaintext from before hashing, or a hash with another work factor
+            db_query("UPDATE admin SET password = %s WHERE admin_id = %s",
+                     (passwords.hash_password(password, method), admin['admin_id']), commit=True)
+        
+        metrics.inc('airline_login_attempts_total', role='admin', outcome='success' if admin else 'failure')
         
         if admin:
             session['user_id'] = admin['admin_id']
             session['name'] = admin['full_name']
             session['role'] = 'admin'
+            profiles.store('admin', admin['admin_id'], admin)
             flash(f"Welcome, {admin['full_name']}!", "success")
             return redirect(url_for('dashboard_admin'))
         else:
@@ -148,13 +497,23 @@ def login_admin():
 def login_passenger():
     if request.method == 'POST':
         passport_no = request.form['passport_no']
+        wait = login_throttle('passenger', passport_no)
+        if wait:
+            return login_throttled('passenger', 'login_passenger.html', wait)
         
-        passenger = db_query("SELECT * FROM passenger WHERE passport_no = %s", (passport_no,), fetchone=True)
+        if known_logins.might_exist('passenger', passport_no):
+            passenger = db_query("SELECT * FROM passenger WHERE passport_no = %s", (passport_no,), fetchone=True)
+            outcome = 'success' if passenger else 'failure'
+        else:
+            passenger, outcome = None, 'unknown'
+        
+        metrics.inc('airline_login_attempts_total', role='passenger', outcome=outcome)
         
         if passenger:
             session['user_id'] = passenger['passenger_id']
             session['name'] = passenger['name']
             session['role'] = 'passenger'
+            profiles.store('passenger', passenger['passenger_id'], passenger)
             flash(f"Welcome, {passenger['name']}!", "success")
             return redirect(url_for('dashboard_passenger'))
         else:
@@ -167,13 +526,23 @@ def login_employee():
     if request.method == 'POST':
         email = request.form['email']
         doj = request.form['date_of_joining']
+        wait = login_throttle('employee', email)
+        if wait:
+            return login_throttled('employee', 'login_employee.html', wait)
+        
+        if known_logins.might_exist('employee', email):
+            employee = db_query("SELECT * FROM employee WHERE email = %s AND date_of_joining = %s", (email, doj), fetchone=True)
+            outcome = 'success' if employee else 'failure'
+        else:
+            employee, outcome = None, 'unknown'
         
-        employee = db_query("SELECT * FROM employee WHERE email = %s AND date_of_joining = %s", (email, doj), fetchone=True)
+        metrics.inc('airline_login_attempts_total', role='employee', outcome=outcome)
         
         if employee:
             session['user_id'] = employee['emp_id']
             session['name'] = employee['name']
             session['role'] = 'employee'
+            profiles.store('employee', employee['emp_id'], employee)
             flash(f"Welcome, {employee['name']}!", "success")
             return redirect(url_for('dashboard_employee'))
         else:
@@ -183,6 +552,8 @@ def login_employee():
 
 @app.route('/logout')
 def logout():
+    if 'user_id' in session:
+        profiles.evict(session['role'], session['user_id'])
     session.clear()
     flash("You have been logged out.", "success")
     return redirect(url_for('index'))
@@ -191,58 +562,128 @@ def logout():
 # Admin Dashboard & CRUD
 # ============================================
 
+# Keyset pagination for the admin listings (see pagination.py)
+ADMIN_PAGERS = {
+    'passengers': KeysetPager("SELECT * FROM passenger",
+                              [('name', 'name'), ('passenger_id', 'passenger_id')]),
+    'employees': KeysetPager("SELECT * FROM employee",
+                             [('name', 'name'), ('emp_id', 'emp_id')]),
+    'bookings': KeysetPager("""
+            SELECT b.*, p.name, f.flight_no 
+            FROM booking b
+            JOIN passenger p ON b.passenger_id = p.passenger_id
+            JOIN flight f ON b.flight_id = f.flight_id
+        """, [('b.booking_date', 'booking_date'), ('b.booking_id', 'booking_id')], descending=True),
+    'payroll': KeysetPager("""
+            SELECT pr.*, e.name, e.role
+            FROM payroll pr
+            JOIN employee e ON pr.emp_id = e.emp_id
+        """, [('pr.pay_date', 'pay_date'), ('pr.payroll_id', 'payroll_id')], descending=True),
+    'reports': KeysetPager("""
+            SELECT s.passenger_id, p.name, p.email, p.passport_no, p.total_points,
+                   s.total_bookings, s.total_spent
+            FROM passenger_summary_mv s
+            JOIN passenger p ON p.passenger_id = s.passenger_id
+        """, [('s.total_spent', 'total_spent'), ('s.passenger_id', 'passenger_id')], descending=True),
+}
+
+# Optional filters per listing: query param -> SQL condition
+ADMIN_FILTERS = {
+    'bookings': {
+        'status': "b.status = %s",
+        'since': "b.booking_date >= %s",
+        'until': "b.booking_date < %s",
+    },
+    'payroll': {
+        'emp_id': "pr.emp_id = %s",
+        'since': "pr.pay_date >= %s",
+        'until': "pr.pay_date < %s",
+    },
+}
+
+def admin_filter_args(section):
+    """The filter params present on the request for a listing, e.g. {'status': 'Confirmed'}."""
+    return {arg: request.args[arg] for arg in ADMIN_FILTERS.get(section, {}) if request.args.get(arg)}
+
+def admin_filters(section):
+    """Builds the WHERE clause for a listing from the request's filter params."""
+    args = admin_filter_args(section)
+    conditions = [ADMIN_FILTERS[section][arg] for arg in args]
+    return ' AND '.join(conditions) or None, tuple(args.values())
+
+def admin_page_query(section):
+    """(sql, params, state) for the current page of an admin listing, see KeysetPager.build."""
+    where, params = admin_filters(section)
+    return ADMIN_PAGERS[section].build(
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+        size=request.args.get('size'),
+        where=where,
+        params=params,
+    )
+
+def admin_page(section):
+    """Fetches the current page of an admin listing using the after/before/size query params."""
+    sql, params, state = admin_page_query(section)
+    return ADMIN_PAGERS[section].to_page(db_query(sql, params, fetchall=True), state)
+
+UPCOMING_FLIGHTS_SQL = "SELECT * FROM upcoming_flights ORDER BY departure_time"
+PAYROLL_EMPLOYEES_SQL = "SELECT emp_id, name, salary FROM employee"
+
+# Tables each admin page is rendered from, for its ETag (None: always rendered)
+ADMIN_PAGE_TABLES = {
+    'dashboard': ('flight', 'booking', 'passenger', 'employee'),
+    'passengers': ('passenger', 'booking'),
+    'employees': ('employee',),
+    'flights': ('flight', 'booking', 'route', 'aircraft'),
+    'bookings': ('booking', 'flight', 'passenger'),
+    'vendors': ('vendor',),
+    'payroll': ('payroll', 'employee'),
+    'reports': ('booking', 'passenger'),
+    'audit': None,
+}
+
 @app.route('/dashboard/admin')
 @login_required(role='admin')
+@render_cache.conditional(lambda: ADMIN_PAGE_TABLES.get(request.args.get('page', 'dashboard')))
 def dashboard_admin():
     """Main admin dashboard page. Uses 'page' query param to render different sections."""
     page = request.args.get('page', 'dashboard')
-    data = {}
+    data = {'filters': admin_filter_args(page)}
     
     if page == 'dashboard':
-        stats = {
-            'passengers': db_query("SELECT COUNT(*) AS c FROM passenger", fetchone=True)['c'],
-            'employees': db_query("SELECT COUNT(*) AS c FROM employee", fetchone=True)['c'],
-            'flights': db_query("SELECT COUNT(*) AS c FROM flight WHERE status = 'Scheduled'", fetchone=True)['c'],
-            'bookings': db_query("SELECT COUNT(*) AS c FROM booking WHERE status = 'Confirmed'", fetchone=True)['c'],
-        }
-        data['stats'] = stats
+        data['stats'] = dashboard_stats.get()
     
     elif page == 'passengers':
-        data['passengers'] = db_query("SELECT * FROM passenger ORDER BY name", fetchall=True)
+        data['passengers'] = admin_page('passengers')
     
     elif page == 'employees':
-        data['employees'] = db_query("SELECT * FROM employee ORDER BY name", fetchall=True)
+        data['employees'] = admin_page('employees')
 
     elif page == 'flights':
-        data['flights'] = db_query("SELECT * FROM upcoming_flights ORDER BY departure_time", fetchall=True)
-        data['routes'] = db_query("SELECT * FROM route", fetchall=True)
-        data['aircraft'] = db_query("SELECT * FROM aircraft WHERE status = 'Operational'", fetchall=True)
+        results = db_batch_with_catalogue(('routes', 'aircraft'), flights=(UPCOMING_FLIGHTS_SQL, ()))
+        data['flights'] = results['flights']
+        data['routes'] = catalogue.routes()
+        data['aircraft'] = catalogue.aircraft(status='Operational')
 
     elif page == 'bookings':
-        data['bookings'] = db_query("""
-            SELECT b.*, p.name, f.flight_no 
-            FROM booking b
-            JOIN passenger p ON b.passenger_id = p.passenger_id
-            JOIN flight f ON b.flight_id = f.flight_id
-            ORDER BY b.booking_date DESC
-        """, fetchall=True)
+        data['bookings'] = admin_page('bookings')
 
     elif page == 'vendors':
-        data['vendors'] = db_query("SELECT * FROM vendor ORDER BY terminal, name", fetchall=True)
+        data['vendors'] = catalogue.vendors()
 
     elif page == 'payroll':
-        data['payrolls'] = db_query("""
-            SELECT pr.*, e.name, e.role
-            FROM payroll pr
-            JOIN employee e ON pr.emp_id = e.emp_id
-            ORDER BY pr.pay_date DESC
-        """, fetchall=True)
-        data['employees'] = db_query("SELECT emp_id, name, salary FROM employee", fetchall=True)
+        sql, params, state = admin_page_query('payroll')
+        results = db_batch(payrolls=(sql, params), employees=(PAYROLL_EMPLOYEES_SQL, ()))
+        data['payrolls'] = ADMIN_PAGERS['payroll'].to_page(results['payrolls'], state)
+        data['employees'] = results['employees']
 
     elif page == 'reports':
-        data['passenger_summary'] = db_query("SELECT * FROM passenger_summary ORDER BY total_spent DESC", fetchall=True)
+        data['passenger_summary'] = admin_page('reports')
 
     elif page == 'audit':
+        # Show what the background writer still holds too
+        audit.flush()
         data['logs'] = db_query("SELECT * FROM audit_log ORDER BY created_at DESC LIMIT 100", fetchall=True)
     
     return render_template('dashboard_admin.html', page=page, data=data)
@@ -256,6 +697,8 @@ def add_employee():
     form = request.form
     db_query("INSERT INTO employee (name, role, email, date_of_joining, salary) VALUES (%s, %s, %s, %s, %s)",
              (form['name'], form['role'], form['email'], form['date_of_joining'], form['salary']), commit=True)
+    known_logins.add('employee', form['email'])
+    render_cache.bump('employee')
     flash("Employee added successfully.", "success")
     return redirect(url_for('dashboard_admin', page='employees'))
 
@@ -265,6 +708,10 @@ def edit_employee():
     form = request.form
     db_query("UPDATE employee SET name=%s, role=%s, email=%s, date_of_joining=%s, salary=%s WHERE emp_id=%s",
              (form['name'], form['role'], form['email'], form['date_of_joining'], form['salary'], form['emp_id']), commit=True)
+    # Their name or job role may have changed: reload the profile on their next request
+    profiles.evict('employee', form['emp_id'])
+    known_logins.add('employee', form['email'])
+    render_cache.bump('employee')
     flash("Employee updated successfully.", "success")
     return redirect(url_for('dashboard_admin', page='employees'))
 
@@ -275,9 +722,33 @@ def add_flight():
     form = request.form
     db_query("INSERT INTO flight (flight_no, airline, route_id, aircraft_id, departure_time, arrival_time, base_fare) VALUES (%s, %s, %s, %s, %s, %s, %s)",
              (form['flight_no'], form['airline'], form['route_id'], form['aircraft_id'], form['departure_time'], form['arrival_time'], form['base_fare']), commit=True)
+    catalogue.invalidate('routes', 'aircraft')
+    render_cache.bump('flight')
     flash("Flight added successfully.", "success")
     return redirect(url_for('dashboard_admin', page='flights'))
 
+@app.route('/admin/flight/import', methods=['POST'])
+@login_required(role='admin')
+def import_flight_schedule():
+    """Bulk-imports a CSV/JSON flight schedule (see schedule_import.py)."""
+    upload = request.files.get('schedule')
+    if not upload or not upload.filename:
+        flash("Please choose a schedule file to import.", "warning")
+        return redirect(url_for('dashboard_admin', page='flights'))
+    try:
+        rows = read_upload(upload)
+    except (ValueError, UnicodeDecodeError) as err:
+        flash(f"Could not read schedule file: {err}", "danger")
+        return redirect(url_for('dashboard_admin', page='flights'))
+
+    report = ScheduleImporter(pool, catalogue, changed_by=session.get('name', 'Admin')).run(rows)
+    dashboard_stats.invalidate()
+    render_cache.bump('flight', 'route', 'aircraft')
+    flash(f"Schedule import: {report.summary()}.", "success" if report.inserted else "warning")
+    for row_no, message in report.errors[:5]:
+        flash(f"Row {row_no}: {message}", "danger")
+    return redirect(url_for('dashboard_admin', page='flights'))
+
 # Vendors
 @app.route('/admin/vendor/add', methods=['POST'])
 @login_required(role='admin')
@@ -285,6 +756,8 @@ def add_vendor():
     form = request.form
     db_query("INSERT INTO vendor (name, amenity_type, terminal, location_desc) VALUES (%s, %s, %s, %s)",
              (form['name'], form['amenity_type'], form['terminal'], form['location_desc']), commit=True)
+    catalogue.invalidate('vendors')
+    render_cache.bump('vendor')
     flash("Vendor added successfully.", "success")
     return redirect(url_for('dashboard_admin', page='vendors'))
 
@@ -295,8 +768,12 @@ def add_payroll():
     form = request.form
     emp = db_query("SELECT salary FROM employee WHERE emp_id = %s", (form['emp_id'],), fetchone=True)
     if emp:
-        db_query("INSERT INTO payroll (emp_id, base_salary, bonus, deductions, pay_date) VALUES (%s, %s, %s, %s, %s)",
-                 (form['emp_id'], emp['salary'], form['bonus'], form['deductions'], form['pay_date']), commit=True)
+        # pay_date is NOT NULL (the payroll pager seeks on it): a blank date means today
+        db_query("INSERT INTO payroll (emp_id, base_salary, bonus, deductions, pay_date) "
+                 "VALUES (%s, %s, %s, %s, COALESCE(%s, NOW()))",
+                 (form['emp_id'], emp['salary'], form['bonus'], form['deductions'], form.get('pay_date') or None),
+                 commit=True)
+        render_cache.bump('payroll')
         flash("Payroll entry added.", "success")
     else:
         flash("Employee not found.", "danger")
@@ -307,27 +784,102 @@ def add_payroll():
 @login_required(role='admin')
 def admin_cancel_flight():
     flight_id = request.form['flight_id']
-    db_query("UPDATE flight SET status='Cancelled' WHERE flight_id=%s", (flight_id,), commit=True)
-    # Note: The trigger trg_audit_booking_update will handle cancelling associated bookings if needed,
-    # or this could be done via a stored procedure.
+    # One statement, so the flight is never Cancelled with seats still on sale
+    db_query("""
+        UPDATE flight f
+        LEFT JOIN flight_inventory fi ON fi.flight_id = f.flight_id
+        SET f.status = 'Cancelled', fi.seats_remaining = 0
+        WHERE f.flight_id = %s
+    """, (flight_id,), commit=True)
+    # Bookings on the flight keep their status: each is refunded (trg_audit_booking_update)
+    # only when it is cancelled itself
+    dashboard_stats.invalidate()
+    render_cache.bump('flight', 'booking')
     flash("Flight marked as Cancelled.", "success")
     return redirect(url_for('dashboard_admin', page='flights'))
 
 @app.route('/admin/run_status_update', methods=['POST'])
 @login_required(role='admin')
 def run_status_update():
-    """Manually triggers the flight status update procedure."""
-    db_query("CALL sp_update_flight_statuses()", commit=True)
-    flash("Flight statuses updated (Completed/Cancelled) based on time.", "success")
+    """Queues a flight status run for the background worker."""
+    try:
+        job_id = job_queue.enqueue('flight_status', requested_by=session.get('name'))
+    except mysql.connector.Error as err:
+        print(f"❌ Error queuing the status update: {err}")
+        flash(f"Database error: {err.msg}", "danger")
+    else:
+        flash(f"Flight status update queued (job #{job_id}). Statuses change as soon as the worker runs it.", "success")
     return redirect(url_for('dashboard_admin', page='flights'))
 
+@app.route('/admin/export/<section>')
+@login_required(role='admin')
+def admin_export(section):
+    """Streams a full admin listing (bookings, payroll or reports) as CSV or NDJSON."""
+    fmt = request.args.get('format', 'csv')
+    if section not in ('bookings', 'payroll', 'reports') or fmt not in exports.FORMATS:
+        abort(404)
+    where, params = admin_filters(section)
+    export_pool = pool if router.is_sticky(session) else router.read_pool()
+    rows = exports.stream_rows(export_pool, ADMIN_PAGERS[section].ordered_sql(where), params)
+    filename = f"{section}_{datetime.date.today().isoformat()}.{fmt}"
+    return Response(exports.encode(rows, fmt), mimetype=exports.FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+@app.route('/admin/cache/stats')
+@login_required(role='admin')
+def catalogue_cache_stats():
+    """Hit/miss counters for the in-process catalogue cache and the template fragments."""
+    return jsonify(dict(catalogue.stats(), fragments=render_cache.stats()))
+
+@app.route('/admin/jobs/stats')
+@login_required(role='admin')
+def job_stats():
+    """Queue depth and the latest background job runs with their stats."""
+    return jsonify(job_queue.recent())
+
+@app.route('/admin/pool/stats')
+@login_required(role='admin')
+def pool_stats():
+    """Connection pool state and counters of every endpoint, for this worker process."""
+    return jsonify(router.stats())
+
 
 # ============================================
 # Passenger Dashboard
 # ============================================
 
+# A passenger's bookings, newest first (the bookings page and GET /api/v1/bookings)
+PASSENGER_BOOKINGS_SQL = """
+    SELECT 
+        b.booking_id,
+        b.status,
+        b.booking_date,
+        f.flight_no,
+        f.airline,
+        r.source_name,
+        r.dest_name,
+        f.departure_time,
+        f.arrival_time,
+        b.seat_no,
+        COALESCE(p.amount, 0) AS amount
+    FROM booking b
+    JOIN flight f ON b.flight_id = f.flight_id
+    JOIN route r ON f.route_id = r.route_id
+    LEFT JOIN payment p ON b.booking_id = p.booking_id
+    WHERE b.passenger_id = %s
+    ORDER BY b.booking_date DESC
+"""
+
+PASSENGER_PAGE_TABLES = {
+    'search': ('flight', 'booking', 'route'),
+    'bookings': ('booking', 'flight'),
+    'amenities': ('vendor',),
+    'profile': ('passenger', 'booking'),
+}
+
 @app.route('/dashboard/passenger', methods=['GET'])
 @login_required(role='passenger')
+@render_cache.conditional(lambda: PASSENGER_PAGE_TABLES.get(request.args.get('page', 'search')))
 def dashboard_passenger():
     page = request.args.get('page', 'search')
     passenger_id = session['user_id']
@@ -337,91 +889,48 @@ def dashboard_passenger():
     # ✈️  1. Search Flights Page
     # =======================================
     if page == 'search':
-        data['flights'] = []
-        data['search'] = {'source': '', 'destination': '', 'date': ''}
+        data['search'] = {'source': '', 'dest': '', 'date': ''}
 
         source = request.args.get('source', '')
-        destination = request.args.get('destination', '')
+        dest = request.args.get('dest', request.args.get('destination', ''))
         date = request.args.get('date', '')
 
-        if source or destination or date:
-            query = "SELECT * FROM upcoming_flights WHERE status = 'Scheduled'"
-            params = []
-
-            if source:
-                query += " AND (source_code = %s OR source_name LIKE %s)"
-                params.extend([source, f'%{source}%'])
-            if destination:
-                query += " AND (dest_code = %s OR dest_name LIKE %s)"
-                params.extend([destination, f'%{destination}%'])
-            if date:
-                query += " AND DATE(departure_time) = %s"
-                params.append(date)
-
-            query += " ORDER BY departure_time"
-            data['flights'] = db_query(query, tuple(params), fetchall=True)
-            data['search'] = {'source': source, 'destination': destination, 'date': date}
+        if source or dest or date:
+            data['results'] = flight_search.search(source, dest, date)
+            data['search'] = {'source': source, 'dest': dest, 'date': date}
 
     # =======================================
     # 🧾  2. My Bookings Page
     # =======================================
     elif page == 'bookings':
-        data['bookings'] = db_query("""
-            SELECT 
-                b.booking_id,
-                b.status,
-                b.booking_date,
-                f.flight_no,
-                f.airline,
-                r.source_name,
-                r.dest_name,
-                f.departure_time,
-                f.arrival_time,
-                b.seat_no,
-                COALESCE(p.amount, 0) AS amount
-            FROM booking b
-            JOIN flight f ON b.flight_id = f.flight_id
-            JOIN route r ON f.route_id = r.route_id
-            LEFT JOIN payment p ON b.booking_id = p.booking_id
-            WHERE b.passenger_id = %s
-            ORDER BY b.booking_date DESC
-        """, (passenger_id,), fetchall=True) or []
+        data['bookings'] = db_query(PASSENGER_BOOKINGS_SQL, (passenger_id,), fetchall=True) or []
 
     # =======================================
     # 🏬  3. Amenities Page
     # =======================================
     elif page == 'amenities':
-        data['vendors'] = []
         data['search'] = {'terminal': ''}
         terminal = request.args.get('terminal', '')
 
         if terminal:
-            data['vendors'] = db_query(
-                "SELECT * FROM vendor WHERE terminal LIKE %s ORDER BY name",
-                (f'%{terminal}%',),
-                fetchall=True
-            )
+            data['results'] = catalogue.search_vendors(terminal)
             data['search'] = {'terminal': terminal}
 
     # =======================================
     # 👤  4. Profile Page
     # =======================================
     elif page == 'profile':
-        profile = db_query("""
+        # Name, email and passport come from the cached profile, only the totals are queried
+        totals = db_query("""
             SELECT 
-                p.name,
-                p.email,
-                p.passport_no,
                 p.total_points,
-                COUNT(DISTINCT b.booking_id) AS total_bookings,
-                COALESCE(SUM(pay.amount), 0) AS total_spent
+                COALESCE(s.total_bookings, 0) AS total_bookings,
+                COALESCE(s.total_spent, 0) AS total_spent
             FROM passenger p
-            LEFT JOIN booking b ON p.passenger_id = b.passenger_id
-            LEFT JOIN payment pay ON b.booking_id = pay.booking_id
+            LEFT JOIN passenger_summary_mv s ON s.passenger_id = p.passenger_id
             WHERE p.passenger_id = %s
-            GROUP BY p.passenger_id
-        """, (passenger_id,), fetchone=True) or {}
-        data['profile'] = profile
+        """, (passenger_id,), fetchone=True)
+        data['profile'] = dict(current_user() or {}, **(totals or {}))
 
     # =======================================
     # ✅ Render Template Safely
@@ -431,44 +940,64 @@ def dashboard_passenger():
 @app.route('/passenger/search', methods=['GET'])
 @login_required(role='passenger')
 def search_flights():
-    source = request.args.get('source')
-    dest = request.args.get('dest')
-    date = request.args.get('date')
-    
-    query = "SELECT * FROM upcoming_flights WHERE status = 'Scheduled'"
-    params = []
+    source = request.args.get('source', '')
+    dest = request.args.get('dest', '')
+    date = request.args.get('date', '')
     
-    if source:
-        query += " AND (source_code = %s OR source_name LIKE %s)"
-        params.extend([source, f'%{source}%'])
-    if dest:
-        query += " AND (dest_code = %s OR dest_name LIKE %s)"
-        params.extend([dest, f'%{dest}%'])
-    if date:
-        query += " AND DATE(departure_time) = %s"
-        params.append(date)
-        
-    query += " ORDER BY departure_time"
-    
-    results = db_query(query, tuple(params), fetchall=True)
+    results = flight_search.search(source, dest, date)
     
     return render_template('dashboard_passenger.html', page='search', data={'results': results, 'search': request.args})
 
-@app.route('/passenger/book', methods=['POST'])
+@app.route('/passenger/flight/<int:flight_id>/seats', methods=['GET'])
 @login_required(role='passenger')
-def book_flight():
-    flight_id = request.form['flight_id']
-    seat_no = request.form['seat_no']
-    passenger_id = session['user_id']
-    
-    # Call the stored procedure
+def flight_seats(flight_id):
+    """Seat map of a flight as JSON, for the seat picker in the booking modal."""
+    seats = seat_maps.for_flight(flight_id)
+    if seats is None:
+        return jsonify({'error': 'No seat map for this flight.'}), 404
+    return jsonify(seats)
+
+def create_booking(passenger_id, flight_id, seat_no):
+    """
+    Books a seat through the book_flight procedure (the booking form and POST /api/v1/bookings).
+    :param seat_no: e.g. '12A', or '' to auto-assign the next free seat
+    :return: the procedure's row (new_booking_id, seat_no), None on failure (db_query flashed why)
+    """
     # Note: db_query handles commit and error flashing
     result = db_query("CALL book_flight(%s, %s, %s, %s)",
                       (passenger_id, flight_id, seat_no, 'Passenger'),
                       commit=True, fetchone=True)
+    if result:
+        metrics.inc('airline_bookings_total')
+        render_cache.bump('booking')
+        audit.log('booking', result['new_booking_id'], 'CREATE', 'New booking via procedure', 'Passenger')
+    return result
+
+def cancel_passenger_booking(passenger_id, booking_id):
+    """
+    Cancels one of the passenger's bookings; the trigger trg_audit_booking_update handles the refund.
+    :return: the booking row as it was before (status 'Cancelled' if it already was), None if it isn't theirs
+    """
+    booking = db_query("SELECT * FROM booking WHERE booking_id = %s AND passenger_id = %s",
+                       (booking_id, passenger_id), fetchone=True)
+    if booking and booking['status'] != 'Cancelled':
+        db_query("UPDATE booking SET status = 'Cancelled' WHERE booking_id = %s", (booking_id,), commit=True)
+        audit.log('booking', booking['booking_id'], 'CANCEL', f"Booking cancelled: {booking['booking_id']}", 'Passenger')
+        metrics.inc('airline_cancellations_total')
+        render_cache.bump('booking')
+    return booking
+
+@app.route('/passenger/book', methods=['POST'])
+@login_required(role='passenger')
+def book_flight():
+    flight_id = request.form['flight_id']
+    # Left blank, book_flight auto-assigns the next free seat
+    seat_no = request.form.get('seat_no', '').strip()
+    
+    result = create_booking(session['user_id'], flight_id, seat_no)
     
     if result:
-        flash(f"Booking successful! Your Booking ID is {result['new_booking_id']}.", "success")
+        flash(f"Booking successful! Your Booking ID is {result['new_booking_id']}, seat {result['seat_no']}.", "success")
         return redirect(url_for('dashboard_passenger', page='bookings'))
     else:
         # Error flash is handled by db_query
@@ -480,16 +1009,13 @@ def book_flight():
 def cancel_booking():
     booking_id = request.form['booking_id']
     
-    # Check if this booking belongs to the logged-in passenger
-    booking = db_query("SELECT * FROM booking WHERE booking_id = %s AND passenger_id = %s",
-                       (booking_id, session['user_id']), fetchone=True)
+    # Only cancels a booking that belongs to the logged-in passenger
+    booking = cancel_passenger_booking(session['user_id'], booking_id)
     
     if booking:
         if booking['status'] == 'Cancelled':
             flash("This booking is already cancelled.", "info")
         else:
-            # The trigger trg_audit_booking_update will handle the refund logic
-            db_query("UPDATE booking SET status = 'Cancelled' WHERE booking_id = %s", (booking_id,), commit=True)
             flash("Booking successfully cancelled. A refund will be processed.", "success")
     else:
         flash("Booking not found or you do not have permission to cancel it.", "danger")
@@ -501,25 +1027,110 @@ def cancel_booking():
 def search_amenities():
     terminal = request.args.get('terminal', '')
     
-    query = "SELECT * FROM vendor WHERE 1=1"
-    params = []
-    
     if terminal:
-        query += " AND terminal = %s"
-        params.append(terminal)
-        
-    query += " ORDER BY name"
-    
-    results = db_query(query, tuple(params), fetchall=True)
+        results = catalogue.vendors(terminal)
+    else:
+        results = sorted(catalogue.vendors(), key=lambda v: v['name'] or '')
     
     return render_template('dashboard_passenger.html', page='amenities', data={'results': results, 'search': request.args})
 
+# ============================================
+# JSON API (v1, see api.py)
+# ============================================
+
+FLIGHT_DETAIL_SQL = "SELECT * FROM upcoming_flights WHERE flight_id = %s"
+
+def api_respond(payload, status=200):
+    """api.respond, or a 500 when a query of this request failed (db_query reports errors as flash messages)."""
+    messages = get_flashed_messages(category_filter=['danger'])
+    if messages:
+        return api.error(500, messages[-1])
+    return api.respond(payload, status)
+
+def api_failure(status, default):
+    """An error response with the message db_query flashed, if there is one."""
+    messages = get_flashed_messages(category_filter=['danger'])
+    return api.error(status, messages[-1] if messages else default)
+
+@app.route(f'{api.API_PREFIX}/flights')
+@api_login_required(role='passenger')
+@render_cache.conditional(lambda: PASSENGER_PAGE_TABLES['search'])
+def api_flights():
+    """Upcoming flights matching ?source=&dest=&date= (airport code or city, YYYY-MM-DD)."""
+    flights = flight_search.search(request.args.get('source', ''), request.args.get('dest', ''),
+                                   request.args.get('date', ''))
+    return api_respond(api.FlightList(flights=api.convert(flights, list[api.Flight])))
+
+@app.route(f'{api.API_PREFIX}/flights/<int:flight_id>')
+@api_login_required(role='passenger')
+@render_cache.conditional(lambda: PASSENGER_PAGE_TABLES['search'])
+def api_flight(flight_id):
+    """An upcoming flight with its seats remaining and seat map."""
+    flight = db_query(FLIGHT_DETAIL_SQL, (flight_id,), fetchone=True)
+    if flight is None:
+        return api_failure(404, "No upcoming flight with this id.")
+    seats = seat_maps.for_flight(flight_id)
+    return api_respond(api.FlightDetail(flight=api.convert(flight, api.Flight),
+                                        seats=api.convert(seats, api.SeatMap) if seats else None))
+
+@app.route(f'{api.API_PREFIX}/bookings')
+@api_login_required(role='passenger')
+@render_cache.conditional(lambda: PASSENGER_PAGE_TABLES['bookings'])
+def api_bookings():
+    """The logged-in passenger's bookings, newest first."""
+    bookings = db_query(PASSENGER_BOOKINGS_SQL, (session['user_id'],), fetchall=True) or []
+    return api_respond(api.BookingList(bookings=api.convert(bookings, list[api.Booking])))
+
+@app.route(f'{api.API_PREFIX}/bookings', methods=['POST'])
+@api_login_required(role='passenger')
+def api_create_booking():
+    """Books a seat: {"flight_id": 12, "seat_no": "14C"}, seat_no optional."""
+    try:
+        body = api.decode(request.get_data(), api.BookingRequest)
+    except msgspec.MsgspecError as err:
+        return api.error(400, f"Invalid booking request: {err}")
+    result = create_booking(session['user_id'], body.flight_id, body.seat_no.strip())
+    if not result:
+        return api_failure(409, "The booking could not be made.")
+    return api.respond(api.BookingResult(booking_id=result['new_booking_id'], seat_no=result['seat_no'],
+                                         status='Confirmed'), 201)
+
+@app.route(f'{api.API_PREFIX}/bookings/<int:booking_id>/cancel', methods=['POST'])
+@api_login_required(role='passenger')
+def api_cancel_booking(booking_id):
+    """Cancels one of the passenger's bookings; the refund is processed by the database."""
+    booking = cancel_passenger_booking(session['user_id'], booking_id)
+    if booking is None:
+        return api_failure(404, "Booking not found.")
+    if booking['status'] == 'Cancelled':
+        return api.error(409, "This booking is already cancelled.")
+    return api_respond(api.BookingResult(booking_id=booking_id, seat_no=booking['seat_no'], status='Cancelled'))
+
+@app.route(f'{api.API_PREFIX}/vendors')
+@api_login_required(role='passenger')
+@render_cache.conditional(lambda: PASSENGER_PAGE_TABLES['amenities'])
+def api_vendors():
+    """Vendors in the ?terminal= terminal, or all of them, ordered by name (as /passenger/amenities/search)."""
+    terminal = request.args.get('terminal', '')
+    if terminal:
+        vendors = catalogue.vendors(terminal)
+    else:
+        vendors = sorted(catalogue.vendors(), key=lambda v: v['name'] or '')
+    return api_respond(api.VendorList(vendors=api.convert(vendors, list[api.Vendor])))
+
 # ============================================
 # Employee Dashboard
 # ============================================
 
+EMPLOYEE_PAGE_TABLES = {
+    'flights': ('flight', 'route', 'staff_assignment'),
+    'maintenance': ('maintenance', 'aircraft', 'employee'),
+    'payroll': ('payroll',),
+}
+
 @app.route('/dashboard/employee')
 @login_required(role='employee')
+@render_cache.conditional(lambda: EMPLOYEE_PAGE_TABLES.get(request.args.get('page', 'flights')))
 def dashboard_employee():
     page = request.args.get('page', 'flights')
     data = {}
@@ -536,18 +1147,22 @@ def dashboard_employee():
         """, (emp_id,), fetchall=True)
     
     elif page == 'maintenance':
-        # Only show if employee is in Maintenance
-        emp = db_query("SELECT role FROM employee WHERE emp_id = %s", (emp_id,), fetchone=True)
-        if 'Maintenance' in emp.get('role', ''):
+        # Only show if employee is in Maintenance (job role from the cached profile)
+        emp = current_user()
+        if emp and 'Maintenance' in (emp.get('role') or ''):
+            results = db_batch_with_catalogue(
+                ('aircraft',),
+                logs=("""
+                    SELECT m.*, a.registration_no
+                    FROM maintenance m
+                    JOIN aircraft a ON m.aircraft_id = a.aircraft_id
+                    WHERE m.emp_id = %s
+                    ORDER BY m.maintenance_date DESC
+                """, (emp_id,)),
+            )
             data['is_maintenance'] = True
-            data['aircrafts'] = db_query("SELECT aircraft_id, registration_no, model, status FROM aircraft", fetchall=True)
-            data['logs'] = db_query("""
-                SELECT m.*, a.registration_no
-                FROM maintenance m
-                JOIN aircraft a ON m.aircraft_id = a.aircraft_id
-                WHERE m.emp_id = %s
-                ORDER BY m.maintenance_date DESC
-            """, (emp_id,), fetchall=True)
+            data['aircrafts'] = catalogue.aircraft()
+            data['logs'] = results['logs']
         else:
             data['is_maintenance'] = False
 
@@ -573,10 +1188,270 @@ def add_maintenance_log():
     # Update aircraft status and last maintenance date
     db_query("UPDATE aircraft SET status = %s, last_maintenance = %s WHERE aircraft_id = %s",
              (form['new_status'], form['maintenance_date'], form['aircraft_id']), commit=True)
+    catalogue.invalidate('aircraft')
+    render_cache.bump('maintenance', 'aircraft')
     
     flash("Maintenance log added and aircraft status updated.", "success")
     return redirect(url_for('dashboard_employee', page='maintenance'))
 
 
+# ============================================
+# CLI Commands
+# ============================================
+
+def call_procedure(name):
+    """Runs a maintenance stored procedure on its own pooled connection. Returns True on success."""
+    conn = pool.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.callproc(name)
+        conn.commit()
+        return True
+    except mysql.connector.Error as err:
+        conn.rollback()
+        print(f"❌ Error running {name}: {err}")
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+@app.cli.command('reconcile-inventory')
+def reconcile_inventory_command():
+    """Rebuilds the flight_inventory table from bookings in one pass."""
+    if call_procedure('sp_reconcile_flight_inventory'):
+        render_cache.bump('booking')
+        print("✅ flight_inventory reconciled with bookings.")
+
+
+@app.cli.command('rebuild-seat-maps')
+def rebuild_seat_maps_command():
+    """Creates missing seat maps and recomputes every seat bitmap from confirmed bookings."""
+    try:
+        created, rewritten, unmapped = rebuild_seat_maps(pool)
+    except mysql.connector.Error as err:
+        print(f"❌ Error rebuilding seat maps: {err}")
+        return
+    for booking_id, seat_no in unmapped:
+        print(f"❌ Booking {booking_id}: seat '{seat_no}' is not on the aircraft's seat map")
+    print(f"✅ {rewritten} seat maps rebuilt ({created} created).")
+
+
+@app.cli.command('import-schedule')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=5000, show_default=True, help='Flights per transaction.')
+def import_schedule_command(path, chunk_size):
+    """Bulk-imports a CSV or JSON flight schedule file."""
+    fmt = 'json' if path.lower().endswith(('.json', '.ndjson')) else 'csv'
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = read_schedule(f, fmt)
+    with app.test_request_context():
+        report = ScheduleImporter(pool, catalogue, chunk_size=chunk_size).run(rows)
+    dashboard_stats.invalidate()
+    render_cache.bump('flight', 'route', 'aircraft')
+    for row_no, message in report.errors:
+        print(f"❌ Row {row_no}: {message}")
+    print(f"✅ {report.summary()}.")
+
+
+@app.cli.command('explain-search')
+def explain_search_command():
+    """Runs EXPLAIN on the SQL of representative flight searches and fails on any full table scan."""
+    if flight_search.catalogue is not None:
+        print("Routes are resolved from the catalogue cache, so only the search queries are explained.")
+    cases = [
+        {'source': 'BOM'},
+        {'source': 'Mum', 'dest': 'New'},
+        {'date': datetime.date.today().isoformat()},
+        {'source': 'BOM', 'dest': 'DEL', 'date': datetime.date.today().isoformat()},
+    ]
+    failed = False
+    with app.test_request_context():
+        for case in cases:
+            scans = full_scans(flight_search.explain(**case))
+            if scans:
+                failed = True
+                print(f"❌ {case}: full scan on {', '.join(scans)}")
+            else:
+                print(f"✅ {case}: index-backed")
+    if failed:
+        raise SystemExit(1)
+
+
+@app.cli.command('refresh-stats')
+def refresh_stats_command():
+    """Recomputes the dashboard_counter table and drops the cached admin stats."""
+    if call_procedure('sp_refresh_dashboard_counters'):
+        dashboard_stats.invalidate()
+        print("✅ Dashboard counters refreshed.")
+
+
+@app.cli.command('audit-retention')
+@click.option('--keep-months', type=int, default=None, help='Months to keep (default AUDIT_RETENTION_MONTHS).')
+@click.option('--archive/--no-archive', default=True, show_default=True,
+              help='Copy dropped months to audit_log_archive first.')
+def audit_retention_command(keep_months, archive):
+    """Adds the next months' audit_log partitions and drops (and archives) the expired ones."""
+    keep_months = keep_months or app.config['AUDIT_RETENTION_MONTHS']
+    conn = pool.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.callproc('sp_audit_log_add_partitions', (3,))
+        cursor.callproc('sp_audit_log_retention', (keep_months, archive))
+        dropped, archived = next(cursor.stored_results()).fetchone()
+        conn.commit()
+    except mysql.connector.Error as err:
+        conn.rollback()
+        print(f"❌ Error running audit retention: {err}")
+        raise SystemExit(1)
+    finally:
+        cursor.close()
+        conn.close()
+    print(f"✅ Kept {keep_months} months of audit_log: {dropped} partition(s) dropped, {archived} row(s) archived.")
+
+
+@app.cli.command('worker')
+def worker_command():
+    """Runs queued background jobs and schedules the flight status, repricing, login filter and counter jobs."""
+    schedule = {'flight_status': app.config['JOB_STATUS_INTERVAL'],
+                'reprice': app.config['JOB_REPRICE_INTERVAL'],
+                'login_filter': app.config['LOGIN_FILTER_INTERVAL']}
+    if app.config['STATS_USE_COUNTERS']:
+        schedule['dashboard_counters'] = app.config['STATS_COUNTERS_INTERVAL']
+    worker = Worker(job_queue, JOBS, schedule=schedule, poll_interval=app.config['JOB_POLL_SECONDS'])
+    print(f"✅ Worker started, flight statuses every {app.config['JOB_STATUS_INTERVAL']}s, "
+          f"fares every {app.config['JOB_REPRICE_INTERVAL']}s, "
+          f"login filter every {app.config['LOGIN_FILTER_INTERVAL']}s"
+          + (f", dashboard counters every {app.config['STATS_COUNTERS_INTERVAL']}s."
+             if app.config['STATS_USE_COUNTERS'] else "."))
+    worker.run_forever()
+
+
+@app.cli.command('run-job')
+@click.argument('name', type=click.Choice(sorted(JOBS)))
+def run_job_command(name):
+    """Queues a job and runs it right away in this process."""
+    job_id = job_queue.enqueue(name, requested_by='cli')
+    # This job exactly, not whichever other job happens to be queued ahead of it
+    job = Worker(job_queue, JOBS).run_once(job_id)
+    if job is None:
+        print(f"❌ {name} (job {job_id}) was already taken by a worker.")
+        raise SystemExit(1)
+    if job.get('error'):
+        print(f"❌ {name} failed: {job['error']}")
+        raise SystemExit(1)
+    print(f"✅ {name}: {job['stats']}")
+
+
+@app.cli.command('hash-admin-passwords')
+def hash_admin_passwords_command():
+    """Hashes every admin password still stored in plaintext."""
+    conn = pool.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT admin_id, password FROM admin")
+        plaintext = [(admin_id, password) for admin_id, password in cursor.fetchall()
+                     if not passwords.is_hashed(password)]
+        method = app.config['PASSWORD_HASH_METHOD']
+        if plaintext:
+            cursor.executemany("UPDATE admin SET password = %s WHERE admin_id = %s",
+                               [(passwords.hash_password(password, method), admin_id)
+                                for admin_id, password in plaintext])
+            conn.commit()
+    except mysql.connector.Error as err:
+        conn.rollback()
+        print(f"❌ Could not hash admin passwords: {err}")
+        raise SystemExit(1)
+    finally:
+        cursor.close()
+        conn.close()
+    print(f"✅ Hashed {len(plaintext)} plaintext admin password(s) with {method}.")
+
+
+@app.cli.command('rebuild-summary')
+def rebuild_summary_command():
+    """Recomputes passenger_summary_mv from the live passenger_summary view."""
+    if call_procedure('sp_rebuild_passenger_summary'):
+        render_cache.bump('booking')
+        print("✅ passenger_summary_mv rebuilt.")
+
+
+# Rows where the materialized summary disagrees with the live view
+SUMMARY_DIFF_SQL = """
+    SELECT v.passenger_id,
+           v.total_bookings AS live_bookings, m.total_bookings AS mv_bookings,
+           v.total_spent AS live_spent, m.total_spent AS mv_spent
+    FROM passenger_summary v
+    LEFT JOIN passenger_summary_mv m ON m.passenger_id = v.passenger_id
+    WHERE m.passenger_id IS NULL
+       OR v.total_bookings <> m.total_bookings
+       OR v.total_spent <> m.total_spent
+    ORDER BY v.passenger_id
+"""
+
+
+@app.cli.command('check-summary')
+def check_summary_command():
+    """Diffs passenger_summary_mv against the live view and exits non-zero on any mismatch."""
+    with app.test_request_context():
+        diffs = db_query(SUMMARY_DIFF_SQL, fetchall=True)
+    if diffs is None:
+        raise SystemExit(1)
+    for d in diffs:
+        print(f"❌ passenger {d['passenger_id']}: bookings {d['mv_bookings']} (live {d['live_bookings']}), "
+              f"spent {d['mv_spent']} (live {d['live_spent']})")
+    if diffs:
+        print(f"{len(diffs)} passenger(s) out of date. Run 'flask rebuild-summary' to fix.")
+        raise SystemExit(1)
+    print("✅ passenger_summary_mv matches the live view.")
+
+
+ENDPOINT_SQL = "SELECT @@hostname AS host, @@port AS port, @@server_id AS server_id, @@read_only AS read_only"
+
+
+def endpoint_info(endpoint_pool):
+    conn = endpoint_pool.get_connection()
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(ENDPOINT_SQL)
+        info = cursor.fetchone()
+        cursor.close()
+        return info
+    finally:
+        conn.close()
+
+
+@app.cli.command('check-replicas')
+def check_replicas_command():
+    """Shows where each endpoint points and checks that reads after a write go to the primary."""
+    for name, endpoint_pool in router.pools().items():
+        try:
+            info = endpoint_info(endpoint_pool)
+        except mysql.connector.Error as err:
+            print(f"❌ {name}: {err}")
+            continue
+        print(f"{name}: {info['host']}:{info['port']} server_id={info['server_id']} read_only={info['read_only']}")
+    primary_id = endpoint_info(pool)['server_id']
+
+    # First request: a read, then a write, which makes the session sticky
+    with app.test_request_context():
+        db_query(ENDPOINT_SQL, fetchone=True)
+        print(f"Read routed to {g.get('db_endpoint', 'primary')}")
+        db_query("DO 0")  # any statement that isn't a plain read counts as a write
+        primary_until = session.get('_primary_until')
+
+    # Next request from the same session must read from the primary
+    with app.test_request_context():
+        if primary_until:
+            session['_primary_until'] = primary_until
+        after = db_query(ENDPOINT_SQL, fetchone=True)
+    if after is None:
+        raise SystemExit(1)
+    print(f"Read in the next request after a write routed to server_id={after['server_id']}")
+    if after['server_id'] != primary_id:
+        print("❌ Read after a write did not go to the primary.")
+        raise SystemExit(1)
+    print("✅ Reads after a write go to the primary.")
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
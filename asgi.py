@@ -0,0 +1,207 @@
+"""
+ASGI entry point.
+
+    uvicorn asgi:application --port 8000 --workers 4
+
+Serves the same app as app.py. The read-heavy pages below run natively on asyncio with
+an aiomysql pool, so a request waiting on MySQL doesn't hold a thread, and their
+independent queries run concurrently:
+
+  * /dashboard/admin (dashboard, flights and payroll sections)
+  * /passenger/search
+
+Every other route, and these ones too when the visitor isn't logged in with the right
+role, is handed to the unchanged Flask app through asgiref's WSGI adapter, which runs it
+in a thread pool. Templates, sessions, flash messages, ETag / 304 revalidation, the
+Server-Timing header and the /metrics timings work the same on both paths.
+"""
+import asyncio
+import io
+import sys
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import flash, render_template, request, session
+
+from app import (app, catalogue, dashboard_stats, flight_search, instrumentation, render_cache,
+                 admin_filter_args, admin_page_query, ADMIN_PAGERS, ADMIN_PAGE_TABLES,
+                 UPCOMING_FLIGHTS_SQL, PAYROLL_EMPLOYEES_SQL)
+from async_db import AsyncDatabase
+from dashboard_stats import EMPTY_STATS
+from db_config import config
+
+wsgi_application = WsgiToAsgi(app)
+
+db = AsyncDatabase(config,
+                   maxsize=app.config['DB_POOL_SIZE'] + app.config['DB_POOL_OVERFLOW'],
+                   recycle=app.config['DB_POOL_MAX_LIFETIME'],
+                   on_query=instrumentation.record)
+
+
+async def safe(awaitable, default=None):
+    """Awaits a query, flashing the error like db_query does and returning default on failure."""
+    try:
+        return await awaitable
+    except Exception as err:  # aiomysql raises pymysql errors
+        print(f"❌ SQL Error: {err}")
+        flash(f"Database error: {err}", "danger")
+        return default
+
+
+# ============================================
+# Native async pages
+# ============================================
+
+async def admin_dashboard():
+    page = request.args.get('page', 'dashboard')
+    data = {'filters': admin_filter_args(page)}
+
+    if page == 'dashboard':
+        data['stats'] = await safe(dashboard_stats.get_async(db)) or dict(EMPTY_STATS)
+
+    elif page == 'flights':
+        # Catalogue sections that aren't cached are loaded next to the page's own query
+        pending = catalogue.pending('routes', 'aircraft')
+        results = await safe(db.gather(flights=(UPCOMING_FLIGHTS_SQL, ()),
+                                       **{name: (sql, ()) for name, sql in pending.items()}), default={})
+        for name in pending:
+            catalogue.fill(name, results.get(name))
+        data['flights'] = results.get('flights')
+        if any(results.get(name) is None for name in pending):
+            # The gather failed: the lookups would load their sections with blocking queries,
+            # so run them in a thread like passenger_search's build_query
+            data['routes'] = await asyncio.to_thread(catalogue.routes)
+            data['aircraft'] = await asyncio.to_thread(catalogue.aircraft, status='Operational')
+        else:
+            data['routes'] = catalogue.routes()
+            data['aircraft'] = catalogue.aircraft(status='Operational')
+
+    elif page == 'payroll':
+        sql, params, state = admin_page_query('payroll')
+        results = await safe(db.gather(payrolls=(sql, params), employees=(PAYROLL_EMPLOYEES_SQL, ())), default={})
+        data['payrolls'] = ADMIN_PAGERS['payroll'].to_page(results.get('payrolls'), state)
+        data['employees'] = results.get('employees')
+
+    return render_template('dashboard_admin.html', page=page, data=data)
+
+
+async def passenger_search():
+    source = request.args.get('source', '')
+    dest = request.args.get('dest', '')
+    date = request.args.get('date', '')
+
+    built = await asyncio.to_thread(flight_search.build_query, source, dest, date)
+    results = []
+    if built is not None:
+        results = await safe(db.query(built[0], built[1], fetchall=True), default=[])
+
+    return render_template('dashboard_passenger.html', page='search', data={'results': results, 'search': request.args})
+
+
+# path -> (required role, handler, which requests it serves natively,
+#          the tables for conditional GET as in the Flask route's render_cache.conditional)
+NATIVE_ROUTES = {
+    '/dashboard/admin': ('admin', admin_dashboard,
+                         lambda args: args.get('page', 'dashboard') in ('dashboard', 'flights', 'payroll'),
+                         lambda args: ADMIN_PAGE_TABLES.get(args.get('page', 'dashboard'))),
+    '/passenger/search': ('passenger', passenger_search, lambda args: True, lambda args: None),
+}
+
+
+# ============================================
+# ASGI plumbing
+# ============================================
+
+def wsgi_environ(scope):
+    """A WSGI environ for a bodyless ASGI HTTP request, so Flask's request context can be used."""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(b''),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name, value = raw_name.decode('latin-1').upper().replace('-', '_'), raw_value.decode('latin-1')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def send_response(response, send):
+    await send({
+        'type': 'http.response.start',
+        'status': response.status_code,
+        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in response.headers.items()],
+    })
+    await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+async def serve_native(role, handler, tables_for, scope, receive, send):
+    ctx = app.request_context(wsgi_environ(scope))
+    ctx.push()
+    try:
+        if session.get('role') != role:
+            # Not logged in as this role: let the Flask route redirect and flash as usual
+            response = None
+        else:
+            try:
+                response = app.preprocess_request()
+                if response is None:
+                    # The same ETag / 304 handling as render_cache.conditional on the Flask route
+                    checked = await asyncio.to_thread(render_cache.revalidate, tables_for(request.args))
+                    if checked is not None and checked[2]:
+                        response = app.make_response(('', 304))
+                    else:
+                        response = app.make_response(await handler())
+                    response = render_cache.stamp(response, checked)
+                response = app.process_response(response)
+            except Exception as err:
+                response = app.make_response(app.handle_exception(err))
+    finally:
+        ctx.pop()
+
+    if response is None:
+        await wsgi_application(scope, receive, send)
+    else:
+        await send_response(response, send)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await db.start()
+            except Exception as err:
+                await send({'type': 'lifespan.startup.failed', 'message': str(err)})
+                return
+            print("✅ Async database pool created successfully.")
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await db.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+
+    native = NATIVE_ROUTES.get(scope.get('path')) if scope['type'] == 'http' and scope['method'] == 'GET' else None
+    if native is not None:
+        role, handler, serves, tables_for = native
+        if serves(dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))):
+            return await serve_native(role, handler, tables_for, scope, receive, send)
+    await wsgi_application(scope, receive, send)
@@ -0,0 +1,92 @@
+"""
+Async MySQL access for the ASGI entry point (asgi.py), on an aiomysql pool.
+
+    db = AsyncDatabase(config, maxsize=20)
+    await db.start()
+    flights = await db.query("SELECT * FROM upcoming_flights", fetchall=True)
+    results = await db.gather(
+        flights=("SELECT * FROM upcoming_flights", ()),
+        employees=("SELECT emp_id, name, salary FROM employee", ()),
+    )
+
+gather() runs each statement on its own pooled connection at the same time, so a page
+that needs several independent reads waits for the slowest one, not for their sum.
+"""
+import asyncio
+import time
+
+import aiomysql
+
+
+class AsyncDatabase:
+    """
+    :param config: mysql.connector style connection settings (db_config.config)
+    :param minsize: connections opened at start()
+    :param maxsize: most connections open at once; further queries wait for a free one
+    :param recycle: seconds after which a connection is replaced
+    :param on_query: optional callback(sql, params, seconds, rows) after each statement
+    """
+
+    def __init__(self, config, minsize=1, maxsize=10, recycle=1800, on_query=None):
+        self.connect_args = {
+            'host': config.get('host', 'localhost'),
+            'port': config.get('port', 3306),
+            'user': config.get('user'),
+            'password': config.get('password', ''),
+            'db': config.get('database'),
+            'autocommit': config.get('autocommit', True),
+        }
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.recycle = recycle
+        self.on_query = on_query
+        self.pool = None
+
+    async def start(self):
+        if self.pool is None:
+            self.pool = await aiomysql.create_pool(minsize=self.minsize, maxsize=self.maxsize,
+                                                   pool_recycle=self.recycle, **self.connect_args)
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def query(self, sql, params=(), fetchone=False, fetchall=False):
+        """Runs one statement. Returns a dict row, a list of dict rows, or the affected row count."""
+        await self.start()
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(sql, params or ())
+                if fetchone:
+                    result = await cursor.fetchone()
+                    rows = 1 if result else 0
+                elif fetchall:
+                    result = list(await cursor.fetchall())
+                    rows = len(result)
+                else:
+                    result = rows = cursor.rowcount
+        if self.on_query:
+            self.on_query(sql, params, time.perf_counter() - started, rows)
+        return result
+
+    async def gather(self, **statements):
+        """
+        Runs independent reads concurrently.
+        :param statements: name=(sql, params) for fetchall, or name=(sql, params, 'one') for fetchone
+        :return: {name: result}
+        """
+        names = list(statements)
+        results = await asyncio.gather(*(
+            self.query(spec[0], spec[1], fetchone=spec[2:] == ('one',), fetchall=spec[2:] != ('one',))
+            for spec in statements.values()
+        ))
+        return dict(zip(names, results))
+
+    def stats(self):
+        if self.pool is None:
+            return {'started': False}
+        return {'started': True, 'size': self.pool.size, 'free': self.pool.freesize,
+                'minsize': self.pool.minsize, 'maxsize': self.pool.maxsize}
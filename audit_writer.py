@@ -0,0 +1,130 @@
+"""
+Writes the application's audit_log rows in batches from a background thread.
+
+    audit = AuditWriter(borrow, batch_size=200, flush_interval=1.0)
+    audit.log('booking', booking_id, 'CREATE', 'New booking via procedure', 'Passenger')
+
+log() only puts the row on an in-memory queue, so a booking's response time doesn't
+include the audit INSERT. The writer thread turns whatever has queued up into one
+multi-row INSERT at least every flush_interval seconds. created_at is taken when log()
+is called, so rows keep their real order however late they are written.
+
+The app's pooled connections set @audit_deferred = 1, which makes book_flight and
+trg_audit_booking_update leave their audit rows to the app (migrations/0008_deferred_audit.sql).
+Scripts and other clients that don't set it still get them written by the database.
+
+If the database is unreachable the batch is kept in memory and retried. When max_queue
+rows are waiting, log() writes the backlog itself (slowing requests down rather than
+dropping rows). Rows still queued when the process exits are flushed by an atexit hook.
+"""
+import atexit
+import collections
+import datetime
+import os
+import queue
+import threading
+import time
+
+import mysql.connector
+
+INSERT_SQL = """
+    INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+
+class AuditWriter:
+    """
+    :param borrow: borrow() -> a pooled connection whose close() gives it back
+    :param batch_size: most rows written by one INSERT
+    :param flush_interval: seconds a row waits at most before it is written
+    :param max_queue: rows held in memory (queued or waiting for a retry) before log() writes them itself
+    """
+
+    def __init__(self, borrow, batch_size=200, flush_interval=1.0, max_queue=10000):
+        self.borrow = borrow
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._retry = collections.deque()  # rows of batches that failed, written first next time
+        self._write_lock = threading.Lock()  # one writer at a time: the thread, flush() or a backed-up log()
+        self._thread_pid = None
+        self._start_lock = threading.Lock()
+        self._counters = {'logged': 0, 'written': 0, 'batches': 0, 'failures': 0, 'inline_flushes': 0}
+        atexit.register(self.flush)
+
+    def log(self, table_name, record_id, action_type, description, changed_by):
+        """Queues one audit_log row. Never waits on the database unless the queue is full."""
+        if self._thread_pid != os.getpid():
+            self._start()
+        row = (table_name, record_id, action_type, description, changed_by, datetime.datetime.now())
+        self._counters['logged'] += 1
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # The writer has fallen behind (or the database is down): write the backlog here
+            self._counters['inline_flushes'] += 1
+            self.flush()
+            self._queue.put(row)
+
+    def _start(self):
+        # Started lazily, and again in each worker process forked after the first log()
+        with self._start_lock:
+            if self._thread_pid != os.getpid():
+                self._thread_pid = os.getpid()
+                threading.Thread(target=self._run, name='audit-writer', daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                first = None
+            self._write(first)
+            if self._retry:
+                time.sleep(self.flush_interval)  # database trouble: don't spin
+
+    def _drain(self, first=None):
+        rows = list(self._retry)
+        self._retry.clear()
+        if first is not None:
+            rows.append(first)
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _write(self, first=None):
+        with self._write_lock:
+            rows = self._drain(first)
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                try:
+                    self._insert(batch)
+                except mysql.connector.Error as err:
+                    self._counters['failures'] += 1
+                    print(f"❌ Audit log write failed, {len(rows) - start} rows kept for retry: {err}")
+                    self._retry.extend(rows[start:])
+                    return False
+            return True
+
+    def _insert(self, batch):
+        conn = self.borrow()
+        cursor = conn.cursor()
+        try:
+            cursor.executemany(INSERT_SQL, batch)
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+        self._counters['written'] += len(batch)
+        self._counters['batches'] += 1
+
+    def flush(self):
+        """Writes everything queued so far. Returns False if some rows could not be written."""
+        return self._write()
+
+    def stats(self):
+        return dict(self._counters, queued=self._queue.qsize() + len(self._retry))
@@ -0,0 +1,133 @@
+"""
+JSON encoding of the upcoming_flights result: jsonify vs the API's msgspec Structs.
+
+Encodes the same rows both ways and prints the time per response, rows per second and
+payload size (raw and gzipped):
+
+    python benchmarks/bench_api.py                   # 2,000 synthetic rows, no database
+    python benchmarks/bench_api.py --rows 20000
+    python benchmarks/bench_api.py --db              # the real upcoming_flights view
+
+'msgspec' times what GET /api/v1/flights does with the query rows: msgspec.convert()
+into api.Flight Structs, then encoding. 'msgspec (encode)' times the encoding alone, of
+Structs built beforehand.
+"""
+import argparse
+import datetime
+import decimal
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+from flask import Flask, jsonify  # noqa: E402
+
+import api  # noqa: E402
+from db_config import config  # noqa: E402
+
+AIRPORTS = [('BOM', 'Mumbai'), ('DEL', 'Delhi'), ('BLR', 'Bengaluru'), ('MAA', 'Chennai'),
+            ('CCU', 'Kolkata'), ('HYD', 'Hyderabad'), ('DXB', 'Dubai'), ('LHR', 'London')]
+MODELS = [('A320', 180), ('B737', 160), ('ATR 72', 72), ('B787', 250), ('A350', 300)]
+
+
+def synthetic(n, seed):
+    """Rows shaped like the upcoming_flights view as mysql-connector returns them."""
+    rng = random.Random(seed)
+    start = datetime.datetime.now().replace(microsecond=0)
+    rows = []
+    for flight_id in range(1, n + 1):
+        (src_code, src_name), (dst_code, dst_name) = rng.sample(AIRPORTS, 2)
+        model, capacity = rng.choice(MODELS)
+        booked = rng.randint(0, capacity)
+        departure = start + datetime.timedelta(minutes=rng.randint(60, 60 * 24 * 90))
+        rows.append({
+            'flight_id': flight_id,
+            'flight_no': f'AI{flight_id:05d}',
+            'airline': rng.choice(('Air India', 'IndiGo', 'Vistara', 'Emirates')),
+            'route_id': rng.randint(1, 400),
+            'source_code': src_code,
+            'source_name': src_name,
+            'dest_code': dst_code,
+            'dest_name': dst_name,
+            'departure_time': departure,
+            'arrival_time': departure + datetime.timedelta(minutes=rng.randint(60, 600)),
+            'current_fare': decimal.Decimal(f'{rng.uniform(2500, 45000):.2f}'),
+            'status': 'Scheduled',
+            'gate': f'{rng.choice("ABCD")}{rng.randint(1, 30)}',
+            'aircraft_model': model,
+            'capacity': capacity,
+            'seats_booked': booked,
+            'seats_remaining': capacity - booked,
+            'load_factor': decimal.Decimal(f'{booked / capacity * 100:.2f}'),
+        })
+    return rows
+
+
+def from_db(limit):
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT * FROM upcoming_flights ORDER BY departure_time LIMIT %s", (limit,))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def best_of(repeat, fn):
+    """(fastest seconds, result) over `repeat` runs."""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20, help='runs per encoder, the fastest is reported')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', action='store_true', help='encode rows of the upcoming_flights view instead')
+    args = parser.parse_args()
+
+    rows = from_db(args.rows) if args.db else synthetic(args.rows, args.seed)
+    if not rows:
+        print("❌ No upcoming flights. Run benchmarks/generate_data.py first.")
+        raise SystemExit(1)
+    structs = api.FlightList(flights=api.convert(rows, list[api.Flight]))
+
+    flask_app = Flask(__name__)
+    with flask_app.app_context():
+        cases = {
+            'jsonify': lambda: jsonify(flights=rows).get_data(),
+            'msgspec': lambda: api.respond(api.FlightList(flights=api.convert(rows, list[api.Flight]))).get_data(),
+            'msgspec (encode)': lambda: api.encoder.encode(structs),
+        }
+        results = {name: best_of(args.repeat, fn) for name, fn in cases.items()}
+
+    # Same flights and fields either way
+    flask_flights = json.loads(results['jsonify'][1])['flights']
+    api_flights = json.loads(results['msgspec'][1])['flights']
+    if len(flask_flights) != len(api_flights) or any(a.keys() != b.keys() for a, b in zip(flask_flights, api_flights)):
+        print("❌ jsonify and msgspec payloads don't hold the same flights and fields")
+        raise SystemExit(1)
+
+    print(f"Encoding {len(rows):,} upcoming flights ({'upcoming_flights view' if args.db else 'synthetic rows'}), "
+          f"best of {args.repeat}")
+    baseline = results['jsonify'][0]
+    for name, (seconds, body) in results.items():
+        print(f"  {name:<17} {seconds * 1000:8.2f} ms  {len(rows) / seconds:12,.0f} rows/s  "
+              f"{len(body) / 1024:8.1f} KiB  {len(gzip.compress(body)) / 1024:7.1f} KiB gzipped"
+              f"   ({baseline / seconds:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+WSGI vs ASGI throughput comparison.
+
+Start both servers against the same database, then point this script at them:
+
+    python app.py                                             # Flask dev server (WSGI) on :5000
+    uvicorn asgi:application --port 8000                      # asyncio + aiomysql on :8000
+    python benchmarks/bench_asgi.py --target wsgi=http://127.0.0.1:5000 --target asgi=http://127.0.0.1:8000
+
+For a fair production comparison run the WSGI app under a real server too, e.g.
+`gunicorn -w 4 --threads 8 app:app` against `uvicorn asgi:application --workers 4`.
+
+Each target gets the same closed-loop load: --concurrency clients logged in as the admin
+(and as a passenger for the search page) fetch the pages back to back for --duration
+seconds. Reports requests/sec and p50/p95/p99 latency per page and target.
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+
+from http_load import Client, summarize
+
+PAGES = [
+    ('admin', '/dashboard/admin'),
+    ('admin', '/dashboard/admin?page=flights'),
+    ('admin', '/dashboard/admin?page=payroll'),
+    ('passenger', '/passenger/search?source=BOM'),
+]
+
+LOGINS = {
+    'admin': ('/login/admin', {'username': 'admin', 'password': 'admin123'}),
+    'passenger': ('/login/passenger', {'passport_no': 'P12345678'}),
+}
+
+
+def login(client, role):
+    path, form = LOGINS[role]
+    client.request('POST', path, form)
+
+
+def run_target(base_url, concurrency, duration):
+    latencies = {path: [] for _, path in PAGES}
+    errors = {}
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker():
+        clients = {}
+        for role in LOGINS:
+            clients[role] = Client(base_url)
+            login(clients[role], role)
+        i = 0
+        while time.perf_counter() < stop_at:
+            role, path = PAGES[i % len(PAGES)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                status, _ = clients[role].request('GET', path)
+            except (OSError, http.client.HTTPException) as err:
+                status = type(err).__name__
+                clients[role] = Client(base_url)
+                login(clients[role], role)
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status == 200:
+                    latencies[path].append(elapsed)
+                else:
+                    errors[str(status)] = errors.get(str(status), 0) + 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    everything = [v for values in latencies.values() for v in values]
+    return dict(summarize(everything, elapsed), errors=errors,
+                pages={path: summarize(values, elapsed) for path, values in latencies.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', action='append', required=True, metavar='NAME=URL',
+                        help='server to load, e.g. wsgi=http://127.0.0.1:5000 (repeatable)')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds per target')
+    parser.add_argument('--json', metavar='FILE', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for target in args.target:
+        name, _, url = target.partition('=')
+        if not url:
+            parser.error(f"--target must be NAME=URL, got '{target}'")
+        print(f"Loading {name} ({url}) with {args.concurrency} clients for {args.duration:g}s...")
+        result = results[name] = run_target(url, args.concurrency, args.duration)
+        print(f"  {result['rps']:,.1f} req/s, p50 {result['p50_ms']} ms, p99 {result['p99_ms']} ms, "
+              f"errors: {result['errors'] or 0}")
+        for path, page in result['pages'].items():
+            print(f"    {path:40} {page['requests']:>7} req  p50 {page['p50_ms']:>7} ms  p99 {page['p99_ms']:>7} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'concurrency': args.concurrency, 'duration': args.duration, 'results': results}, f, indent=2)
+        print(f"Results written to {args.json}")
+    if any(r['errors'] for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Concurrent booking load test.
+
+Creates a throwaway flight and passengers, then fires more booking attempts than there
+are seats from many threads at once and checks that the flight was never oversold and
+that no seat was sold twice. Run it twice to compare the booking engine with the old
+check-then-insert logic:
+
+    python benchmarks/bench_booking.py                      # CALL book_flight (row-locked counter)
+    python benchmarks/bench_booking.py --legacy             # old COUNT(*) then INSERT, for comparison
+    python benchmarks/bench_booking.py --threads 64 --attempts 2000
+
+Everything it creates is deleted again at the end (use --keep to inspect it).
+Needs the schema from migrate.py and the credentials in db_config.py.
+"""
+import argparse
+import datetime
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+from mysql.connector import pooling  # noqa: E402
+
+from db_config import config  # noqa: E402
+
+# The check-then-insert sequence book_flight used before the booking engine
+LEGACY_COUNT_SQL = """
+    SELECT ac.capacity,
+           (SELECT COUNT(*) FROM booking WHERE flight_id = %s AND status = 'Confirmed')
+    FROM flight f JOIN aircraft ac ON f.aircraft_id = ac.aircraft_id
+    WHERE f.flight_id = %s
+"""
+LEGACY_INSERT_SQL = """
+    INSERT INTO booking (passenger_id, flight_id, seat_no, status, booked_by)
+    VALUES (%s, %s, %s, 'Confirmed', 'LoadTest')
+"""
+
+
+def seat_label(i):
+    return f"{i // 6 + 1}{'ABCDEF'[i % 6]}"
+
+
+def setup(conn, passengers):
+    cursor = conn.cursor()
+    tag = datetime.datetime.now().strftime('%H%M%S%f')
+    cursor.execute("SELECT route_id FROM route ORDER BY route_id LIMIT 1")
+    route_id = cursor.fetchone()[0]
+    cursor.execute("SELECT aircraft_id, capacity FROM aircraft ORDER BY capacity LIMIT 1")
+    aircraft_id, capacity = cursor.fetchone()
+    departure = datetime.datetime.now() + datetime.timedelta(days=30)
+    cursor.execute(
+        "INSERT INTO flight (flight_no, airline, route_id, aircraft_id, departure_time, arrival_time, base_fare) "
+        "VALUES (%s, 'LoadTest', %s, %s, %s, %s, 100.00)",
+        (f"LT{tag}"[:20], route_id, aircraft_id, departure, departure + datetime.timedelta(hours=2))
+    )
+    flight_id = cursor.lastrowid
+    passenger_ids = []
+    for i in range(passengers):
+        cursor.execute("INSERT INTO passenger (name, passport_no) VALUES (%s, %s)",
+                       (f"Load Test {i}", f"LT{tag}{i:04d}"[:50]))
+        passenger_ids.append(cursor.lastrowid)
+    conn.commit()
+    cursor.close()
+    return flight_id, capacity, passenger_ids
+
+
+def teardown(conn, flight_id, passenger_ids):
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM flight WHERE flight_id = %s", (flight_id,))
+    cursor.execute(f"DELETE FROM passenger WHERE passenger_id IN ({', '.join(['%s'] * len(passenger_ids))})",
+                   tuple(passenger_ids))
+    # Recompute the dashboard counters without the benchmark's rows
+    cursor.callproc('sp_refresh_dashboard_counters')
+    conn.commit()
+    cursor.close()
+
+
+def book(conn, flight_id, passenger_id, seat, legacy):
+    cursor = conn.cursor()
+    try:
+        if legacy:
+            cursor.execute(LEGACY_COUNT_SQL, (flight_id, flight_id))
+            capacity, booked = cursor.fetchone()
+            if booked >= capacity:
+                return 'full'
+            cursor.execute(LEGACY_INSERT_SQL, (passenger_id, flight_id, seat))
+        else:
+            cursor.execute("CALL book_flight(%s, %s, %s, %s)", (passenger_id, flight_id, seat, 'LoadTest'))
+        conn.commit()
+        return 'booked'
+    except mysql.connector.Error as err:
+        conn.rollback()
+        if err.sqlstate == '45000':
+            return 'full' if 'full' in err.msg else 'rejected'
+        return f'error {err.errno}'
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--attempts', type=int, default=None, help='booking attempts (default: 2x capacity)')
+    parser.add_argument('--passengers', type=int, default=20)
+    parser.add_argument('--legacy', action='store_true')
+    parser.add_argument('--keep', action='store_true')
+    args = parser.parse_args()
+
+    pool = pooling.MySQLConnectionPool(pool_name='bench_booking', pool_size=min(args.threads + 1, 32), **config)
+    admin_conn = pool.get_connection()
+    flight_id, capacity, passenger_ids = setup(admin_conn, args.passengers)
+    attempts = args.attempts or capacity * 2
+
+    counter = iter(range(attempts))
+    counter_lock = threading.Lock()
+    outcomes = {}
+    outcomes_lock = threading.Lock()
+
+    def worker():
+        conn = pool.get_connection()
+        try:
+            while True:
+                with counter_lock:
+                    i = next(counter, None)
+                if i is None:
+                    return
+                # Every attempt uses a distinct seat so only capacity limits the outcome
+                result = book(conn, flight_id, passenger_ids[i % len(passenger_ids)], seat_label(i), args.legacy)
+                with outcomes_lock:
+                    outcomes[result] = outcomes.get(result, 0) + 1
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(min(args.threads, pool.pool_size - 1))]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    cursor = admin_conn.cursor()
+    cursor.execute("SELECT COUNT(*), COUNT(DISTINCT seat_no) FROM booking WHERE flight_id = %s AND status = 'Confirmed'",
+                   (flight_id,))
+    confirmed, distinct_seats = cursor.fetchone()
+    cursor.close()
+
+    mode = 'legacy check-then-insert' if args.legacy else 'book_flight engine'
+    print(f"{mode}: {attempts} attempts from {len(threads)} threads on a {capacity}-seat flight in {elapsed:.2f}s")
+    print(f"Outcomes: {outcomes}")
+    print(f"Throughput: {attempts / elapsed:,.0f} attempts/s, {outcomes.get('booked', 0) / elapsed:,.0f} bookings/s")
+    oversold = max(confirmed - capacity, 0)
+    double_sold = confirmed - distinct_seats
+    print(f"Confirmed bookings: {confirmed}/{capacity} (oversold: {oversold}, seats sold twice: {double_sold})")
+
+    if not args.keep:
+        teardown(admin_conn, flight_id, passenger_ids)
+    admin_conn.close()
+
+    if oversold or double_sold:
+        print("❌ Flight was oversold.")
+        sys.exit(1)
+    print("✅ No oversells.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Memory check for the streaming admin exports.
+
+Exports a million synthetic bookings through exports.encode() and reports peak RSS,
+failing if it grows by more than --max-growth-mb after the first 10k rows.
+
+    python benchmarks/bench_export.py                 # synthetic rows generated in Python
+    python benchmarks/bench_export.py --db            # rows generated by MySQL, streamed via exports.stream_rows
+    python benchmarks/bench_export.py --format ndjson --rows 2000000
+"""
+import argparse
+import datetime
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import exports  # noqa: E402
+
+# A million booking-shaped rows built server-side with a recursive CTE
+DB_SQL = """
+    WITH RECURSIVE seq (n) AS (
+        SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s
+    )
+    SELECT /*+ SET_VAR(cte_max_recursion_depth = {depth}) */
+        n AS booking_id,
+        CONCAT('Passenger ', n) AS name,
+        CONCAT('XX-', MOD(n, 5000)) AS flight_no,
+        TIMESTAMP('2025-01-01') + INTERVAL n SECOND AS booking_date,
+        CONCAT(MOD(n, 40) + 1, ELT(MOD(n, 6) + 1, 'A', 'B', 'C', 'D', 'E', 'F')) AS seat_no,
+        IF(MOD(n, 10) = 0, 'Cancelled', 'Confirmed') AS status
+    FROM seq
+"""
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def synthetic_rows(count):
+    start = datetime.datetime(2025, 1, 1)
+    for n in range(1, count + 1):
+        yield {
+            'booking_id': n,
+            'name': f'Passenger {n}',
+            'flight_no': f'XX-{n % 5000}',
+            'booking_date': start + datetime.timedelta(seconds=n),
+            'seat_no': f'{n % 40 + 1}{"ABCDEF"[n % 6]}',
+            'status': 'Cancelled' if n % 10 == 0 else 'Confirmed',
+        }
+
+
+def db_rows(count):
+    import mysql.connector
+    from mysql.connector import pooling
+    from db_config import config
+
+    pool = pooling.MySQLConnectionPool(pool_name='bench_export', pool_size=1, **config)
+    # The CTE needs a recursion depth of at least the row count
+    sql = DB_SQL.format(depth=count + 1)
+    try:
+        yield from exports.stream_rows(pool, sql, (count,))
+    except mysql.connector.Error as err:
+        print(f"❌ Database error: {err}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--format', choices=sorted(exports.FORMATS), default='csv')
+    parser.add_argument('--db', action='store_true', help='stream rows from MySQL instead of Python')
+    parser.add_argument('--max-growth-mb', type=float, default=20.0)
+    args = parser.parse_args()
+
+    rows = db_rows(args.rows) if args.db else synthetic_rows(args.rows)
+    warmup_rss = None
+    written = lines = 0
+    started = time.perf_counter()
+    for line in exports.encode(rows, args.format):
+        written += len(line)
+        lines += 1
+        if lines == 10_000:
+            warmup_rss = peak_rss_mb()
+    elapsed = time.perf_counter() - started
+
+    final_rss = peak_rss_mb()
+    growth = final_rss - (warmup_rss or final_rss)
+    print(f"Exported {args.rows:,} rows as {args.format} ({written / 1e6:.1f} MB) in {elapsed:.1f}s "
+          f"({args.rows / elapsed:,.0f} rows/s)")
+    print(f"Peak RSS: {warmup_rss or 0:.1f} MB after 10k rows, {final_rss:.1f} MB at the end (+{growth:.1f} MB)")
+    if growth > args.max_growth_mb:
+        print(f"❌ RSS grew by more than {args.max_growth_mb} MB")
+        sys.exit(1)
+    print("✅ Memory stayed bounded.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Connection pool load test.
+
+Runs more concurrent workers than the pool has connections (2-5x by default), each
+borrowing a connection, holding it for a short query and handing it back, and reports how
+many borrows failed and how long callers waited:
+
+    python benchmarks/bench_pool.py                   # db_pool.ConnectionPool against MySQL
+    python benchmarks/bench_pool.py --stock           # mysql.connector's MySQLConnectionPool, for comparison
+    python benchmarks/bench_pool.py --stand-in        # no MySQL needed: connections are simulated in-process
+    python benchmarks/bench_pool.py --multipliers 2 5 --hold 0.05
+
+The stock pool raises PoolError as soon as every connection is busy, the ConnectionPool
+queues the caller for up to --timeout seconds instead.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+from mysql.connector import pooling  # noqa: E402
+
+from db_config import config  # noqa: E402
+from db_pool import ConnectionPool  # noqa: E402
+
+
+class StandInConnection:
+    """Simulated connection: a query just sleeps for the requested time."""
+
+    in_transaction = False
+
+    def __init__(self, **kwargs):
+        time.sleep(0.002)  # connection setup
+
+    def cursor(self, **kwargs):
+        return self
+
+    def execute(self, sql, params=()):
+        time.sleep(params[0] if params else 0)
+
+    def fetchall(self):
+        return [(0,)]
+
+    def ping(self, reconnect=False):
+        pass
+
+    def reset_session(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_pool(args, size):
+    if args.stock:
+        return pooling.MySQLConnectionPool(pool_name='bench_pool', pool_size=size, **config)
+    connect = StandInConnection if args.stand_in else mysql.connector.connect
+    return ConnectionPool(pool_name='bench_pool', pool_size=size, max_overflow=args.overflow,
+                          timeout=args.timeout, connect=connect, **config)
+
+
+def run(pool, workers, rounds, hold):
+    waits, errors = [], {}
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(rounds):
+            started = time.perf_counter()
+            try:
+                conn = pool.get_connection()
+            except mysql.connector.Error as err:
+                with lock:
+                    errors[type(err).__name__] = errors.get(type(err).__name__, 0) + 1
+                continue
+            waited = time.perf_counter() - started
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT SLEEP(%s)", (hold,))
+                cursor.fetchall()
+            finally:
+                conn.close()
+            with lock:
+                waits.append(waited)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return waits, errors, time.perf_counter() - started
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pool-size', type=int, default=10)
+    parser.add_argument('--overflow', type=int, default=0, help='ConnectionPool max_overflow (default 0 to show queuing)')
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--multipliers', type=float, nargs='+', default=[2, 3, 5],
+                        help='concurrency as multiples of the pool size')
+    parser.add_argument('--rounds', type=int, default=20, help='borrows per worker')
+    parser.add_argument('--hold', type=float, default=0.02, help='seconds each borrow holds the connection')
+    parser.add_argument('--stock', action='store_true')
+    parser.add_argument('--stand-in', action='store_true')
+    args = parser.parse_args()
+    if args.stock and args.stand_in:
+        parser.error('--stand-in only applies to ConnectionPool')
+
+    name = 'MySQLConnectionPool' if args.stock else 'ConnectionPool' + (' (stand-in)' if args.stand_in else '')
+    failed = False
+    for multiplier in args.multipliers:
+        workers = int(args.pool_size * multiplier)
+        pool = make_pool(args, args.pool_size)
+        waits, errors, elapsed = run(pool, workers, args.rounds, args.hold)
+        attempts = workers * args.rounds
+        print(f"{name}: {workers} workers ({multiplier:g}x pool of {args.pool_size}), {attempts} borrows in {elapsed:.2f}s")
+        print(f"  ok: {len(waits)}, errors: {errors or 0}, throughput: {len(waits) / elapsed:,.0f} borrows/s")
+        print(f"  wait p50 {percentile(waits, 50) * 1000:.1f} ms, p95 {percentile(waits, 95) * 1000:.1f} ms, "
+              f"p99 {percentile(waits, 99) * 1000:.1f} ms, max {max(waits, default=0) * 1000:.1f} ms")
+        if hasattr(pool, 'stats'):
+            stats = pool.stats()
+            print(f"  pool: open {stats['open']}, waits {stats['waits']}, timeouts {stats['timeouts']}, "
+                  f"created {stats['created']}")
+            pool.close_all()
+        failed = failed or bool(errors)
+
+    if failed:
+        print("❌ Some borrows failed.")
+        sys.exit(1)
+    print("✅ Every borrow succeeded.")
+
+
+if __name__ == '__main__':
+    main()
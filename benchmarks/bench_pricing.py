@@ -0,0 +1,128 @@
+"""
+Fare repricing: batched vs per-row.
+
+Compares pricing.reprice() (a column at a time over the whole batch, the route demand
+aggregated once) with calling pricing.price() flight by flight, and checks both give the
+same fares:
+
+    python benchmarks/bench_pricing.py                     # 100k synthetic flights, no database
+    python benchmarks/bench_pricing.py --flights 500000
+
+With --db it also times writing the fares of up to --flights upcoming flights (fill the
+database with benchmarks/generate_data.py first): one UPDATE per flight against
+pricing.write_fares (temporary table + a single UPDATE ... JOIN). Both run in a
+transaction that is rolled back, so fares are left as they were.
+
+    python benchmarks/bench_pricing.py --db --flights 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+
+import pricing  # noqa: E402
+from db_config import config  # noqa: E402
+
+
+def synthetic(n, routes, seed):
+    rng = random.Random(seed)
+    capacities = [rng.choice((72, 150, 180, 220, 300)) for _ in range(n)]
+    return {
+        'flight_ids': list(range(1, n + 1)),
+        'route_ids': [rng.randrange(1, routes + 1) for _ in range(n)],
+        'base_fares': [round(rng.uniform(2500, 45000), 2) for _ in range(n)],
+        'seats_booked': [rng.randint(0, c) for c in capacities],
+        'capacities': capacities,
+        'days_left': [rng.uniform(0, 120) for _ in range(n)],
+    }
+
+
+def per_row(cols):
+    """The same fares, one price() call per flight (the route loads are still computed once)."""
+    routes, network = pricing.route_loads(cols['route_ids'], cols['seats_booked'], cols['capacities'])
+    return [pricing.price(base, booked, capacity, days, routes[route], network)
+            for base, booked, capacity, days, route in zip(cols['base_fares'], cols['seats_booked'],
+                                                            cols['capacities'], cols['days_left'],
+                                                            cols['route_ids'])]
+
+
+def batched(cols):
+    return pricing.reprice(cols['flight_ids'], cols['route_ids'], cols['base_fares'],
+                           cols['seats_booked'], cols['capacities'], cols['days_left'])
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def bench_compute(args):
+    cols = synthetic(args.flights, args.routes, args.seed)
+    print(f"Pricing {args.flights:,} flights on {args.routes} routes")
+    rows, row_seconds = timed(per_row, cols)
+    batch, batch_seconds = timed(batched, cols)
+    if rows != batch:
+        mismatched = sum(a != b for a, b in zip(rows, batch))
+        print(f"❌ {mismatched} fares differ between the per-row and batched pricing")
+        raise SystemExit(1)
+    print(f"  per-row  {row_seconds * 1000:9.1f} ms   {args.flights / row_seconds:12,.0f} flights/s")
+    print(f"  batched  {batch_seconds * 1000:9.1f} ms   {args.flights / batch_seconds:12,.0f} flights/s"
+          f"   ({row_seconds / batch_seconds:.1f}x)")
+
+
+def bench_write(args):
+    conn = mysql.connector.connect(**dict(config, autocommit=False))
+    cursor = conn.cursor()
+    cursor.execute(pricing.UPCOMING_SQL + " LIMIT %s", (args.flights,))
+    rows = cursor.fetchall()
+    if not rows:
+        print("❌ No upcoming flights to reprice. Run benchmarks/generate_data.py first.")
+        raise SystemExit(1)
+    flight_ids, route_ids, base_fares, _, days_left, capacities, booked = zip(*rows)
+    fares = pricing.reprice(flight_ids, route_ids, base_fares, booked, capacities, [float(d) for d in days_left])
+    updates = list(zip(flight_ids, fares))
+    print(f"Writing {len(updates):,} fares (rolled back afterwards)")
+
+    try:
+        started = time.perf_counter()
+        conn.start_transaction()
+        for flight_id, fare in updates:
+            cursor.execute("UPDATE flight SET current_fare = %s WHERE flight_id = %s", (fare, flight_id))
+        row_seconds = time.perf_counter() - started
+        conn.rollback()
+
+        started = time.perf_counter()
+        pricing.write_fares(cursor, updates, args.chunk)
+        batch_seconds = time.perf_counter() - started
+        conn.rollback()
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"  per-row  {row_seconds * 1000:9.1f} ms   {len(updates):,} UPDATE statements")
+    print(f"  batched  {batch_seconds * 1000:9.1f} ms   {-(-len(updates) // args.chunk)} INSERT batches + 1 UPDATE"
+          f"   ({row_seconds / batch_seconds:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--flights', type=int, default=100000)
+    parser.add_argument('--routes', type=int, default=400, help='routes of the synthetic flights')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', action='store_true', help='also time the database writes')
+    parser.add_argument('--chunk', type=int, default=5000, help='rows per INSERT into the temporary table')
+    args = parser.parse_args()
+
+    bench_compute(args)
+    if args.db:
+        bench_write(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+"""
+Load test of the real Flask routes, with results kept as JSON for regression comparison.
+
+Fill the database first (see generate_data.py), start the app, then:
+
+    python benchmarks/bench_routes.py --url http://127.0.0.1:5000 --concurrency 32 --duration 60 \\
+        --json results/baseline.json
+    # ...change something, restart the app...
+    python benchmarks/bench_routes.py --url http://127.0.0.1:5000 --concurrency 32 --duration 60 \\
+        --json results/after.json --baseline results/baseline.json
+
+Every virtual user logs in as a random generated passenger (plus the admin and an
+employee when its mix needs them) and runs scenarios back to back, picked by --mix:
+
+  search     GET /passenger/search between two airports of the generated routes
+  book       POST /passenger/book on an upcoming flight, seat auto-assigned
+  cancel     POST /passenger/booking/cancel on a booking the user made earlier in the run
+  passenger  the passenger's bookings or profile page
+  admin      an admin dashboard section (stats, flights, bookings, reports, payroll)
+  employee   the employee's assigned flights or payroll page
+
+Requests in the first --warmup seconds are not counted. The report has requests/sec and
+p50/p90/p95/p99/max latency per scenario. With --baseline, a scenario whose p95 grew or
+whose throughput dropped by more than --tolerance percent fails the run (exit code 1).
+
+Fixtures (passports, airports, flights, employees) are read from the database, from the
+rows in generate_data.py's manifest when there is one, so the default login and the
+booking lookups need the credentials in db_config.py.
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+
+from db_config import config  # noqa: E402
+from generate_data import DEFAULT_MANIFEST  # noqa: E402
+from http_load import Client, summarize  # noqa: E402
+
+DEFAULT_MIX = 'search=40,book=10,cancel=5,passenger=20,admin=15,employee=10'
+
+SCENARIO_ROLES = {
+    'search': 'passenger', 'book': 'passenger', 'cancel': 'passenger', 'passenger': 'passenger',
+    'admin': 'admin', 'employee': 'employee',
+}
+
+ADMIN_PAGES = ['/dashboard/admin', '/dashboard/admin?page=flights', '/dashboard/admin?page=bookings',
+               '/dashboard/admin?page=reports', '/dashboard/admin?page=payroll']
+PASSENGER_PAGES = ['/dashboard/passenger?page=bookings', '/dashboard/passenger?page=profile']
+EMPLOYEE_PAGES = ['/dashboard/employee?page=flights', '/dashboard/employee?page=payroll']
+
+LATEST_BOOKING_SQL = """
+    SELECT MAX(booking_id) FROM booking
+    WHERE passenger_id = (SELECT passenger_id FROM passenger WHERE passport_no = %s)
+      AND flight_id = %s AND status = 'Confirmed'
+"""
+
+
+def parse_mix(spec):
+    mix = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in SCENARIO_ROLES:
+            raise ValueError(f"unknown scenario '{name}', expected one of {', '.join(SCENARIO_ROLES)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def load_fixtures(manifest_path, sample):
+    """Passports, airport pairs, bookable flights and employee logins to drive the scenarios with."""
+    ranges = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            ranges = json.load(f)['ranges']
+
+    def within(table, column):
+        if table not in ranges:
+            return '', ()
+        return f" AND {column} BETWEEN %s AND %s", tuple(ranges[table])
+
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+    try:
+        clause, params = within('passenger', 'passenger_id')
+        cursor.execute(f"SELECT passport_no FROM passenger WHERE 1 = 1{clause} ORDER BY RAND() LIMIT %s",
+                       params + (sample,))
+        passports = [row[0] for row in cursor.fetchall()]
+
+        clause, params = within('route', 'route_id')
+        cursor.execute(f"SELECT source_code, dest_code FROM route WHERE 1 = 1{clause}", params)
+        routes = cursor.fetchall()
+
+        clause, params = within('flight', 'flight_id')
+        cursor.execute(f"SELECT flight_id FROM upcoming_flights WHERE seats_remaining > 0{clause} "
+                       f"ORDER BY RAND() LIMIT %s", params + (sample,))
+        flights = [row[0] for row in cursor.fetchall()]
+
+        clause, params = within('employee', 'emp_id')
+        cursor.execute(f"SELECT email, date_of_joining FROM employee WHERE 1 = 1{clause} LIMIT %s",
+                       params + (sample,))
+        employees = [(email, str(joined)) for email, joined in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+    missing = [name for name, rows in (('passengers', passports), ('routes', routes),
+                                       ('upcoming flights', flights), ('employees', employees)) if not rows]
+    if missing:
+        raise SystemExit(f"❌ No {', '.join(missing)} to test with. Run generate_data.py first.")
+    return {'passports': passports, 'routes': routes, 'flights': flights, 'employees': employees}
+
+
+class VirtualUser:
+    """One simulated visitor: a logged-in client per role and the bookings it can cancel."""
+
+    def __init__(self, base_url, fixtures, rng, admin_login):
+        self.base_url = base_url
+        self.fixtures = fixtures
+        self.rng = rng
+        self.admin_login = admin_login
+        self.passport = rng.choice(fixtures['passports'])
+        self.clients = {}
+        self.bookings = []
+        self.db = None
+
+    def client(self, role):
+        client = self.clients.get(role)
+        if client is None:
+            client = self.clients[role] = Client(self.base_url)
+            if role == 'passenger':
+                client.request('POST', '/login/passenger', {'passport_no': self.passport})
+            elif role == 'admin':
+                client.request('POST', '/login/admin', self.admin_login)
+            else:
+                email, joined = self.rng.choice(self.fixtures['employees'])
+                client.request('POST', '/login/employee', {'email': email, 'date_of_joining': joined})
+        return client
+
+    def reset(self):
+        self.clients.clear()
+
+    def latest_booking(self, flight_id):
+        if self.db is None:
+            self.db = mysql.connector.connect(**config)
+        cursor = self.db.cursor()
+        try:
+            cursor.execute(LATEST_BOOKING_SQL, (self.passport, flight_id))
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            cursor.close()
+
+    def run(self, scenario):
+        """Runs one scenario. Returns (timed seconds, outcome): outcome 'ok', a label, or an error."""
+        rng = self.rng
+        if scenario == 'search':
+            source, dest = rng.choice(self.fixtures['routes'])
+            query = {'source': source, 'dest': dest} if rng.random() < 0.7 else {'source': source}
+            return self.timed('passenger', 'GET', '/passenger/search?' + urllib.parse.urlencode(query))
+
+        if scenario == 'book':
+            flight_id = rng.choice(self.fixtures['flights'])
+            seconds, outcome, location = self.timed('passenger', 'POST', '/passenger/book',
+                                                    {'flight_id': flight_id, 'seat_no': ''}, with_location=True)
+            if outcome == 'ok':
+                if 'page=bookings' in location:
+                    booking_id = self.latest_booking(flight_id)
+                    if booking_id:
+                        self.bookings.append(booking_id)
+                else:
+                    outcome = 'rejected'  # flight full or closed, the app flashed the reason
+            return seconds, outcome
+
+        if scenario == 'cancel':
+            if not self.bookings:
+                return self.run('book')
+            booking_id = self.bookings.pop(rng.randrange(len(self.bookings)))
+            return self.timed('passenger', 'POST', '/passenger/booking/cancel', {'booking_id': booking_id})
+
+        pages = {'passenger': PASSENGER_PAGES, 'admin': ADMIN_PAGES, 'employee': EMPLOYEE_PAGES}[scenario]
+        return self.timed(SCENARIO_ROLES[scenario], 'GET', rng.choice(pages))
+
+    def timed(self, role, method, path, form=None, with_location=False):
+        client = self.client(role)
+        started = time.perf_counter()
+        try:
+            status, location = client.request(method, path, form)
+        except (OSError, http.client.HTTPException) as err:
+            self.reset()
+            outcome, location = type(err).__name__, ''
+        else:
+            # Pages answer 200, form posts redirect. A GET redirected elsewhere lost its login.
+            expected = 200 if method == 'GET' else 302
+            outcome = 'ok' if status == expected else f'HTTP {status}'
+            if outcome != 'ok':
+                self.reset()
+        seconds = time.perf_counter() - started
+        return (seconds, outcome, location) if with_location else (seconds, outcome)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+
+
+def run(args, fixtures, mix):
+    names, weights = list(mix), list(mix.values())
+    latencies = {name: [] for name in names}
+    outcomes = {name: {} for name in names}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    measure_from = started + args.warmup
+    stop_at = measure_from + args.duration
+    admin_login = {'username': args.admin_user, 'password': args.admin_password}
+
+    def worker(n):
+        rng = random.Random(args.seed + n)
+        user = VirtualUser(args.url, fixtures, rng, admin_login)
+        try:
+            while time.perf_counter() < stop_at:
+                scenario = rng.choices(names, weights)[0]
+                seconds, outcome = user.run(scenario)
+                if time.perf_counter() < measure_from:
+                    continue
+                with lock:
+                    if outcome == 'ok':
+                        latencies[scenario].append(seconds)
+                    outcomes[scenario][outcome] = outcomes[scenario].get(outcome, 0) + 1
+        finally:
+            user.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - measure_from
+
+    scenarios = {}
+    for name in names:
+        summary = summarize(latencies[name], elapsed)
+        failed = {k: v for k, v in outcomes[name].items() if k not in ('ok', 'rejected')}
+        scenarios[name] = dict(summary, outcomes=outcomes[name], errors=sum(failed.values()))
+    everything = [v for values in latencies.values() for v in values]
+    total = dict(summarize(everything, elapsed), errors=sum(s['errors'] for s in scenarios.values()))
+    return {'total': total, 'scenarios': scenarios}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Prints the change against a baseline run. Returns the scenarios that regressed."""
+    regressed = []
+    print(f"\nAgainst baseline ({baseline['meta'].get('commit')}, {baseline['meta'].get('started_at')}):")
+    for name, now in dict(results['scenarios'], total=results['total']).items():
+        before = baseline['results']['total'] if name == 'total' else baseline['results']['scenarios'].get(name)
+        if not before or not before['requests'] or not now['requests']:
+            continue
+        p95 = (now['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0.0
+        rps = (now['rps'] - before['rps']) / before['rps'] * 100 if before['rps'] else 0.0
+        worse = p95 > tolerance or rps < -tolerance
+        if worse:
+            regressed.append(name)
+        print(f"  {'❌' if worse else '✅'} {name:10} p95 {before['p95_ms']:>8} -> {now['p95_ms']:>8} ms ({p95:+.1f}%)   "
+              f"{before['rps']:>8} -> {now['rps']:>8} req/s ({rps:+.1f}%)")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=int, default=16, help='virtual users')
+    parser.add_argument('--duration', type=float, default=30.0, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5.0, help='seconds run before measuring')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'scenario weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help="generate_data.py's manifest")
+    parser.add_argument('--sample', type=int, default=2000, help='passports and flights to draw from')
+    parser.add_argument('--admin-user', default='admin')
+    parser.add_argument('--admin-password', default='admin123')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='FILE', help='write the results here')
+    parser.add_argument('--baseline', metavar='FILE', help='an earlier --json file to compare with')
+    parser.add_argument('--tolerance', type=float, default=10.0, help='allowed p95 / throughput change in %%')
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as err:
+        parser.error(str(err))
+    fixtures = load_fixtures(args.manifest, args.sample)
+
+    print(f"Loading {args.url} with {args.concurrency} users for {args.duration:g}s "
+          f"(+{args.warmup:g}s warm-up), mix {args.mix}...")
+    results = run(args, fixtures, mix)
+
+    for name, summary in dict(results['scenarios'], total=results['total']).items():
+        print(f"  {name:10} {summary['requests']:>7} req {summary['rps']:>8} req/s   p50 {summary['p50_ms']:>7}  "
+              f"p90 {summary['p90_ms']:>7}  p95 {summary['p95_ms']:>7}  p99 {summary['p99_ms']:>7}  "
+              f"max {summary['max_ms']:>8} ms   errors {summary['errors']}")
+
+    report = {
+        'meta': {
+            'url': args.url,
+            'commit': git_commit(),
+            'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'mix': mix,
+        },
+        'results': results,
+    }
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressed = compare(results, json.load(f), args.tolerance)
+
+    if results['total']['errors']:
+        print(f"❌ {results['total']['errors']} requests failed.")
+        sys.exit(1)
+    if regressed:
+        print(f"❌ Regressed beyond {args.tolerance:g}%: {', '.join(regressed)}")
+        sys.exit(1)
+    print("✅ Done.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,472 @@
+"""
+Synthetic airport data generator.
+
+Fills the schema from migrate.py with realistic volumes for load testing:
+
+    python benchmarks/generate_data.py --scale small      # 2k flights, 20k passengers, 100k bookings
+    python benchmarks/generate_data.py --scale large      # 100k flights, 1M passengers, 10M bookings
+    python benchmarks/generate_data.py --flights 5000 --bookings 500000 --workers 8
+    python benchmarks/generate_data.py --clean            # removes what the last run added
+
+Rows are added next to the existing data with explicit ids above the current maximum and
+written with multi-row INSERTs from --workers connections in parallel. Like the schedule
+import, the loader sets @bulk_import so the per-row insert triggers are skipped, and writes
+what they would have maintained itself, from the same rows: flight_inventory, seat_map,
+passenger_summary_mv and loyalty points. The dashboard counters are recomputed once at
+the end.
+
+Flights are spread over the last and next --days days: past ones are Completed (a few
+Cancelled), future ones Scheduled. Each flight gets a booking load around the average
+needed to reach --bookings, on distinct seats, about 7% of them cancelled and refunded.
+
+The id ranges it created go to a manifest (--manifest) that bench_routes.py reads to pick
+passengers, airports and flights, and that --clean uses to delete them again.
+"""
+import argparse
+import array
+import datetime
+import json
+import math
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+
+from db_config import config  # noqa: E402
+from seat_map import build_bitmap, seat_label, seat_layout  # noqa: E402
+
+DEFAULT_MANIFEST = os.path.join(tempfile.gettempdir(), 'airline_synthetic.json')
+
+SCALES = {
+    #          flights, passengers, bookings
+    'small': (2_000, 20_000, 100_000),
+    'medium': (20_000, 200_000, 1_000_000),
+    'large': (100_000, 1_000_000, 10_000_000),
+}
+
+AIRPORTS = [
+    ('BOM', 'Mumbai', 19.09, 72.87), ('DEL', 'New Delhi', 28.56, 77.10), ('BLR', 'Bengaluru', 13.20, 77.71),
+    ('MAA', 'Chennai', 12.99, 80.17), ('HYD', 'Hyderabad', 17.24, 78.43), ('CCU', 'Kolkata', 22.65, 88.45),
+    ('GOI', 'Goa', 15.38, 73.83), ('PNQ', 'Pune', 18.58, 73.92), ('AMD', 'Ahmedabad', 23.08, 72.63),
+    ('COK', 'Kochi', 10.15, 76.40), ('JAI', 'Jaipur', 26.82, 75.81), ('LKO', 'Lucknow', 26.76, 80.89),
+    ('DXB', 'Dubai', 25.25, 55.36), ('DOH', 'Doha', 25.27, 51.61), ('SIN', 'Singapore', 1.36, 103.99),
+    ('BKK', 'Bangkok', 13.69, 100.75), ('KUL', 'Kuala Lumpur', 2.75, 101.71), ('HKG', 'Hong Kong', 22.31, 113.92),
+    ('NRT', 'Tokyo', 35.77, 140.39), ('SYD', 'Sydney', -33.95, 151.18), ('LHR', 'London', 51.47, -0.45),
+    ('CDG', 'Paris', 49.01, 2.55), ('FRA', 'Frankfurt', 50.04, 8.56), ('AMS', 'Amsterdam', 52.31, 4.76),
+    ('IST', 'Istanbul', 41.26, 28.74), ('JFK', 'New York', 40.64, -73.78), ('SFO', 'San Francisco', 37.62, -122.38),
+    ('YYZ', 'Toronto', 43.68, -79.63), ('CMB', 'Colombo', 7.18, 79.88), ('KTM', 'Kathmandu', 27.70, 85.36),
+]
+
+AIRLINES = [
+    ('AI', 'Air India'), ('6E', 'IndiGo'), ('UK', 'Vistara'), ('SG', 'SpiceJet'), ('QP', 'Akasa Air'),
+    ('EK', 'Emirates'), ('QR', 'Qatar Airways'), ('SQ', 'Singapore Airlines'), ('BA', 'British Airways'),
+    ('LH', 'Lufthansa'),
+]
+
+# (model, seats, longest route in km it flies)
+AIRCRAFT_MODELS = [
+    ('ATR 72-600', 72, 1500), ('Airbus A320neo', 180, 6000), ('Airbus A321neo', 222, 7000),
+    ('Boeing 737-800', 189, 5500), ('Boeing 787-9', 254, 15000), ('Airbus A350-900', 300, 15000),
+    ('Boeing 777-300ER', 350, 15000),
+]
+
+EMPLOYEE_ROLES = [
+    ('Pilot', 110_000, 180_000), ('Flight Attendant', 40_000, 70_000),
+    ('Maintenance Engineer', 60_000, 95_000), ('Ground Staff', 35_000, 55_000),
+]
+
+AMENITIES = [('Cafe', 'Coffee House'), ('Retail', 'Travel Store'), ('Lounge', 'Lounge'),
+             ('Restaurant', 'Kitchen'), ('Pharmacy', 'Pharmacy'), ('Forex', 'Currency Exchange')]
+
+FIRST_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Diya', 'Ananya', 'Ishaan', 'Saanvi', 'Kabir', 'Meera', 'Rohan',
+               'Priya', 'Arjun', 'Neha', 'Rahul', 'Sara', 'James', 'Olivia', 'Liam', 'Emma', 'Noah',
+               'Mia', 'Lucas', 'Zara', 'Omar', 'Fatima', 'Chen', 'Yuki', 'Hana', 'Mateo', 'Sofia']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Nair', 'Gupta', 'Khan', 'Das', 'Singh', 'Mehta',
+              'Rao', 'Joshi', 'Kapoor', 'Smith', 'Brown', 'Wilson', 'Garcia', 'Müller', 'Tanaka', 'Wang',
+              'Kim', 'Silva', 'Rossi', 'Haddad', 'Okafor', 'Cohen', 'Novak', 'Dubois', 'Lopez', 'Ali']
+
+CANCELLED_BOOKING_SHARE = 0.07
+
+INSERTS = {
+    'route': "INSERT INTO route (route_id, source_code, source_name, dest_code, dest_name, distance_km) "
+             "VALUES (%s, %s, %s, %s, %s, %s)",
+    'aircraft': "INSERT INTO aircraft (aircraft_id, registration_no, model, capacity, last_maintenance, status) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+    'employee': "INSERT INTO employee (emp_id, name, role, email, date_of_joining, salary) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+    'payroll': "INSERT INTO payroll (emp_id, base_salary, bonus, deductions, pay_date) VALUES (%s, %s, %s, %s, %s)",
+    'vendor': "INSERT INTO vendor (vendor_id, name, amenity_type, terminal, location_desc) VALUES (%s, %s, %s, %s, %s)",
+    'flight': "INSERT INTO flight (flight_id, flight_no, airline, route_id, aircraft_id, departure_time, "
+              "arrival_time, base_fare, current_fare, status, gate) "
+              "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+    'flight_inventory': "INSERT INTO flight_inventory (flight_id, capacity, seats_booked, seats_remaining) "
+                        "VALUES (%s, %s, %s, %s)",
+    'seat_map': "INSERT INTO seat_map (flight_id, layout, capacity, occupied) VALUES (%s, %s, %s, %s)",
+    'staff_assignment': "INSERT INTO staff_assignment (emp_id, flight_id, role_on_flight) VALUES (%s, %s, %s)",
+    'booking': "INSERT INTO booking (booking_id, passenger_id, flight_id, booking_date, seat_no, status, "
+               "booked_by, created_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+    'payment': "INSERT INTO payment (booking_id, amount, method, payment_date, refunded, refund_amount) "
+               "VALUES (%s, %s, %s, %s, %s, %s)",
+    'passenger': "INSERT INTO passenger (passenger_id, name, email, phone, passport_no, dob, total_points) "
+                 "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+    'passenger_summary_mv': "INSERT INTO passenger_summary_mv (passenger_id, total_bookings, total_spent) "
+                            "VALUES (%s, %s, %s)",
+}
+
+# Tables whose ids the generator assigns, with their primary key
+ID_COLUMNS = {
+    'route': 'route_id', 'aircraft': 'aircraft_id', 'employee': 'emp_id', 'vendor': 'vendor_id',
+    'flight': 'flight_id', 'passenger': 'passenger_id', 'booking': 'booking_id',
+}
+
+
+def connect():
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+    # Skip the per-row triggers (see migrations/0005_triggers.sql). Rows reference ids the generator assigns
+    # itself, so foreign keys are not checked row by row either.
+    cursor.execute("SET @bulk_import = 1")
+    cursor.execute("SET foreign_key_checks = 0")
+    cursor.close()
+    return conn
+
+
+class Loader:
+    """Writes row chunks for any table from a few connections in parallel."""
+
+    def __init__(self, workers, chunk_size):
+        self.chunk_size = chunk_size
+        self.queue = queue.Queue(maxsize=workers * 4)
+        self.buffers = {}
+        self.counts = {}
+        self.error = None
+        self.threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for t in self.threads:
+            t.start()
+
+    def _work(self):
+        conn = connect()
+        cursor = conn.cursor()
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    return
+                table, rows = item
+                if self.error is None:
+                    try:
+                        cursor.executemany(INSERTS[table], rows)
+                        conn.commit()
+                    except mysql.connector.Error as err:
+                        self.error = f"{table}: {err}"
+        finally:
+            cursor.close()
+            conn.close()
+
+    def add(self, table, row):
+        buffer = self.buffers.setdefault(table, [])
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self.flush(table)
+
+    def flush(self, table):
+        rows = self.buffers.pop(table, None)
+        if rows:
+            if self.error:
+                raise RuntimeError(self.error)
+            self.counts[table] = self.counts.get(table, 0) + len(rows)
+            self.queue.put((table, rows))
+
+    def close(self):
+        for table in list(self.buffers):
+            self.flush(table)
+        for _ in self.threads:
+            self.queue.put(None)
+        for t in self.threads:
+            t.join()
+        if self.error:
+            raise RuntimeError(self.error)
+
+
+def distance_km(a, b):
+    """Great-circle distance between two AIRPORTS entries."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[2], a[3], b[2], b[3]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return int(2 * 6371 * math.asin(math.sqrt(h)))
+
+
+def next_ids(conn):
+    cursor = conn.cursor()
+    ids = {}
+    for table, column in ID_COLUMNS.items():
+        cursor.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}")
+        ids[table] = cursor.fetchone()[0]
+    cursor.close()
+    return ids
+
+
+def generate(args, loader, start):
+    rng = random.Random(args.seed)
+    now = datetime.datetime.now().replace(microsecond=0)
+    ids = dict(start)
+    counts = {}
+
+    # ---- routes ----
+    pairs = [(a, b) for a in AIRPORTS for b in AIRPORTS if a is not b]
+    rng.shuffle(pairs)
+    routes = []
+    for a, b in pairs[:args.routes]:
+        route = (ids['route'], a[0], a[1], b[0], b[1], distance_km(a, b))
+        routes.append(route)
+        loader.add('route', route)
+        ids['route'] += 1
+
+    # ---- aircraft ----
+    fleet = []
+    for n in range(args.aircraft):
+        model, seats, max_range = AIRCRAFT_MODELS[n % len(AIRCRAFT_MODELS)]
+        status = 'Maintenance' if rng.random() < 0.05 else 'Operational'
+        loader.add('aircraft', (ids['aircraft'], f"VT-S{ids['aircraft']}", model, seats,
+                                now - datetime.timedelta(days=rng.randint(1, 180)), status))
+        fleet.append((ids['aircraft'], seats, max_range, seat_layout(model)))
+        ids['aircraft'] += 1
+
+    # ---- employees, payroll, vendors ----
+    crew = []
+    for n in range(args.employees):
+        role, low, high = EMPLOYEE_ROLES[n % len(EMPLOYEE_ROLES)]
+        salary = round(rng.uniform(low, high), -2)
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        joined = (now - datetime.timedelta(days=rng.randint(30, 3650))).date()
+        loader.add('employee', (ids['employee'], name, role, f"staff.{ids['employee']}@airline.example",
+                                joined, salary))
+        for month in range(1, 4):
+            loader.add('payroll', (ids['employee'], round(salary / 12, 2), round(rng.uniform(0, salary / 50), 2),
+                                   round(salary / 12 * 0.1, 2), now - datetime.timedelta(days=30 * month)))
+        if role in ('Pilot', 'Flight Attendant'):
+            crew.append((ids['employee'], 'Captain' if role == 'Pilot' else 'Cabin Crew'))
+        ids['employee'] += 1
+
+    for n in range(args.vendors):
+        kind, label = AMENITIES[n % len(AMENITIES)]
+        terminal = f"T{rng.randint(1, 3)}"
+        loader.add('vendor', (ids['vendor'], f"{rng.choice(LAST_NAMES)} {label}", kind, terminal,
+                              f"Near Gate {rng.choice('ABCDEF')}{rng.randint(1, 20)}"))
+        ids['vendor'] += 1
+
+    # ---- flights with their bookings, payments, inventory and seat maps ----
+    passenger_count = args.passengers
+    bookings_per_passenger = array.array('l', [0]) * passenger_count
+    spent_per_passenger = array.array('d', [0.0]) * passenger_count
+    points_per_passenger = array.array('l', [0]) * passenger_count
+    # Aircraft with the range for each route, the whole fleet where none has
+    fleet_for_route = {route[0]: [a for a in fleet if a[2] >= route[5]] or fleet for route in routes}
+    span = datetime.timedelta(days=args.days)
+    bookings_left = args.bookings
+    cancelled_bookings = 0
+
+    for n in range(args.flights):
+        flight_id = ids['flight']
+        route = routes[rng.randrange(len(routes))]
+        distance = route[5]
+        aircraft_id, capacity, max_range, layout = rng.choice(fleet_for_route[route[0]])
+        code, airline = rng.choice(AIRLINES)
+        departure = (now - span + datetime.timedelta(seconds=rng.randrange(int(span.total_seconds() * 2))))
+        departure = departure.replace(minute=departure.minute // 5 * 5, second=0)
+        arrival = departure + datetime.timedelta(minutes=int(distance / 800 * 60) + 30)
+        base_fare = round((1500 + distance * 4.5) * rng.uniform(0.8, 1.3), -1)
+        if departure < now:
+            status = 'Cancelled' if rng.random() < 0.02 else 'Completed'
+        else:
+            status = 'Cancelled' if rng.random() < 0.01 else 'Scheduled'
+
+        # Aim each flight at the average still needed to reach --bookings
+        target = bookings_left / (args.flights - n)
+        booked = max(0, min(capacity, round(rng.gauss(target, target * 0.3)))) if target > 0 else 0
+        bookings_left -= booked
+        seats = rng.sample(range(capacity), booked)
+        confirmed_seats = []
+        for seat in seats:
+            passenger_no = int(passenger_count * rng.random() ** 1.5)  # some passengers fly a lot more
+            passenger_id = start['passenger'] + passenger_no
+            cancelled = status == 'Cancelled' or rng.random() < CANCELLED_BOOKING_SHARE
+            booked_at = min(now, departure - datetime.timedelta(minutes=rng.randint(60, 60 * 24 * 60)))
+            loader.add('booking', (ids['booking'], passenger_id, flight_id, booked_at, seat_label(seat, layout),
+                                   'Cancelled' if cancelled else 'Confirmed', 'Passenger', booked_at))
+            loader.add('payment', (ids['booking'], base_fare, rng.choice(('Internal', 'Card', 'UPI')), booked_at,
+                                   cancelled, base_fare if cancelled else 0))
+            bookings_per_passenger[passenger_no] += 1
+            points_per_passenger[passenger_no] += int(base_fare // 100)
+            if cancelled:
+                cancelled_bookings += 1
+            else:
+                spent_per_passenger[passenger_no] += base_fare
+                confirmed_seats.append(seat)
+            ids['booking'] += 1
+
+        # Same fare steps as book_flight
+        load = len(confirmed_seats) / capacity
+        current_fare = round(base_fare * (1.25 if load > 0.80 else 1.10 if load > 0.50 else 1), 2)
+        loader.add('flight', (flight_id, f"{code}-S{flight_id}", airline, route[0], aircraft_id, departure, arrival,
+                              base_fare, current_fare, status, f"T{rng.randint(1, 3)}-{rng.choice('ABCDEF')}{rng.randint(1, 20)}"))
+        loader.add('flight_inventory', (flight_id, capacity, len(confirmed_seats),
+                                        capacity - len(confirmed_seats) if status == 'Scheduled' else 0))
+        loader.add('seat_map', (flight_id, layout, capacity, build_bitmap(confirmed_seats, capacity)))
+        if status == 'Scheduled' and crew:
+            for emp_id, role in rng.sample(crew, min(2, len(crew))):
+                loader.add('staff_assignment', (emp_id, flight_id, role))
+        ids['flight'] += 1
+
+        if args.progress and (n + 1) % max(1, args.flights // 10) == 0:
+            print(f"  {n + 1:,}/{args.flights:,} flights, {ids['booking'] - start['booking']:,} bookings generated")
+
+    # ---- passengers, with the totals of the bookings above ----
+    for n in range(passenger_count):
+        passenger_id = start['passenger'] + n
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        loader.add('passenger', (passenger_id, f"{first} {last}", f"{first}.{last}.{passenger_id}@example.net".lower(),
+                                 f"+91-{rng.randint(70000, 99999)}{rng.randint(10000, 99999)}", f"S{passenger_id:08d}",
+                                 datetime.date(rng.randint(1950, 2008), rng.randint(1, 12), rng.randint(1, 28)),
+                                 points_per_passenger[n]))
+        loader.add('passenger_summary_mv', (passenger_id, bookings_per_passenger[n], round(spent_per_passenger[n], 2)))
+    ids['passenger'] += passenger_count
+
+    counts['cancelled_bookings'] = cancelled_bookings
+    return ids, counts
+
+
+def finish(conn):
+    cursor = conn.cursor()
+    cursor.callproc('sp_refresh_dashboard_counters')
+    # Fresh index statistics so the load test sees the plans production would
+    cursor.execute("ANALYZE TABLE flight, booking, payment, passenger, flight_inventory, passenger_summary_mv")
+    cursor.fetchall()
+    conn.commit()
+    cursor.close()
+
+
+def write_manifest(path, manifest):
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+# What --clean deletes, children before their parents: (table, id column, manifest range)
+CLEAN_ORDER = (
+    ('payment', 'booking_id', 'booking'),
+    ('booking', 'booking_id', 'booking'),
+    ('flight_inventory', 'flight_id', 'flight'),
+    ('seat_map', 'flight_id', 'flight'),
+    ('staff_assignment', 'flight_id', 'flight'),
+    ('flight', 'flight_id', 'flight'),
+    ('passenger_summary_mv', 'passenger_id', 'passenger'),
+    ('passenger', 'passenger_id', 'passenger'),
+    ('payroll', 'emp_id', 'employee'),
+    ('staff_assignment', 'emp_id', 'employee'),
+    ('employee', 'emp_id', 'employee'),
+    ('aircraft', 'aircraft_id', 'aircraft'),
+    ('route', 'route_id', 'route'),
+    ('vendor', 'vendor_id', 'vendor'),
+)
+
+
+def clean(manifest_path, batch):
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    # A plain connection, not connect(): InnoDB doesn't cascade deletes while
+    # foreign_key_checks is off, so anything not listed in CLEAN_ORDER still goes by cascade
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+    for table, column, owner in CLEAN_ORDER:
+        first, last = manifest['ranges'].get(owner, (0, -1))
+        deleted = 0
+        for low in range(first, last + 1, batch):
+            cursor.execute(f"DELETE FROM {table} WHERE {column} BETWEEN %s AND %s", (low, min(low + batch - 1, last)))
+            deleted += cursor.rowcount
+            conn.commit()
+        print(f"  {table} (by {column}): {deleted:,} rows deleted")
+    finish(conn)
+    cursor.close()
+    conn.close()
+    os.remove(manifest_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--flights', type=int)
+    parser.add_argument('--passengers', type=int)
+    parser.add_argument('--bookings', type=int)
+    parser.add_argument('--routes', type=int, default=400, help=f"at most {len(AIRPORTS) * (len(AIRPORTS) - 1)}")
+    parser.add_argument('--aircraft', type=int, help='default: one per 50 flights, at least 20')
+    parser.add_argument('--employees', type=int, help='default: one per 20 flights, at least 40')
+    parser.add_argument('--vendors', type=int, default=200)
+    parser.add_argument('--days', type=int, default=90, help='flights depart within this many days of today')
+    parser.add_argument('--workers', type=int, default=4, help='parallel loader connections')
+    parser.add_argument('--chunk', type=int, default=5000, help='rows per INSERT')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST)
+    parser.add_argument('--clean', action='store_true', help='delete the rows listed in the manifest')
+    parser.add_argument('--quiet', dest='progress', action='store_false')
+    args = parser.parse_args()
+
+    if args.clean:
+        if not os.path.exists(args.manifest):
+            parser.error(f"no manifest at {args.manifest}, nothing to clean")
+        print(f"Deleting the synthetic rows listed in {args.manifest}...")
+        clean(args.manifest, batch=1000)
+        print("✅ Synthetic data removed.")
+        return
+    if os.path.exists(args.manifest):
+        parser.error(f"{args.manifest} exists: run --clean first, or pass another --manifest")
+
+    flights, passengers, bookings = SCALES[args.scale]
+    args.flights = args.flights or flights
+    args.passengers = args.passengers or passengers
+    args.bookings = args.bookings if args.bookings is not None else bookings
+    args.routes = max(1, min(args.routes, len(AIRPORTS) * (len(AIRPORTS) - 1)))
+    args.aircraft = args.aircraft or max(20, args.flights // 50)
+    args.employees = args.employees or max(40, args.flights // 20)
+
+    conn = connect()
+    start = next_ids(conn)
+    planned = {'route': args.routes, 'aircraft': args.aircraft, 'employee': args.employees, 'vendor': args.vendors,
+               'flight': args.flights, 'passenger': args.passengers, 'booking': args.bookings}
+    manifest = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'seed': args.seed,
+        'ranges': {table: (start[table], start[table] + planned[table] - 1) for table in ID_COLUMNS},
+        'rows': None,
+    }
+    # Written before loading so --clean also removes the rows of an interrupted run
+    write_manifest(args.manifest, manifest)
+    print(f"Generating {args.flights:,} flights, {args.passengers:,} passengers and ~{args.bookings:,} bookings "
+          f"with {args.workers} loader connections...")
+    started = time.perf_counter()
+    loader = Loader(args.workers, args.chunk)
+    try:
+        ids, counts = generate(args, loader, start)
+    finally:
+        loader.close()
+    finish(conn)
+    conn.close()
+    elapsed = time.perf_counter() - started
+
+    manifest['ranges'] = {table: (start[table], ids[table] - 1) for table in ID_COLUMNS}
+    manifest['rows'] = dict(loader.counts, **counts)
+    write_manifest(args.manifest, manifest)
+
+    total = sum(loader.counts.values())
+    for table, count in sorted(loader.counts.items()):
+        print(f"  {table:22} {count:>12,}")
+    print(f"✅ {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s). Manifest: {args.manifest}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Shared pieces of the HTTP load tests (bench_asgi.py, bench_routes.py).
+"""
+import http.client
+import statistics
+import urllib.parse
+
+
+class Client:
+    """One keep-alive HTTP connection with its own session cookie. Redirects are not followed."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        url = urllib.parse.urlsplit(base_url)
+        self.conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+        self.cookie = None
+
+    def request(self, method, path, form=None):
+        """Returns (status, Location header)."""
+        headers = {'Cookie': self.cookie} if self.cookie else {}
+        body = None
+        if form is not None:
+            body = urllib.parse.urlencode(form)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            # The server dropped the keep-alive connection: reconnect for the next request
+            self.conn.close()
+            raise
+        set_cookie = response.getheader('Set-Cookie')
+        if set_cookie:
+            self.cookie = set_cookie.split(';', 1)[0]
+        return response.status, response.getheader('Location') or ''
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def summarize(latencies, elapsed):
+    """Requests/sec and latency percentiles (ms) of a list of request durations in seconds."""
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p90_ms': round(percentile(latencies, 90) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'max_ms': round(max(latencies, default=0) * 1000, 1),
+    }
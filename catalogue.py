@@ -0,0 +1,192 @@
+"""
+Process-local cache of the slow-changing catalogue tables: route, aircraft and vendor.
+
+Each section is loaded with one query on first use and then served from dicts keyed by
+id / airport code / terminal. Write paths call invalidate() for the sections they touch,
+and every section also expires after max_age seconds so other worker processes pick up
+changes made elsewhere. Given the shared data versions (render_cache.py), a section is
+also reloaded, within VERSION_CHECK_SECONDS, once its table has changed in another process.
+"""
+import threading
+import time
+
+SECTIONS = ('routes', 'aircraft', 'vendors')
+
+# Table behind each section, as named in the data versions
+SECTION_TABLES = {'routes': 'route', 'aircraft': 'aircraft', 'vendors': 'vendor'}
+
+# Seconds between looks at a section's data version
+VERSION_CHECK_SECONDS = 1.0
+
+SECTION_SQL = {
+    'routes': "SELECT * FROM route ORDER BY route_id",
+    'aircraft': "SELECT * FROM aircraft ORDER BY aircraft_id",
+    'vendors': "SELECT * FROM vendor ORDER BY terminal, name",
+}
+
+
+class CatalogueCache:
+    """
+    :param query: the app's db_query helper (or anything with the same signature)
+    :param max_age: seconds before a loaded section is re-read from the database
+    :param versions: RenderCache.versions, or anything returning {table: time it last changed}
+    """
+
+    def __init__(self, query, max_age=300, versions=None):
+        self.query = query
+        self.max_age = max_age
+        self.versions = versions
+        self._lock = threading.Lock()
+        self._loaded_at = {}
+        self._loaded_time = {}  # wall-clock time, compared with the data versions
+        self._checked_at = {}
+        self._data = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- loading ----------
+
+    def _build_routes(self, routes):
+        airports = {}
+        for r in routes:
+            airports.setdefault(r['source_code'], r['source_name'])
+            airports.setdefault(r['dest_code'], r['dest_name'])
+        return {
+            'list': routes,
+            'by_id': {r['route_id']: r for r in routes},
+            'airports': airports,
+        }
+
+    def _build_aircraft(self, aircraft):
+        return {
+            'list': aircraft,
+            'by_id': {a['aircraft_id']: a for a in aircraft},
+        }
+
+    def _build_vendors(self, vendors):
+        by_terminal = {}
+        for v in vendors:
+            by_terminal.setdefault((v['terminal'] or '').upper(), []).append(v)
+        return {
+            'list': vendors,
+            'by_terminal': by_terminal,
+        }
+
+    def _fresh(self, name):
+        loaded_at = self._loaded_at.get(name)
+        if loaded_at is None or time.monotonic() - loaded_at >= self.max_age:
+            return False
+        if self._changed_elsewhere(name):
+            self._loaded_at.pop(name, None)
+            return False
+        return True
+
+    def _changed_elsewhere(self, name):
+        """True when the section's table changed after it was loaded (looked up at most every VERSION_CHECK_SECONDS)."""
+        if self.versions is None:
+            return False
+        now = time.monotonic()
+        if now - self._checked_at.get(name, 0.0) < VERSION_CHECK_SECONDS:
+            return False
+        self._checked_at[name] = now
+        table = SECTION_TABLES[name]
+        return self.versions(table)[table] > self._loaded_time[name]
+
+    def _store(self, name, rows):
+        data = getattr(self, f'_build_{name}')(rows)
+        self._data[name] = data
+        self._loaded_at[name] = time.monotonic()
+        self._loaded_time[name] = time.time()
+        return data
+
+    def _section(self, name):
+        if self._fresh(name):
+            self.hits += 1
+            return self._data[name]
+
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            if self._fresh(name):
+                self.hits += 1
+                return self._data[name]
+            self.misses += 1
+            rows = self.query(SECTION_SQL[name], fetchall=True)
+            if rows is None:
+                # Query failed (db_query already flashed the error); don't cache the failure
+                return self._data.get(name) or {}
+            return self._store(name, rows)
+
+    def pending(self, *sections):
+        """
+        {section: sql} for the given sections that would be loaded on their next lookup,
+        so a caller can fetch them alongside its own queries and hand the rows to fill().
+        """
+        return {name: SECTION_SQL[name] for name in sections if not self._fresh(name)}
+
+    def fill(self, name, rows):
+        """Caches rows fetched for a section listed by pending(). None (a failed query) is ignored."""
+        if rows is None:
+            return
+        with self._lock:
+            self.misses += 1
+            self._store(name, rows)
+
+    def invalidate(self, *sections):
+        """Drops the given sections (all of them if none are given) so the next lookup reloads."""
+        with self._lock:
+            for name in sections or SECTIONS:
+                self._loaded_at.pop(name, None)
+
+    # ---------- lookups ----------
+    # Returned rows are shared between requests and must not be modified.
+
+    def routes(self):
+        return self._section('routes').get('list', [])
+
+    def route(self, route_id):
+        return self._section('routes').get('by_id', {}).get(int(route_id))
+
+    def airports(self):
+        """Returns {airport code: city name}, derived from route source/dest columns."""
+        return self._section('routes').get('airports', {})
+
+    def airport(self, code):
+        return self.airports().get(code)
+
+    def aircraft(self, status=None):
+        aircraft = self._section('aircraft').get('list', [])
+        if status is None:
+            return aircraft
+        return [a for a in aircraft if a['status'] == status]
+
+    def aircraft_by_id(self, aircraft_id):
+        return self._section('aircraft').get('by_id', {}).get(int(aircraft_id))
+
+    def vendors(self, terminal=None):
+        """Returns all vendors ordered by terminal and name, or those in one terminal ordered by name."""
+        section = self._section('vendors')
+        if terminal is None:
+            return section.get('list', [])
+        return section.get('by_terminal', {}).get(terminal.upper(), [])
+
+    def search_vendors(self, terminal):
+        """Vendors whose terminal contains the given text, ordered by name."""
+        needle = terminal.upper()
+        matches = [v for v in self.vendors() if needle in (v['terminal'] or '').upper()]
+        return sorted(matches, key=lambda v: v['name'] or '')
+
+    def route_ids_matching(self, term, code_col, name_col):
+        """Route ids whose airport code equals, or city name starts with, the term (case-insensitive)."""
+        needle = term.lower()
+        return {r['route_id'] for r in self.routes()
+                if (r[code_col] or '').lower() == needle or (r[name_col] or '').lower().startswith(needle)}
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'loaded_sections': sorted(self._loaded_at),
+            'max_age': self.max_age,
+        }
@@ -0,0 +1,128 @@
+"""
+Admin dashboard statistics.
+
+The four headline numbers are computed in a single round trip and cached for a short TTL
+in a cache shared by every worker process. With use_counters=True they are read from the
+dashboard_counter table instead, so the cost no longer depends on table size. The table is
+recomputed off the write path by the worker's 'dashboard_counters' job (CounterRefresh,
+every STATS_COUNTERS_INTERVAL seconds) or 'flask refresh-stats', so the counters lag the
+tables by up to that interval.
+"""
+import time
+
+CACHE_KEY = 'admin_dashboard_stats'
+
+STATS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM passenger) AS passengers,
+        (SELECT COUNT(*) FROM employee) AS employees,
+        (SELECT COUNT(*) FROM flight WHERE status = 'Scheduled') AS flights,
+        (SELECT COUNT(*) FROM booking WHERE status = 'Confirmed') AS bookings
+"""
+
+# The same four numbers as separate statements, for the ASGI app to run concurrently
+STAT_QUERIES = {
+    'passengers': "SELECT COUNT(*) AS n FROM passenger",
+    'employees': "SELECT COUNT(*) AS n FROM employee",
+    'flights': "SELECT COUNT(*) AS n FROM flight WHERE status = 'Scheduled'",
+    'bookings': "SELECT COUNT(*) AS n FROM booking WHERE status = 'Confirmed'",
+}
+
+COUNTERS_SQL = "SELECT name, value FROM dashboard_counter"
+
+EMPTY_STATS = {'passengers': 0, 'employees': 0, 'flights': 0, 'bookings': 0}
+
+
+class DashboardStats:
+    """
+    :param query: the app's db_query helper (or anything with the same signature)
+    :param cache: a cachelib cache shared across workers
+    :param ttl: seconds the computed stats stay cached
+    :param use_counters: read the dashboard_counter table (see CounterRefresh) instead of counting
+    """
+
+    def __init__(self, query, cache, ttl=30, use_counters=False):
+        self.query = query
+        self.cache = cache
+        self.ttl = ttl
+        self.use_counters = use_counters
+
+    def compute(self):
+        """Reads the stats from the database, bypassing the cache. Returns None on a DB error."""
+        if self.use_counters:
+            rows = self.query(COUNTERS_SQL, fetchall=True)
+            if rows is None:
+                return None
+            stats = dict(EMPTY_STATS)
+            stats.update({row['name']: int(row['value']) for row in rows if row['name'] in stats})
+            return stats
+
+        row = self.query(STATS_SQL, fetchone=True)
+        if row is None:
+            return None
+        return {name: int(row[name] or 0) for name in EMPTY_STATS}
+
+    def get(self):
+        stats = self.cache.get(CACHE_KEY)
+        if stats is None:
+            stats = self.compute()
+            if stats is None:
+                return dict(EMPTY_STATS)
+            self.cache.set(CACHE_KEY, stats, timeout=self.ttl)
+        return stats
+
+    async def get_async(self, db):
+        """
+        get() for the ASGI app. On a cache miss the four counts run concurrently on db,
+        an async_db.AsyncDatabase. Raises the driver's error if the database fails.
+        """
+        stats = self.cache.get(CACHE_KEY)
+        if stats is not None:
+            return stats
+        if self.use_counters:
+            rows = await db.query(COUNTERS_SQL, fetchall=True)
+            stats = dict(EMPTY_STATS)
+            stats.update({row['name']: int(row['value']) for row in rows if row['name'] in stats})
+        else:
+            rows = await db.gather(**{name: (sql, (), 'one') for name, sql in STAT_QUERIES.items()})
+            stats = {name: int(row['n'] or 0) for name, row in rows.items()}
+        self.cache.set(CACHE_KEY, stats, timeout=self.ttl)
+        return stats
+
+    def invalidate(self):
+        self.cache.delete(CACHE_KEY)
+
+
+class CounterRefresh:
+    """
+    The worker's 'dashboard_counters' job: recomputes dashboard_counter with
+    sp_refresh_dashboard_counters.
+
+    :param pool: a ConnectionPool
+    :param on_change: called with no arguments after a refresh (cache invalidation)
+    """
+
+    def __init__(self, pool, on_change=None):
+        self.pool = pool
+        self.on_change = on_change
+
+    def __call__(self):
+        return self.run()
+
+    def run(self):
+        """Recomputes the counters. Returns the run stats (the new counters)."""
+        started = time.perf_counter()
+        conn = self.pool.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.callproc('sp_refresh_dashboard_counters')
+            conn.commit()
+            cursor.execute(COUNTERS_SQL)
+            stats = {name: int(value) for name, value in cursor.fetchall()}
+        finally:
+            cursor.close()
+            conn.close()
+        if self.on_change:
+            self.on_change()
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        return stats
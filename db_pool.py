@@ -0,0 +1,258 @@
+"""
+Self-healing MySQL connection pool.
+
+A drop-in for mysql.connector's MySQLConnectionPool (same get_connection() / close()
+usage) that adds what the stock pool lacks:
+
+  * overflow: up to max_overflow extra connections under bursts, closed again once the
+    burst is over
+  * a bounded wait: when every connection is busy, callers queue for up to `timeout`
+    seconds instead of failing straight away
+  * ping-on-borrow: a connection idle for more than ping_after seconds is pinged before
+    it is handed out, and replaced if the server dropped it
+  * max lifetime: connections older than max_lifetime seconds are recycled
+  * stats() for the /metrics gauges and the admin cache page
+
+Connections are handed out most-recently-used first, so the idle ones at the bottom of
+the stack are the ones that age out.
+"""
+import collections
+import threading
+import time
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+
+_NOTHING = object()
+
+
+class _Waiter:
+    __slots__ = ('event', 'slot')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.slot = None
+
+
+class PooledConnection:
+    """Proxy around a raw connection. close() hands it back to the pool."""
+
+    def __init__(self, pool, cnx, created):
+        self._pool = pool
+        self._cnx = cnx
+        self.created = created
+
+    def __getattr__(self, name):
+        cnx = self.__dict__.get('_cnx')
+        if cnx is None:
+            raise AttributeError(f"connection already returned to the pool ({name})")
+        return getattr(cnx, name)
+
+    def close(self):
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            self._pool._release(cnx, self.created)
+
+
+class ConnectionPool:
+    """
+    :param pool_name: name used in error messages
+    :param pool_size: connections kept open
+    :param max_overflow: extra connections allowed while all pool_size are busy
+    :param timeout: seconds get_connection() waits for a free connection before raising PoolError
+    :param max_lifetime: seconds after which a connection is closed and replaced (0 = never)
+    :param ping_after: ping connections idle for longer than this many seconds before reuse
+    :param reset_session: reset session state (variables, temp tables) when a connection is returned
+    :param user_variables: {name: value} user variables set on every connection, again after each reset
+    :param prefill: open pool_size connections up front, so a bad config fails at startup
+    :param connect: connection factory, mysql.connector.connect by default
+    :param config: connection arguments (db_config.config)
+    """
+
+    def __init__(self, pool_name='airline_pool', pool_size=10, max_overflow=10, timeout=5.0,
+                 max_lifetime=1800, ping_after=5.0, reset_session=True, user_variables=None,
+                 prefill=True, connect=mysql.connector.connect, **config):
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self.reset_session = reset_session
+        self.user_variables = user_variables or None
+        self._connect = connect
+        self._config = config
+
+        self._idle = []  # [(raw connection, created, last used)], most recently used last
+        self._open = 0
+        self._waiters = collections.deque()  # callers queued for a connection, oldest first
+        self._lock = threading.Lock()
+        self._counters = {
+            'checkouts': 0, 'waits': 0, 'timeouts': 0, 'created': 0,
+            'recycled': 0, 'broken': 0, 'overflow_closed': 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        if prefill:
+            now = time.monotonic()
+            for _ in range(pool_size):
+                self._idle.append((self._new_raw(), now, now))
+                self._open += 1
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _new_raw(self):
+        cnx = self._connect(**self._config)
+        if self.user_variables:
+            try:
+                cursor = cnx.cursor()
+                for name, value in self.user_variables.items():
+                    cursor.execute(f"SET @`{name}` = %s", (value,))
+                cursor.close()
+            except mysql.connector.Error:
+                self._discard(cnx)
+                raise
+        self._count('created')
+        return cnx
+
+    @staticmethod
+    def _discard(cnx):
+        try:
+            cnx.close()
+        except mysql.connector.Error:
+            pass
+
+    def _healthy(self, cnx, created, last_used, now):
+        if self.max_lifetime and now - created > self.max_lifetime:
+            self._count('recycled')
+            return False
+        if now - last_used >= self.ping_after:
+            try:
+                cnx.ping(reconnect=False)
+            except mysql.connector.Error:
+                self._count('broken')
+                return False
+        return True
+
+    def get_connection(self, timeout=None):
+        """
+        Borrows a connection, waiting up to `timeout` (default: the pool's) for one to free up.
+        Waiters are served first come, first served. Raises PoolError if none frees up in time;
+        with timeout=0 at once, without counting a wait or a timeout.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+
+        with self._lock:
+            if self._idle and not self._waiters:
+                slot = self._idle.pop()
+            elif self._open < self.pool_size + self.max_overflow:
+                self._open += 1  # reserve the slot, connect outside the lock
+                slot = None
+            elif timeout <= 0:
+                raise PoolError(f"Pool '{self.pool_name}' exhausted: no free connection")
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                self._counters['waits'] += 1
+                slot = _NOTHING
+        if slot is _NOTHING:
+            slot = self._wait_for_handoff(waiter, timeout)
+
+        waited_for = time.monotonic() - started
+        with self._lock:
+            self._counters['checkouts'] += 1
+            self._wait_total += waited_for
+            self._wait_max = max(self._wait_max, waited_for)
+
+        # Network round trips (ping / connect) happen outside the lock
+        now = time.monotonic()
+        cnx = created = None
+        if slot is not None:
+            cnx, created, last_used = slot
+            if not self._healthy(cnx, created, last_used, now):
+                self._discard(cnx)
+                cnx = None
+        if cnx is None:
+            try:
+                cnx = self._new_raw()
+            except Exception:
+                self._give_back(None)
+                raise
+            created = now
+        return PooledConnection(self, cnx, created)
+
+    def _wait_for_handoff(self, waiter, timeout):
+        """Blocks until a returning connection (or a free slot, None) is handed to this waiter."""
+        if waiter.event.wait(timeout):
+            return waiter.slot
+        with self._lock:
+            if waiter.event.is_set():  # handed over just as the wait timed out
+                return waiter.slot
+            self._waiters.remove(waiter)
+            self._counters['timeouts'] += 1
+        raise PoolError(f"Pool '{self.pool_name}' exhausted: no connection freed up within {timeout}s")
+
+    def _give_back(self, slot):
+        """
+        Hands a returned connection (or, with None, its freed slot) to the longest waiting
+        caller, or parks it in the idle stack. Overflow connections are closed when nobody waits.
+        """
+        discard = None
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.slot = slot
+                waiter.event.set()
+                return
+            if slot is not None and len(self._idle) < self.pool_size:
+                self._idle.append(slot)
+                return
+            if slot is not None:
+                # Overflow connection, not needed once the burst is over
+                self._counters['overflow_closed'] += 1
+                discard = slot[0]
+            self._open -= 1
+        if discard is not None:
+            self._discard(discard)
+
+    def _release(self, cnx, created):
+        if self.reset_session:
+            try:
+                if cnx.in_transaction:
+                    cnx.rollback()
+                cnx.reset_session(user_variables=self.user_variables)
+            except mysql.connector.Error:
+                self._count('broken')
+                self._discard(cnx)
+                self._give_back(None)
+                return
+        self._give_back((cnx, created, time.monotonic()))
+
+    def close_all(self):
+        """Closes every idle connection (borrowed ones are closed when they come back)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for cnx, _, _ in idle:
+            self._discard(cnx)
+
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle)
+            stats = {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'open': self._open,
+                'idle': idle,
+                'in_use': self._open - idle,
+                'waiting': len(self._waiters),
+                'wait_seconds_total': round(self._wait_total, 4),
+                'wait_seconds_max': round(self._wait_max, 4),
+            }
+            stats.update(self._counters)
+        return stats
@@ -0,0 +1,140 @@
+"""
+Read/write splitting between the primary and its replicas.
+
+db_query asks the router where each statement should go:
+
+  * plain reads (SELECT / SHOW / EXPLAIN / WITH, without FOR UPDATE or LOCK IN SHARE MODE)
+    go to a replica, picked round-robin or by fewest connections in use
+  * everything else (INSERT / UPDATE / DELETE, CALLs to the stored procedures, locking
+    reads) goes to the primary
+
+Read-your-writes: once a request writes, the rest of that request reads from the primary,
+and the user's session stays on the primary for STICKY_SECONDS afterwards, so the page
+shown after a booking or cancellation never lags behind it.
+
+A replica that can't be connected to is skipped for RETRY_SECONDS and its reads fall
+back to the primary. A replica whose pool is only exhausted (PoolError) stays in the
+rotation: that read tries the next replica, then the primary. With no replicas
+configured every statement goes to the primary, exactly as before.
+"""
+import itertools
+import re
+import threading
+import time
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+_READ_START = re.compile(r'^\s*(?:\(\s*)*(SELECT|SHOW|EXPLAIN|DESCRIBE|WITH)\b', re.IGNORECASE)
+_LOCKING_READ = re.compile(r'\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b', re.IGNORECASE)
+
+STRATEGIES = ('round_robin', 'least_loaded')
+
+
+def is_read(sql):
+    """True for statements that can safely run on a replica."""
+    return bool(_READ_START.match(sql)) and not _LOCKING_READ.search(sql)
+
+
+def parse_replicas(spec):
+    """Parses 'host[:port],host[:port]' into [(host, port)], port defaulting to 3306."""
+    replicas = []
+    for item in (spec or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(':')
+        replicas.append((host, int(port) if port else 3306))
+    return replicas
+
+
+class DatabaseRouter:
+    """
+    :param primary: pool of the primary server
+    :param replicas: {name: pool} of the read replicas
+    :param strategy: 'round_robin' or 'least_loaded' (fewest connections in use)
+    :param sticky_seconds: how long a session keeps reading from the primary after a write
+    :param retry_seconds: how long a failing replica is skipped
+    """
+
+    def __init__(self, primary, replicas=None, strategy='round_robin', sticky_seconds=5, retry_seconds=30):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown replica strategy '{strategy}', expected one of {STRATEGIES}")
+        self.primary = primary
+        self.replicas = dict(replicas or {})
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._turn = itertools.count()
+        self._down_until = {}  # replica name -> monotonic time it may be retried
+        self._lock = threading.Lock()  # only guards _down_until, which changes on failures
+
+    def pools(self):
+        """{name: pool} of every endpoint, primary first."""
+        return {'primary': self.primary, **self.replicas}
+
+    def _healthy_replicas(self):
+        now = time.monotonic()
+        return [name for name in self.replicas if self._down_until.get(name, 0) <= now]
+
+    def pick_replica(self):
+        """Name of the replica the next read should use, or None to read from the primary."""
+        names = self._healthy_replicas()
+        if not names:
+            return None
+        if self.strategy == 'least_loaded':
+            return min(names, key=lambda name: self.replicas[name].stats()['in_use'])
+        return names[next(self._turn) % len(names)]
+
+    def mark_down(self, name):
+        with self._lock:
+            self._down_until[name] = time.monotonic() + self.retry_seconds
+
+    def read_connection(self, timeout=None):
+        """
+        Borrows a connection for reads: (endpoint name, connection).
+        Falls back to the primary when no replica can hand one out.
+        :param timeout: seconds each pool may wait for a free connection (default: the pool's)
+        """
+        tried = set()
+        while True:
+            name = self.pick_replica()
+            if name in tried:
+                name = next((other for other in self._healthy_replicas() if other not in tried), None)
+            if name is None:
+                return 'primary', self.primary.get_connection(timeout)
+            tried.add(name)
+            try:
+                return name, self.replicas[name].get_connection(timeout)
+            except PoolError:
+                # Busy, not broken: keep it in the rotation and try another endpoint
+                continue
+            except mysql.connector.Error as err:
+                print(f"❌ Replica {name} unavailable, reading from the primary: {err}")
+                self.mark_down(name)
+
+    def read_pool(self):
+        """A pool for long reads that manage their own connection, such as streaming exports."""
+        name = self.pick_replica()
+        return self.replicas[name] if name else self.primary
+
+    # ---- read-your-writes ----
+
+    def stick(self, session):
+        """Keeps the session on the primary for sticky_seconds after a write."""
+        if self.replicas and self.sticky_seconds:
+            session['_primary_until'] = time.time() + self.sticky_seconds
+
+    def is_sticky(self, session):
+        return session.get('_primary_until', 0) > time.time()
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            'strategy': self.strategy,
+            'sticky_seconds': self.sticky_seconds,
+            'endpoints': {
+                name: dict(pool.stats(), down=self._down_until.get(name, 0) > now)
+                for name, pool in self.pools().items()
+            },
+        }
@@ -0,0 +1,119 @@
+"""
+Flight search shared by the passenger search routes.
+
+Turns the From / To / Date inputs into index-friendly SQL:
+  * a date becomes a half-open departure_time range instead of DATE(departure_time) = ...
+  * a city name or airport code is resolved to route_ids with exact/prefix lookups on
+    the indexed route columns, instead of LIKE '%x%' over every upcoming flight.
+"""
+import datetime
+
+# (code column, name column) on the route table for each side of a search
+ROUTE_COLUMNS = {
+    'source': ('source_code', 'source_name'),
+    'dest': ('dest_code', 'dest_name'),
+}
+
+
+def day_range(date_str):
+    """Returns the [start, end) datetimes covering one calendar day, or None for a bad date."""
+    try:
+        day = datetime.datetime.strptime(date_str, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+    return day, day + datetime.timedelta(days=1)
+
+
+def like_prefix(term):
+    """Escapes LIKE wildcards so user input is only ever used as a prefix match."""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'{escaped}%'
+
+
+class FlightSearch:
+    """
+    Builds and runs passenger flight searches.
+    :param query: the app's db_query helper (or anything with the same signature)
+    :param catalogue: optional CatalogueCache used to resolve routes without a query
+    """
+
+    def __init__(self, query, catalogue=None):
+        self.query = query
+        self.catalogue = catalogue
+
+    @staticmethod
+    def route_lookup(term, side):
+        """Returns (sql, params) matching routes by exact airport code or city-name prefix."""
+        code_col, name_col = ROUTE_COLUMNS[side]
+        sql = (f"SELECT route_id FROM route WHERE {code_col} = %s "
+               f"UNION SELECT route_id FROM route WHERE {name_col} LIKE %s")
+        return sql, (term, like_prefix(term))
+
+    def resolve_route_ids(self, term, side):
+        """Returns the set of route_ids whose airport code or city name matches the search term."""
+        if self.catalogue is not None:
+            return self.catalogue.route_ids_matching(term, *ROUTE_COLUMNS[side])
+        sql, params = self.route_lookup(term, side)
+        rows = self.query(sql, params, fetchall=True) or []
+        return {row['route_id'] for row in rows}
+
+    def build_query(self, source='', dest='', date=''):
+        """
+        Builds the search SQL.
+        :return: (sql, params), or None when the filters cannot match any flight
+        """
+        sql = "SELECT * FROM upcoming_flights WHERE status = 'Scheduled'"
+        params = []
+
+        route_ids = None
+        for side, term in (('source', source), ('dest', dest)):
+            if term:
+                matches = self.resolve_route_ids(term.strip(), side)
+                route_ids = matches if route_ids is None else route_ids & matches
+        if route_ids is not None:
+            if not route_ids:
+                return None
+            ids = sorted(route_ids)
+            sql += f" AND route_id IN ({', '.join(['%s'] * len(ids))})"
+            params.extend(ids)
+
+        if date:
+            bounds = day_range(date)
+            if bounds is None:
+                return None
+            sql += " AND departure_time >= %s AND departure_time < %s"
+            params.extend(bounds)
+
+        sql += " ORDER BY departure_time"
+        return sql, tuple(params)
+
+    def search(self, source='', dest='', date=''):
+        """Returns the scheduled upcoming flights matching the filters."""
+        built = self.build_query(source, dest, date)
+        if built is None:
+            return []
+        sql, params = built
+        return self.query(sql, params, fetchall=True) or []
+
+    def explain(self, source='', dest='', date=''):
+        """
+        Returns the EXPLAIN plan rows of the SQL a search sends: the search query, plus the
+        route lookups when there is no catalogue to resolve routes from.
+        """
+        statements = []
+        if self.catalogue is None:
+            statements.extend(self.route_lookup(term.strip(), side)
+                              for side, term in (('source', source), ('dest', dest)) if term)
+        built = self.build_query(source, dest, date)
+        if built is not None:
+            statements.append(built)
+        plan = []
+        for sql, params in statements:
+            plan.extend(self.query(f"EXPLAIN {sql}", params, fetchall=True) or [])
+        return plan
+
+
+def full_scans(plan):
+    """Returns the tables an EXPLAIN plan reads with a full table scan (derived/union temp tables excluded)."""
+    return [row['table'] for row in plan
+            if row.get('type') == 'ALL' and not str(row.get('table', '')).startswith('<')]
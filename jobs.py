@@ -0,0 +1,261 @@
+"""
+Background jobs: a queue in the job_run table and the worker that runs it.
+
+    queue = JobQueue(pool)
+    queue.enqueue('flight_status', requested_by='admin@example.com')   # from a request
+
+    worker = Worker(queue, {'flight_status': FlightStatusJob(pool)},
+                    schedule={'flight_status': 60}, poll_interval=1.0)
+    worker.run_forever()                                                # flask --app app worker
+
+Requests only insert a 'Queued' row, so they never wait for the job. Workers claim rows
+with SELECT ... FOR UPDATE SKIP LOCKED, so several worker processes can share the queue
+and each job runs once. Every run keeps its timing and stats in its job_run row.
+
+A worker also enqueues each scheduled job every `schedule[name]` seconds. A job that is
+already queued isn't queued a second time.
+"""
+import datetime
+import json
+import time
+
+import mysql.connector
+
+
+class JobQueue:
+    """
+    :param pool: a ConnectionPool; every call borrows its own connection
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def _run(self, fn):
+        conn = self.pool.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            return fn(conn, cursor)
+        except mysql.connector.Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    def enqueue(self, name, requested_by=None):
+        """Queues a run of the job, unless one is already waiting. Returns the job_id."""
+        def enqueue(conn, cursor):
+            cursor.execute("SELECT job_id FROM job_run WHERE name = %s AND status = 'Queued' LIMIT 1", (name,))
+            queued = cursor.fetchone()
+            if queued:
+                return queued['job_id']
+            cursor.execute("INSERT INTO job_run (name, requested_by) VALUES (%s, %s)", (name, requested_by))
+            conn.commit()
+            return cursor.lastrowid
+        return self._run(enqueue)
+
+    def claim(self, job_id=None):
+        """
+        Marks the oldest queued job as Running and returns it, or None when the queue is empty.
+        :param job_id: claim this job only (None if it is no longer queued)
+        """
+        where, params = "status = 'Queued'", ()
+        if job_id is not None:
+            where, params = where + " AND job_id = %s", (job_id,)
+
+        def claim(conn, cursor):
+            conn.start_transaction()
+            cursor.execute(f"""
+                SELECT job_id, name FROM job_run
+                WHERE {where}
+                ORDER BY job_id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            """, params)
+            job = cursor.fetchone()
+            if job:
+                cursor.execute("UPDATE job_run SET status = 'Running', started_at = NOW() WHERE job_id = %s",
+                               (job['job_id'],))
+            conn.commit()
+            return job
+        return self._run(claim)
+
+    def finish(self, job_id, stats=None, error=None):
+        def finish(conn, cursor):
+            cursor.execute("""
+                UPDATE job_run
+                SET status = %s, finished_at = NOW(), stats = %s, error = %s
+                WHERE job_id = %s
+            """, ('Failed' if error else 'Done', json.dumps(stats, default=str) if stats else None,
+                  error, job_id))
+            conn.commit()
+        self._run(finish)
+
+    def last_stats(self, name):
+        """Stats of the job's last successful run, or None."""
+        def last(conn, cursor):
+            cursor.execute("""
+                SELECT stats FROM job_run
+                WHERE name = %s AND status = 'Done'
+                ORDER BY job_id DESC
+                LIMIT 1
+            """, (name,))
+            row = cursor.fetchone()
+            return json.loads(row['stats']) if row and row['stats'] else None
+        return self._run(last)
+
+    def recent(self, limit=20):
+        """The latest runs of every job with their stats, newest first, plus the queue depth."""
+        def recent(conn, cursor):
+            cursor.execute("""
+                SELECT job_id, name, status, requested_by, enqueued_at, started_at, finished_at, stats, error
+                FROM job_run
+                ORDER BY job_id DESC
+                LIMIT %s
+            """, (limit,))
+            runs = cursor.fetchall()
+            for run in runs:
+                run['stats'] = json.loads(run['stats']) if run['stats'] else None
+            cursor.execute("SELECT COUNT(*) AS queued FROM job_run WHERE status = 'Queued'")
+            return {'queued': cursor.fetchone()['queued'], 'runs': runs}
+        return self._run(recent)
+
+
+class FlightStatusJob:
+    """
+    Moves flights out of 'Scheduled' once their time has passed, with the rules of
+    sp_update_flight_statuses: past arrival -> 'Completed', then past departure ->
+    'Cancelled'. Their seat inventory is closed in the same transaction.
+
+    Each run takes a cutoff (now) and walks the (status, arrival_time) and (status,
+    departure_time) indexes from the 'Scheduled' flights up to the cutoff. Flights that
+    were moved have left that range, so a run only reads the flights that came due
+    since the last one (and any that were added late with a time already past). It
+    updates them batch_size at a time, by primary key, so row locks are held briefly.
+
+    :param pool: a ConnectionPool
+    :param batch_size: flights updated per transaction
+    :param on_change: called with no arguments when a run changed any flight (cache invalidation)
+    :param queue: the JobQueue, to report the previous run's cutoff in the stats
+    """
+
+    TRANSITIONS = (
+        ('Completed', 'arrival_time'),
+        ('Cancelled', 'departure_time'),
+    )
+
+    def __init__(self, pool, batch_size=500, on_change=None, queue=None):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.on_change = on_change
+        self.queue = queue
+
+    def __call__(self):
+        return self.run()
+
+    def run(self, cutoff=None):
+        """Applies every transition due by the cutoff (default: now). Returns the run stats."""
+        started = time.perf_counter()
+        cutoff = cutoff or datetime.datetime.now().replace(microsecond=0)
+        previous = self.queue.last_stats('flight_status') if self.queue else None
+        stats = {'cutoff': cutoff, 'previous_cutoff': previous and previous.get('cutoff'), 'batches': 0}
+
+        conn = self.pool.get_connection()
+        cursor = conn.cursor()
+        try:
+            for status, column in self.TRANSITIONS:
+                stats[status.lower()] = self._apply(conn, cursor, status, column, cutoff, stats)
+        finally:
+            cursor.close()
+            conn.close()
+
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        if self.on_change and (stats['completed'] or stats['cancelled']):
+            self.on_change()
+        return stats
+
+    def _apply(self, conn, cursor, status, column, cutoff, stats):
+        moved = 0
+        while True:
+            conn.start_transaction()
+            try:
+                cursor.execute(f"""
+                    SELECT flight_id FROM flight
+                    WHERE status = 'Scheduled' AND {column} < %s
+                    ORDER BY {column}
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                """, (cutoff, self.batch_size))
+                ids = [row[0] for row in cursor.fetchall()]
+                if ids:
+                    marks = ', '.join(['%s'] * len(ids))
+                    cursor.execute(f"UPDATE flight SET status = %s WHERE flight_id IN ({marks})", (status, *ids))
+                    moved += cursor.rowcount
+                    # As reconcile-inventory would: only 'Scheduled' flights have seats to sell
+                    cursor.execute(f"UPDATE flight_inventory SET seats_remaining = 0 WHERE flight_id IN ({marks})",
+                                   ids)
+                conn.commit()
+            except mysql.connector.Error:
+                conn.rollback()
+                raise
+            if ids:
+                stats['batches'] += 1
+            if len(ids) < self.batch_size:
+                return moved
+
+
+class Worker:
+    """
+    Runs queued jobs, and enqueues the scheduled ones when they are due.
+
+    :param queue: a JobQueue
+    :param jobs: {name: callable returning a stats dict}
+    :param schedule: {name: seconds between runs}
+    :param poll_interval: seconds between looks at the queue when it is empty
+    """
+
+    def __init__(self, queue, jobs, schedule=None, poll_interval=1.0):
+        self.queue = queue
+        self.jobs = jobs
+        self.schedule = schedule or {}
+        self.poll_interval = poll_interval
+        self._next_due = {name: 0.0 for name in self.schedule}
+
+    def enqueue_due(self, now=None):
+        now = now if now is not None else time.monotonic()
+        for name, interval in self.schedule.items():
+            if now >= self._next_due[name]:
+                self.queue.enqueue(name, requested_by='scheduler')
+                self._next_due[name] = now + interval
+
+    def run_once(self, job_id=None):
+        """
+        Claims and runs one job (the given one, if any). Returns its job_run row (with stats),
+        or None if nothing was queued.
+        """
+        job = self.queue.claim(job_id)
+        if job is None:
+            return None
+        try:
+            job['stats'] = self.jobs[job['name']]()
+            self.queue.finish(job['job_id'], job['stats'])
+        except Exception as err:  # a failed job mustn't stop the worker
+            job['error'] = f"{type(err).__name__}: {err}"
+            self.queue.finish(job['job_id'], error=job['error'])
+        return job
+
+    def run_forever(self):
+        while True:
+            try:
+                self.enqueue_due()
+                job = self.run_once()
+            except mysql.connector.Error as err:
+                print(f"❌ Job worker database error: {err}")
+                job = None
+            if job is not None:
+                if job.get('error'):
+                    print(f"❌ Job {job['job_id']} ({job['name']}) failed: {job['error']}")
+                else:
+                    print(f"✅ Job {job['job_id']} ({job['name']}): {job['stats']}")
+            else:
+                time.sleep(self.poll_interval)
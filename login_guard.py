@@ -0,0 +1,289 @@
+"""
+Cheap refusals for the login routes, decided before a pooled connection is taken.
+
+RateLimiter is a token bucket per key (client IP, or role + account). A key starts with
+`burst` tokens and earns `rate` tokens a second. Every attempt spends one, and without a
+token the attempt is refused with the seconds until the next one. Buckets live in the
+process's memory, so each worker process allows its own `burst`. The least recently used
+buckets are dropped beyond `max_keys` (a dropped bucket comes back full).
+
+KnownLogins is a Bloom filter of every passport number and employee email. A login for
+a value the filter has never seen is refused without a query. The filter can answer
+"maybe" for a value that doesn't exist (about ERROR_RATE of them); those go on to the
+database as before, but it never refuses a value it was built with.
+
+    known_logins.rebuild()                             # the worker's 'login_filter' job
+    known_logins.might_exist('passenger', passport_no)
+
+rebuild() reads both columns along their unique indexes and writes the filter to one
+file in the shared directory, replacing it atomically. The web processes re-read it when
+the file changes, so each attempt costs one stat(). add() puts an employee the app
+creates into the filter at once. Rows added behind the app's back (seeds,
+benchmarks/generate_data.py) are only known after the next rebuild, and
+until the first rebuild nothing is refused.
+
+Writers in different processes take an exclusive lock on a file next to the filter.
+add() sets its bits in the filter as it is on disk, not in this process's copy, and also
+appends the value to a log of adds. rebuild() re-applies the logged adds made after its
+queries started, so an employee added while it runs isn't lost. A rebuild that finishes
+after a later-started one leaves the newer filter in place.
+"""
+import collections
+import contextlib
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no file lock, the thread lock still covers one process
+    fcntl = None
+
+ERROR_RATE = 0.01
+# Room for the employees added between rebuilds
+HEADROOM = 1.25
+
+SOURCES = {
+    'passenger': ("SELECT COUNT(*) FROM passenger", "SELECT passport_no FROM passenger"),
+    'employee': ("SELECT COUNT(*) FROM employee", "SELECT email FROM employee"),
+}
+
+
+# ============================================
+# Rate limiting
+# ============================================
+
+class RateLimiter:
+    """
+    :param rate: tokens a key earns per second
+    :param burst: most tokens a key holds (attempts allowed in a row)
+    :param max_keys: buckets kept before the least recently used are dropped
+    """
+
+    def __init__(self, rate, burst, max_keys=100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = collections.OrderedDict()  # key -> (tokens, monotonic time)
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        """Spends a token of the key. Returns 0.0 if the attempt may go ahead, else the seconds to wait."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+# ============================================
+# Known logins
+# ============================================
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter: `hashes` bit positions per item, taken from one blake2b digest
+    (double hashing).
+    """
+
+    def __init__(self, size, hashes, bits=None, count=0, built_at=0.0):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bits if bits is not None else bytearray((size + 7) // 8)
+        self.count = count
+        self.built_at = built_at  # time.time() the rebuild that made it started reading
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=ERROR_RATE):
+        capacity = max(int(capacity), 1)
+        size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 64)
+        return cls(size, max(round(size / capacity * math.log(2)), 1))
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def to_bytes(self):
+        header = {'size': self.size, 'hashes': self.hashes, 'count': self.count, 'built_at': self.built_at}
+        return json.dumps(header).encode() + b'\n' + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        header, bits = data.split(b'\n', 1)
+        header = json.loads(header)
+        return cls(header['size'], header['hashes'], bytearray(bits), header['count'], header.get('built_at', 0.0))
+
+
+def login_key(kind, value):
+    # MySQL compares these case-insensitively, so the filter does too
+    return f"{kind}:{(value or '').strip().casefold()}"
+
+
+class KnownLogins:
+    """
+    :param pool: a ConnectionPool (rebuild() reads the passenger and employee tables)
+    :param directory: where the filter file is shared by the worker processes
+    """
+
+    def __init__(self, pool, directory):
+        self.pool = pool
+        self.path = os.path.join(directory, 'known_logins.bloom')
+        self.adds_path = os.path.join(directory, 'known_logins.adds')
+        self.lock_path = os.path.join(directory, 'known_logins.lock')
+        self._filter = None
+        self._loaded = None  # (inode, mtime) of the file self._filter was read from
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self):
+        return self.rebuild()
+
+    def _current(self):
+        """The filter from the shared file, re-read when the file has changed. None before the first rebuild."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        version = (stat.st_ino, stat.st_mtime_ns)
+        if version != self._loaded:
+            with self._lock:
+                if version != self._loaded:
+                    try:
+                        with open(self.path, 'rb') as f:
+                            self._filter = BloomFilter.from_bytes(f.read())
+                    except (OSError, ValueError):
+                        return self._filter
+                    self._loaded = version
+        return self._filter
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Holds this process's lock and, where available, the exclusive file lock."""
+        with self._lock, open(self.lock_path, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        """The filter on disk, or None. Call with the lock held."""
+        try:
+            with open(self.path, 'rb') as f:
+                return BloomFilter.from_bytes(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, bloom):
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(bloom.to_bytes())
+        os.replace(tmp, self.path)
+
+    def _read_adds(self):
+        """[(time.time() of the add, key)] from the log of adds. Call with the lock held."""
+        adds = []
+        try:
+            with open(self.adds_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        at, key = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    adds.append((at, key))
+        except OSError:
+            pass
+        return adds
+
+    def _write_adds(self, adds):
+        tmp = f'{self.adds_path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps([at, key]) + '\n' for at, key in adds)
+        os.replace(tmp, self.adds_path)
+
+    def might_exist(self, kind, value):
+        """False only when the value was neither in the database at the last rebuild nor added since."""
+        bloom = self._current()
+        return bloom is None or login_key(kind, value) in bloom
+
+    def add(self, kind, value):
+        """Adds a value the app has just written, for every worker process."""
+        key = login_key(kind, value)
+        with self._locked():
+            # Logged even before the first rebuild, which may be reading the tables right now
+            with open(self.adds_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps([time.time(), key]) + '\n')
+            bloom = self._read()
+            if bloom is not None:
+                bloom.add(key)
+                self._write(bloom)
+
+    def rebuild(self):
+        """Builds the filter from the database and shares it. Returns the run stats."""
+        started = time.perf_counter()
+        # Values added from here on may be missed by the queries, so they are re-applied from the log
+        built_at = time.time()
+        stats = {}
+        conn = self.pool.get_connection()
+        cursor = conn.cursor()
+        try:
+            counts = {}
+            for kind, (count_sql, _) in SOURCES.items():
+                cursor.execute(count_sql)
+                counts[kind] = cursor.fetchone()[0]
+            bloom = BloomFilter.for_capacity(sum(counts.values()) * HEADROOM)
+            bloom.built_at = built_at
+            for kind, (_, values_sql) in SOURCES.items():
+                cursor.execute(values_sql)
+                added = 0
+                while True:
+                    rows = cursor.fetchmany(10000)
+                    if not rows:
+                        break
+                    for (value,) in rows:
+                        bloom.add(login_key(kind, value))
+                    added += len(rows)
+                stats[kind] = added
+        finally:
+            cursor.close()
+            conn.close()
+        with self._locked():
+            current = self._read()
+            if current is not None and current.built_at > built_at:
+                stats['superseded'] = True  # a rebuild that started later has already written
+            else:
+                adds = self._read_adds()
+                replayed = [key for at, key in adds if at >= built_at]
+                for key in replayed:
+                    bloom.add(key)
+                self._write(bloom)
+                self._write_adds([(at, key) for at, key in adds if at >= built_at])
+                stats['replayed'] = len(replayed)
+        stats['bits'] = bloom.size
+        stats['hashes'] = bloom.hashes
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        return stats
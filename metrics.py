@@ -0,0 +1,268 @@
+"""
+Prometheus metrics without a lock in the request path.
+
+Every thread increments its own shard (two plain dicts), so recording a metric is a
+couple of dict operations under the GIL and never waits on another request. Shards are
+only merged when something reads them.
+
+For multi-process servers (gunicorn, uwsgi) each process writes a snapshot of its totals
+to <METRICS_DIR>/<pid>.json every METRICS_FLUSH_SECONDS from a background thread, and
+/metrics sums the counters and histograms of all the files. Counters of processes that
+have exited keep counting towards the totals. Gauges are reported per live process with a
+`pid` label.
+
+    metrics = Metrics(directory, flush_interval=5)
+    metrics.counter('airline_bookings_total', 'Successful bookings')
+    metrics.inc('airline_bookings_total')
+    metrics.observe('airline_http_request_duration_seconds', 0.012, route='/', method='GET', status='200')
+"""
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+
+from flask import Response, g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Metrics:
+    """
+    :param directory: shared directory for multi-process snapshots, None for a single process
+    :param flush_interval: seconds between snapshots written by the background thread
+    """
+
+    def __init__(self, directory=None, flush_interval=5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.types = {}  # name -> (type, help, buckets)
+        self.gauges = {}  # name -> callback returning {labels tuple: value}
+        self._local = threading.local()
+        self._shards = []  # (thread, counters, histograms)
+        self._retired = ({}, {})  # totals of shards whose thread has exited
+        self._shards_lock = threading.Lock()  # only taken on a thread's first metric and when reading
+        self._flusher_pid = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # ---- registration ----
+
+    def counter(self, name, help_text):
+        self.types[name] = ('counter', help_text, None)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.types[name] = ('histogram', help_text, tuple(buckets))
+
+    def gauge(self, name, help_text, callback):
+        """The callback returns {labels dict as tuple of pairs: value}, read at flush / scrape time."""
+        self.types[name] = ('gauge', help_text, None)
+        self.gauges[name] = callback
+
+    # ---- hot path ----
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = ({}, {})
+            with self._shards_lock:
+                self._shards.append((threading.current_thread(), shard[0], shard[1]))
+            if self.directory and self._flusher_pid != os.getpid():
+                self._start_flusher()
+        return shard
+
+    def inc(self, name, amount=1, **labels):
+        counters = self._shard()[0]
+        key = (name, _key(labels))
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        histograms = self._shard()[1]
+        key = (name, _key(labels))
+        entry = histograms.get(key)
+        buckets = self.types[name][2]
+        if entry is None:
+            # one slot per bucket plus +Inf, then sum and count
+            entry = histograms[key] = [0] * (len(buckets) + 3)
+        entry[bisect.bisect_left(buckets, value)] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+    # ---- reading ----
+
+    @staticmethod
+    def _merge(into, counters, histograms):
+        for key, value in list(counters.items()):
+            into[0][key] = into[0].get(key, 0) + value
+        for key, entry in list(histograms.items()):
+            total = into[1].get(key)
+            if total is None:
+                into[1][key] = list(entry)
+            else:
+                for i, value in enumerate(entry):
+                    total[i] += value
+
+    def snapshot(self):
+        """This process's totals as (counters, histograms)."""
+        with self._shards_lock:
+            live = []
+            for thread, counters, histograms in self._shards:
+                if thread.is_alive():
+                    live.append((thread, counters, histograms))
+                else:
+                    self._merge(self._retired, counters, histograms)
+            self._shards = live
+            totals = ({}, {})
+            self._merge(totals, *self._retired)
+            for _, counters, histograms in live:
+                self._merge(totals, counters, histograms)
+        return totals
+
+    def _gauge_values(self):
+        values = {}
+        for name, callback in self.gauges.items():
+            try:
+                values[name] = {_key(dict(labels)): value for labels, value in callback().items()}
+            except Exception:  # a broken gauge must not break the scrape
+                continue
+        return values
+
+    # ---- multi-process ----
+
+    def _start_flusher(self):
+        self._flusher_pid = os.getpid()
+        thread = threading.Thread(target=self._flush_forever, name='metrics-flusher', daemon=True)
+        thread.start()
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def flush(self):
+        """Writes this process's snapshot to the shared directory (atomically)."""
+        if not self.directory:
+            return
+        counters, histograms = self.snapshot()
+        data = {
+            'pid': os.getpid(),
+            'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+            'histograms': [[name, labels, entry] for (name, labels), entry in histograms.items()],
+            'gauges': [[name, labels, value] for name, values in self._gauge_values().items()
+                       for labels, value in values.items()],
+        }
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def collect(self):
+        """Totals across every process: (counters, histograms, {name: {labels: value}} gauges)."""
+        if not self.directory:
+            counters, histograms = self.snapshot()
+            return counters, histograms, self._gauge_values()
+
+        self.flush()
+        totals, gauges = ({}, {}), {}
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            counters = {(name, tuple(map(tuple, labels))): value for name, labels, value in data['counters']}
+            histograms = {(name, tuple(map(tuple, labels))): entry for name, labels, entry in data['histograms']}
+            self._merge(totals, counters, histograms)
+            if _pid_alive(data['pid']):
+                for name, labels, value in data['gauges']:
+                    labels = tuple(map(tuple, labels)) + (('pid', str(data['pid'])),)
+                    gauges.setdefault(name, {})[labels] = value
+        return totals[0], totals[1], gauges
+
+    def render(self):
+        """The Prometheus text exposition format."""
+        counters, histograms, gauges = self.collect()
+        by_name = {}
+        for (name, labels), value in counters.items():
+            by_name.setdefault(name, []).append((labels, value))
+        for (name, labels), entry in histograms.items():
+            by_name.setdefault(name, []).append((labels, entry))
+        for name, values in gauges.items():
+            by_name.setdefault(name, []).extend(values.items())
+
+        lines = []
+        for name, (kind, help_text, buckets) in sorted(self.types.items()):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in sorted(by_name.get(name, []), key=lambda item: item[0]):
+                if kind != 'histogram':
+                    lines.append(f'{name}{_labels(labels)} {value}')
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(buckets) + ['+Inf'], value):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", str(bound)),))} {cumulative}')
+                lines.append(f'{name}_sum{_labels(labels)} {value[-2]}')
+                lines.append(f'{name}_count{_labels(labels)} {value[-1]}')
+        return '\n'.join(lines) + '\n'
+
+    # ---- Flask integration ----
+
+    def init_app(self, app, endpoint='/metrics'):
+        """Times every request into airline_http_request_duration_seconds and serves /metrics."""
+        self.histogram('airline_http_request_duration_seconds', 'Request latency by route, method and status')
+
+        @app.before_request
+        def _start_timer():
+            g._metrics_started = time.perf_counter()
+
+        @app.after_request
+        def _record_latency(response):
+            started = g.pop('_metrics_started', None)
+            if started is not None:
+                rule = request.url_rule.rule if request.url_rule else 'unmatched'
+                self.observe('airline_http_request_duration_seconds', time.perf_counter() - started,
+                             route=rule, method=request.method, status=response.status_code)
+            return response
+
+        @app.teardown_request
+        def _record_failure(exception=None):
+            # Unhandled exceptions skip after_request, count them as 500s here
+            started = g.pop('_metrics_started', None)
+            if started is not None:
+                rule = request.url_rule.rule if request.url_rule else 'unmatched'
+                self.observe('airline_http_request_duration_seconds', time.perf_counter() - started,
+                             route=rule, method=request.method, status=500)
+
+        app.add_url_rule(endpoint, 'metrics', lambda: Response(self.render(), content_type=CONTENT_TYPE))
@@ -0,0 +1,481 @@
+"""
+Versioned schema migrations.
+
+The schema lives in migrations/NNNN_name.sql, applied in version order and recorded in
+the schema_version table with a checksum of each file:
+
+    python migrate.py                    # applies pending migrations to the live database
+    python migrate.py --status           # lists applied / pending migrations
+    python migrate.py --seed             # also loads seeds/ into a database that has no data yet
+    python migrate.py --fast-bootstrap   # drops and rebuilds the database from scratch, with sample data
+    python migrate.py --baseline         # marks 0001-0006 as applied (databases made by the old init_sql.py)
+
+A migration that was already applied must not change: its checksum is compared on every
+run and a mismatch stops the runner (--repair re-records the current checksums after a
+deliberate edit). Schema changes go in a new, higher-numbered file.
+
+Migrations are written to be re-runnable (CREATE TABLE IF NOT EXISTS, DROP ... IF EXISTS
+before CREATE for routines and triggers), because MySQL commits DDL implicitly: a
+migration made only of data statements runs in one transaction, any other one runs
+statement by statement, and if it fails halfway it is simply applied again once fixed.
+Only one runner works at a time (GET_LOCK).
+
+Seeds are seeds/*.sql scripts and seeds/NN_<table>.csv files (header row = columns),
+loaded in file name order inside one transaction, the CSVs with multi-row INSERTs of
+--chunk rows.
+"""
+import argparse
+import csv
+import hashlib
+import os
+import re
+import sys
+import time
+
+import mysql.connector
+
+from db_config import config
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(BASE_DIR, 'migrations')
+SEEDS_DIR = os.path.join(BASE_DIR, 'seeds')
+
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+LOCK_NAME = 'airline_schema_migrations'
+# The last migration the schema of the old init_sql.py matches; --baseline records up to it
+BASELINE_VERSION = 6
+
+SCHEMA_VERSION_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+      version INT PRIMARY KEY,
+      name VARCHAR(200) NOT NULL,
+      checksum CHAR(64) NOT NULL,
+      execution_ms INT NOT NULL DEFAULT 0,
+      applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+DATA_STATEMENT = re.compile(r'^\s*(INSERT|UPDATE|DELETE|REPLACE|SET\s+@)', re.IGNORECASE)
+
+
+class MigrationError(Exception):
+    pass
+
+
+# ============================================
+# SQL script parsing
+# ============================================
+
+def split_statements(script):
+    """
+    Splits a SQL script into statements the way the mysql client does: honours DELIMITER
+    lines, and ignores delimiters inside quotes and comments.
+    """
+    statements = []
+    delimiter = ';'
+    current = []
+    i, n = 0, len(script)
+    at_line_start = True
+    while i < n:
+        if at_line_start:
+            match = re.match(r'[ \t]*DELIMITER[ \t]+(\S+)[ \t]*(\r?\n|$)', script[i:], re.IGNORECASE)
+            if match:
+                if ''.join(current).strip():
+                    statements.append(''.join(current).strip())
+                current = []
+                delimiter = match.group(1)
+                i += match.end()
+                continue
+        ch = script[i]
+        at_line_start = False
+
+        if ch in ('"', "'", '`'):
+            end = i + 1
+            while end < n and script[end] != ch:
+                end += 2 if script[end] == '\\' and ch != '`' else 1
+            current.append(script[i:end + 1])
+            i = end + 1
+            continue
+        if script.startswith('--', i) and (i + 2 >= n or script[i + 2] in ' \t\r\n') or ch == '#':
+            end = script.find('\n', i)
+            end = n if end < 0 else end
+            current.append(script[i:end])
+            i = end
+            continue
+        if script.startswith('/*', i):
+            end = script.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            current.append(script[i:end])
+            i = end
+            continue
+        if script.startswith(delimiter, i):
+            if ''.join(current).strip():
+                statements.append(''.join(current).strip())
+            current = []
+            i += len(delimiter)
+            continue
+
+        current.append(ch)
+        at_line_start = ch == '\n'
+        i += 1
+
+    if ''.join(current).strip():
+        statements.append(''.join(current).strip())
+    # Drop chunks that are nothing but comments
+    return [s for s in statements if strip_comments(s).strip()]
+
+
+def strip_comments(statement):
+    return re.sub(r'(--[ \t][^\n]*|#[^\n]*|/\*.*?\*/)', '', statement, flags=re.S)
+
+
+def checksum(text):
+    return hashlib.sha256(text.replace('\r\n', '\n').encode('utf-8')).hexdigest()
+
+
+class Migration:
+    def __init__(self, path):
+        match = MIGRATION_FILE.match(os.path.basename(path))
+        self.path = path
+        self.version = int(match.group(1))
+        self.name = match.group(2)
+        with open(path, encoding='utf-8') as f:
+            self.sql = f.read()
+        self.checksum = checksum(self.sql)
+
+    @property
+    def statements(self):
+        return split_statements(self.sql)
+
+    @property
+    def transactional(self):
+        """True when every statement is a data change, so the whole migration can roll back."""
+        return all(DATA_STATEMENT.match(strip_comments(s)) for s in self.statements)
+
+    def __repr__(self):
+        return f"{self.version:04d}_{self.name}"
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    migrations = [Migration(os.path.join(directory, f)) for f in sorted(os.listdir(directory))
+                  if MIGRATION_FILE.match(f)]
+    versions = [m.version for m in migrations]
+    duplicates = {v for v in versions if versions.count(v) > 1}
+    if duplicates:
+        raise MigrationError(f"duplicate migration versions: {sorted(duplicates)}")
+    return sorted(migrations, key=lambda m: m.version)
+
+
+# ============================================
+# Runner
+# ============================================
+
+def connect(database=True):
+    """A connection to the server, using the app's database unless database=False."""
+    settings = dict(config, autocommit=True)
+    if not database:
+        settings.pop('database', None)
+    return mysql.connector.connect(**settings)
+
+
+def execute(cursor, statement):
+    cursor.execute(statement)
+    # Consume whatever a CALL or SELECT returned so the connection is ready for the next one
+    if cursor.with_rows:
+        cursor.fetchall()
+
+
+def applied_versions(cursor):
+    cursor.execute(SCHEMA_VERSION_DDL)
+    cursor.execute("SELECT version, name, checksum FROM schema_version ORDER BY version")
+    return {version: (name, digest) for version, name, digest in cursor.fetchall()}
+
+
+def check_checksums(migrations, applied, repair=False, cursor=None):
+    known = {m.version: m for m in migrations}
+    for version, (name, digest) in applied.items():
+        migration = known.get(version)
+        if migration is None:
+            print(f"⚠️  Migration {version:04d}_{name} is recorded as applied but its file is missing.")
+        elif migration.checksum != digest:
+            if not repair:
+                raise MigrationError(
+                    f"{migration!r} changed after it was applied (checksum mismatch). Put schema changes "
+                    f"in a new migration, or run with --repair if the edit was deliberate.")
+            cursor.execute("UPDATE schema_version SET checksum = %s WHERE version = %s",
+                           (migration.checksum, version))
+            print(f"✅ Re-recorded the checksum of {migration!r}.")
+
+
+def apply(cursor, migration):
+    started = time.perf_counter()
+    statements = migration.statements
+    if migration.transactional:
+        cursor.execute("START TRANSACTION")
+        try:
+            for statement in statements:
+                execute(cursor, statement)
+            record(cursor, migration, started)
+            cursor.execute("COMMIT")
+        except mysql.connector.Error:
+            cursor.execute("ROLLBACK")
+            raise
+    else:
+        for statement in statements:
+            try:
+                execute(cursor, statement)
+            except mysql.connector.Error as err:
+                first_line = strip_comments(statement).strip().splitlines()[0]
+                raise MigrationError(f"{migration!r} failed at `{first_line[:80]}`: {err}") from err
+        record(cursor, migration, started)
+    return time.perf_counter() - started
+
+
+def record(cursor, migration, started):
+    cursor.execute("INSERT INTO schema_version (version, name, checksum, execution_ms) VALUES (%s, %s, %s, %s)",
+                   (migration.version, migration.name, migration.checksum,
+                    int((time.perf_counter() - started) * 1000)))
+
+
+def pending_migrations(cursor, migrations=None):
+    migrations = migrations if migrations is not None else load_migrations()
+    applied = applied_versions(cursor)
+    return [m for m in migrations if m.version not in applied]
+
+
+class migration_lock:
+    """Holds a server-wide named lock so two runners never migrate at once."""
+
+    def __init__(self, cursor, timeout=60):
+        self.cursor = cursor
+        self.timeout = timeout
+
+    def __enter__(self):
+        self.cursor.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, self.timeout))
+        if self.cursor.fetchone()[0] != 1:
+            raise MigrationError(f"another migration run holds the '{LOCK_NAME}' lock")
+        return self
+
+    def __exit__(self, *exc):
+        self.cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+        self.cursor.fetchall()
+
+
+def migrate(repair=False):
+    """Applies every pending migration. Returns the migrations applied."""
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        with migration_lock(cursor):
+            migrations = load_migrations()
+            applied = applied_versions(cursor)
+            check_checksums(migrations, applied, repair, cursor)
+            done = []
+            for migration in migrations:
+                if migration.version in applied:
+                    continue
+                seconds = apply(cursor, migration)
+                print(f"✅ Applied {migration!r} ({len(migration.statements)} statements, {seconds * 1000:.0f} ms)")
+                done.append(migration)
+            return done
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def baseline(up_to=BASELINE_VERSION):
+    """
+    Records the migrations up to `up_to` as applied without running them, for databases
+    built by the old init_sql.py. The later ones are left for migrate() to apply.
+    """
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        with migration_lock(cursor):
+            applied = applied_versions(cursor)
+            migrations = [m for m in load_migrations() if m.version <= up_to and m.version not in applied]
+            cursor.executemany("INSERT INTO schema_version (version, name, checksum) VALUES (%s, %s, %s)",
+                               [(m.version, m.name, m.checksum) for m in migrations])
+            return migrations
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def status():
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        applied = applied_versions(cursor)
+        cursor.execute("SELECT version, applied_at, execution_ms FROM schema_version")
+        when = {version: (applied_at, ms) for version, applied_at, ms in cursor.fetchall()}
+    finally:
+        cursor.close()
+        conn.close()
+    for migration in load_migrations():
+        if migration.version not in applied:
+            print(f"  pending   {migration!r}")
+        elif applied[migration.version][1] != migration.checksum:
+            print(f"  CHANGED   {migration!r} (applied {when[migration.version][0]}, file edited since)")
+        else:
+            applied_at, ms = when[migration.version]
+            print(f"  applied   {migration!r} at {applied_at} ({ms} ms)")
+
+
+# ============================================
+# Seeds and fast bootstrap
+# ============================================
+
+def seed_files(directory=SEEDS_DIR):
+    return [os.path.join(directory, f) for f in sorted(os.listdir(directory)) if f.endswith(('.sql', '.csv'))]
+
+
+def load_csv(cursor, path, chunk):
+    """Loads NN_<table>.csv with multi-row INSERTs. Empty cells become NULL."""
+    table = re.sub(r'^\d+_', '', os.path.splitext(os.path.basename(path))[0])
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        columns = next(reader)
+        sql = (f"INSERT INTO `{table}` ({', '.join(f'`{c}`' for c in columns)}) "
+               f"VALUES ({', '.join(['%s'] * len(columns))})")
+        rows, total = [], 0
+        for row in reader:
+            rows.append([value if value != '' else None for value in row])
+            if len(rows) >= chunk:
+                cursor.executemany(sql, rows)
+                total += len(rows)
+                rows = []
+        if rows:
+            cursor.executemany(sql, rows)
+            total += len(rows)
+    return total
+
+
+def seed(cursor, chunk=5000):
+    """
+    Loads every seed file in one transaction, so a failed seed leaves the database empty.
+    Seed files must not run statements that commit (DDL, or CALLs to procedures with their
+    own transaction such as book_flight).
+    """
+    cursor.execute("START TRANSACTION")
+    try:
+        for path in seed_files():
+            started = time.perf_counter()
+            if path.endswith('.csv'):
+                count = load_csv(cursor, path, chunk)
+                what = f"{count:,} rows"
+            else:
+                with open(path, encoding='utf-8') as f:
+                    statements = split_statements(f.read())
+                for statement in statements:
+                    execute(cursor, statement)
+                what = f"{len(statements)} statements"
+            print(f"✅ Seeded {os.path.basename(path)} ({what}, {(time.perf_counter() - started) * 1000:.0f} ms)")
+        cursor.execute("COMMIT")
+    except mysql.connector.Error:
+        cursor.execute("ROLLBACK")
+        raise
+
+
+def has_data(cursor):
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM admin) OR EXISTS (SELECT 1 FROM flight)")
+    return bool(cursor.fetchone()[0])
+
+
+def fast_bootstrap(with_seeds=True, chunk=5000):
+    """
+    Drops and recreates the database, then builds it over a single connection: every
+    migration back to back with foreign key and unique checks off (the database is empty),
+    their versions recorded in one INSERT, and the seeds in one transaction.
+    """
+    database = config['database']
+    conn = connect(database=False)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+        cursor.execute(f"CREATE DATABASE `{database}`")
+        cursor.execute(f"USE `{database}`")
+        print(f"✅ Database '{database}' created.")
+
+        cursor.execute("SET foreign_key_checks = 0")
+        cursor.execute("SET unique_checks = 0")
+        migrations = load_migrations()
+        started = time.perf_counter()
+        statements = 0
+        for migration in migrations:
+            for statement in migration.statements:
+                execute(cursor, statement)
+                statements += 1
+        cursor.execute(SCHEMA_VERSION_DDL)
+        cursor.executemany("INSERT INTO schema_version (version, name, checksum) VALUES (%s, %s, %s)",
+                           [(m.version, m.name, m.checksum) for m in migrations])
+        cursor.execute("SET foreign_key_checks = 1")
+        cursor.execute("SET unique_checks = 1")
+        print(f"✅ Applied {len(migrations)} migrations ({statements} statements) "
+              f"in {(time.perf_counter() - started) * 1000:.0f} ms.")
+
+        if with_seeds:
+            seed(cursor, chunk)
+        enable_event_scheduler(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def enable_event_scheduler(cursor):
+    """Turns on the scheduler for the hourly status event. Needs SUPER or SYSTEM_VARIABLES_ADMIN."""
+    try:
+        cursor.execute("SET GLOBAL event_scheduler = ON")
+    except mysql.connector.Error as err:
+        print(f"⚠️  Could not enable the event scheduler ({err.msg}), flight statuses won't auto-update.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--status', action='store_true', help='list applied and pending migrations')
+    mode.add_argument('--fast-bootstrap', action='store_true',
+                      help='DROP the database and rebuild it from the migrations and seeds')
+    mode.add_argument('--baseline', action='store_true',
+                      help=f'record migrations up to {BASELINE_VERSION:04d} (the old init_sql.py schema) '
+                           'as applied without running them')
+    parser.add_argument('--seed', action='store_true', help='load seeds/ after migrating if the database is empty')
+    parser.add_argument('--no-seed', action='store_true', help='with --fast-bootstrap, skip the seeds')
+    parser.add_argument('--repair', action='store_true', help='accept edited migrations and re-record their checksums')
+    parser.add_argument('--chunk', type=int, default=5000, help='rows per INSERT when loading CSV seeds')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        if args.status:
+            status()
+            return
+        if args.baseline:
+            marked = baseline()
+            print(f"✅ Marked {len(marked)} migrations as applied. Run 'python migrate.py' to apply the rest.")
+            return
+        if args.fast_bootstrap:
+            fast_bootstrap(with_seeds=not args.no_seed, chunk=args.chunk)
+        else:
+            done = migrate(repair=args.repair)
+            if not done:
+                print("✅ Schema is up to date.")
+            if args.seed:
+                conn = connect()
+                cursor = conn.cursor()
+                try:
+                    if has_data(cursor):
+                        print("⚠️  The database already has data, seeds skipped.")
+                    else:
+                        seed(cursor, args.chunk)
+                finally:
+                    cursor.close()
+                    conn.close()
+    except (MigrationError, mysql.connector.Error) as err:
+        print(f"❌ {err}")
+        sys.exit(1)
+    print(f"✅ Done in {time.perf_counter() - started:.2f}s.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+-- Base schema: every table, its indexes and the dashboard counter rows.
+CREATE TABLE IF NOT EXISTS admin (
+  admin_id INT AUTO_INCREMENT PRIMARY KEY,
+  username VARCHAR(50) UNIQUE NOT NULL,
+  password VARCHAR(255) NOT NULL,
+  full_name VARCHAR(100),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS passenger (
+  passenger_id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(100) NOT NULL,
+  email VARCHAR(150) UNIQUE,
+  phone VARCHAR(20),
+  passport_no VARCHAR(50) UNIQUE NOT NULL,
+  dob DATE,
+  total_points INT DEFAULT 0,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_passenger_name (name)
+);
+
+CREATE TABLE IF NOT EXISTS employee (
+  emp_id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(100) NOT NULL,
+  role VARCHAR(50),
+  email VARCHAR(150) UNIQUE NOT NULL,
+  date_of_joining DATE NOT NULL,
+  salary DECIMAL(12,2),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_employee_name (name)
+);
+
+CREATE TABLE IF NOT EXISTS aircraft (
+  aircraft_id INT AUTO_INCREMENT PRIMARY KEY,
+  registration_no VARCHAR(50) UNIQUE,
+  model VARCHAR(100),
+  capacity INT,
+  last_maintenance DATETIME,
+  status VARCHAR(30) DEFAULT 'Operational',
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS route (
+  route_id INT AUTO_INCREMENT PRIMARY KEY,
+  source_code VARCHAR(10),
+  source_name VARCHAR(100),
+  dest_code VARCHAR(10),
+  dest_name VARCHAR(100),
+  distance_km INT,
+  INDEX idx_route_source_code (source_code),
+  INDEX idx_route_source_name (source_name),
+  INDEX idx_route_dest_code (dest_code),
+  INDEX idx_route_dest_name (dest_name)
+);
+
+CREATE TABLE IF NOT EXISTS flight (
+  flight_id INT AUTO_INCREMENT PRIMARY KEY,
+  flight_no VARCHAR(20) UNIQUE NOT NULL,
+  airline VARCHAR(100),
+  route_id INT,
+  aircraft_id INT,
+  departure_time DATETIME,
+  arrival_time DATETIME,
+  base_fare DECIMAL(10,2),
+  current_fare DECIMAL(10,2),
+  status VARCHAR(30) DEFAULT 'Scheduled',
+  gate VARCHAR(30),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_flight_status_departure (status, departure_time),
+  INDEX idx_flight_route_departure (route_id, departure_time),
+  FOREIGN KEY (route_id) REFERENCES route(route_id) ON DELETE SET NULL ON UPDATE CASCADE,
+  FOREIGN KEY (aircraft_id) REFERENCES aircraft(aircraft_id) ON DELETE SET NULL ON UPDATE CASCADE
+);
+
+-- Pre-aggregated seat inventory, one row per flight.
+-- Maintained by book_flight, the booking cancellation trigger and admin flight cancellation,
+-- so searches never have to COUNT(*) the booking table.
+CREATE TABLE IF NOT EXISTS flight_inventory (
+  flight_id INT PRIMARY KEY,
+  capacity INT NOT NULL DEFAULT 0,
+  seats_booked INT NOT NULL DEFAULT 0,
+  seats_remaining INT NOT NULL DEFAULT 0,
+  load_factor DECIMAL(5,2) GENERATED ALWAYS AS (IF(capacity > 0, seats_booked / capacity * 100, 0)) STORED,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  FOREIGN KEY (flight_id) REFERENCES flight(flight_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- Seat map, one row per flight: the cabin layout (seat letters per row) and one bit per
+-- seat in `occupied` (seat i = row i DIV width + 1, letter i MOD width, see seat_map.py).
+-- book_flight sets the bit, the booking cancellation trigger clears it.
+CREATE TABLE IF NOT EXISTS seat_map (
+  flight_id INT PRIMARY KEY,
+  layout VARCHAR(12) NOT NULL DEFAULT 'ABCDEF',
+  capacity INT NOT NULL DEFAULT 0,
+  occupied VARBINARY(255) NOT NULL,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  FOREIGN KEY (flight_id) REFERENCES flight(flight_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS booking (
+  booking_id INT AUTO_INCREMENT PRIMARY KEY,
+  passenger_id INT,
+  flight_id INT,
+  booking_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+  seat_no VARCHAR(8),
+  status VARCHAR(20) DEFAULT 'Confirmed',
+  booked_by VARCHAR(50) DEFAULT 'Passenger',
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  -- Only confirmed bookings hold a seat, cancelled ones release it
+  confirmed_seat VARCHAR(8) GENERATED ALWAYS AS (IF(status = 'Confirmed', seat_no, NULL)) STORED,
+  UNIQUE KEY uq_booking_confirmed_seat (flight_id, confirmed_seat),
+  INDEX idx_booking_flight_status (flight_id, status),
+  INDEX idx_booking_date (booking_date),
+  FOREIGN KEY (passenger_id) REFERENCES passenger(passenger_id) ON DELETE CASCADE ON UPDATE CASCADE,
+  FOREIGN KEY (flight_id) REFERENCES flight(flight_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS payment (
+  payment_id INT AUTO_INCREMENT PRIMARY KEY,
+  booking_id INT,
+  amount DECIMAL(10,2),
+  method VARCHAR(50) DEFAULT 'Internal',
+  payment_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+  refunded BOOLEAN DEFAULT FALSE,
+  refund_amount DECIMAL(10,2) DEFAULT 0,
+  FOREIGN KEY (booking_id) REFERENCES booking(booking_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS vendor (
+  vendor_id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(150),
+  amenity_type VARCHAR(100),
+  terminal VARCHAR(50),
+  location_desc VARCHAR(200),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS staff_assignment (
+  assignment_id INT AUTO_INCREMENT PRIMARY KEY,
+  emp_id INT,
+  flight_id INT,
+  role_on_flight VARCHAR(50),
+  assigned_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (emp_id) REFERENCES employee(emp_id) ON DELETE CASCADE ON UPDATE CASCADE,
+  FOREIGN KEY (flight_id) REFERENCES flight(flight_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS payroll (
+  payroll_id INT AUTO_INCREMENT PRIMARY KEY,
+  emp_id INT,
+  base_salary DECIMAL(12,2),
+  bonus DECIMAL(12,2) DEFAULT 0,
+  deductions DECIMAL(12,2) DEFAULT 0,
+  net_pay DECIMAL(12, 2) GENERATED ALWAYS AS (base_salary + bonus - deductions) STORED,
+  pay_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_payroll_pay_date (pay_date),
+  FOREIGN KEY (emp_id) REFERENCES employee(emp_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS maintenance (
+  maintenance_id INT AUTO_INCREMENT PRIMARY KEY,
+  aircraft_id INT,
+  emp_id INT,
+  notes TEXT,
+  maintenance_date DATETIME,
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (aircraft_id) REFERENCES aircraft(aircraft_id) ON DELETE CASCADE ON UPDATE CASCADE,
+  FOREIGN KEY (emp_id) REFERENCES employee(emp_id) ON DELETE SET NULL ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS audit_log (
+  log_id INT AUTO_INCREMENT PRIMARY KEY,
+  table_name VARCHAR(100),
+  record_id INT,
+  action_type VARCHAR(20),
+  description TEXT,
+  changed_by VARCHAR(100),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Materialized passenger_summary aggregates, one row per passenger.
+-- Updated incrementally by book_flight and trg_audit_booking_update,
+-- rebuilt in full by sp_rebuild_passenger_summary.
+CREATE TABLE IF NOT EXISTS passenger_summary_mv (
+  passenger_id INT PRIMARY KEY,
+  total_bookings INT NOT NULL DEFAULT 0,
+  total_spent DECIMAL(12,2) NOT NULL DEFAULT 0,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  INDEX idx_summary_spent (total_spent, passenger_id),
+  FOREIGN KEY (passenger_id) REFERENCES passenger(passenger_id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- Running totals for the admin dashboard, kept current by the trg_stats_* triggers
+CREATE TABLE IF NOT EXISTS dashboard_counter (
+  name VARCHAR(50) PRIMARY KEY,
+  value BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO dashboard_counter (name, value)
+VALUES ('passengers', 0), ('employees', 0), ('flights', 0), ('bookings', 0);
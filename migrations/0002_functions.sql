@@ -0,0 +1,114 @@
+-- Stored functions: flight duration, pseudo distance and the seat map helpers.
+DELIMITER //
+
+DROP FUNCTION IF EXISTS flight_duration //
+CREATE FUNCTION flight_duration(dep DATETIME, arr DATETIME)
+RETURNS VARCHAR(20)
+DETERMINISTIC
+BEGIN
+  DECLARE mins INT;
+  IF dep IS NULL OR arr IS NULL OR arr < dep THEN
+    RETURN 'N/A';
+  END IF;
+  SET mins = TIMESTAMPDIFF(MINUTE, dep, arr);
+  RETURN CONCAT(FLOOR(mins/60), 'h ', LPAD(MOD(mins,60),2,'0'),'m');
+END //
+
+DROP FUNCTION IF EXISTS calc_distance //
+CREATE FUNCTION calc_distance(src_code VARCHAR(10), dest_code VARCHAR(10))
+RETURNS INT
+DETERMINISTIC
+BEGIN
+  -- Pseudo-random deterministic distance generator
+  RETURN (ABS(CAST(CRC32(CONCAT(LOWER(src_code), '|', LOWER(dest_code))) AS SIGNED)) % 4000) + 200;
+END //
+
+DROP FUNCTION IF EXISTS seat_layout //
+CREATE FUNCTION seat_layout(p_model VARCHAR(100))
+RETURNS VARCHAR(12)
+DETERMINISTIC
+BEGIN
+  -- Seat letters per row: 3-3-3 on wide-bodies, 3-3 on everything else
+  IF p_model REGEXP '747|767|777|787|A330|A350|A380' THEN
+    RETURN 'ABCDEFHJK';
+  END IF;
+  RETURN 'ABCDEF';
+END //
+
+DROP FUNCTION IF EXISTS seat_index //
+CREATE FUNCTION seat_index(p_seat_no VARCHAR(8), p_layout VARCHAR(12), p_capacity INT)
+RETURNS INT
+DETERMINISTIC
+BEGIN
+  -- Bit index of a seat label such as '12A', NULL if the aircraft has no such seat
+  DECLARE v_row INT;
+  DECLARE v_col INT;
+  DECLARE v_idx INT;
+  IF p_seat_no IS NULL OR TRIM(p_seat_no) NOT REGEXP '^[0-9]+[A-Za-z]$' THEN
+    RETURN NULL;
+  END IF;
+  SET p_seat_no = TRIM(p_seat_no);
+  SET v_row = CAST(LEFT(p_seat_no, CHAR_LENGTH(p_seat_no) - 1) AS UNSIGNED);
+  SET v_col = LOCATE(UPPER(RIGHT(p_seat_no, 1)), p_layout);
+  IF v_row < 1 OR v_col = 0 THEN
+    RETURN NULL;
+  END IF;
+  SET v_idx = (v_row - 1) * CHAR_LENGTH(p_layout) + v_col - 1;
+  RETURN IF(v_idx < p_capacity, v_idx, NULL);
+END //
+
+DROP FUNCTION IF EXISTS seat_label //
+CREATE FUNCTION seat_label(p_idx INT, p_layout VARCHAR(12))
+RETURNS VARCHAR(8)
+DETERMINISTIC
+BEGIN
+  RETURN CONCAT(p_idx DIV CHAR_LENGTH(p_layout) + 1, SUBSTRING(p_layout, p_idx MOD CHAR_LENGTH(p_layout) + 1, 1));
+END //
+
+DROP FUNCTION IF EXISTS bitmap_test //
+CREATE FUNCTION bitmap_test(p_bitmap VARBINARY(255), p_idx INT)
+RETURNS BOOLEAN
+DETERMINISTIC
+BEGIN
+  RETURN (ORD(SUBSTRING(p_bitmap, p_idx DIV 8 + 1, 1)) & (1 << (p_idx MOD 8))) != 0;
+END //
+
+DROP FUNCTION IF EXISTS bitmap_set //
+CREATE FUNCTION bitmap_set(p_bitmap VARBINARY(255), p_idx INT, p_on BOOLEAN)
+RETURNS VARBINARY(255)
+DETERMINISTIC
+BEGIN
+  -- Rewrites the single byte holding the seat's bit
+  DECLARE v_byte INT;
+  SET v_byte = ORD(SUBSTRING(p_bitmap, p_idx DIV 8 + 1, 1));
+  SET v_byte = IF(p_on, v_byte | (1 << (p_idx MOD 8)), v_byte & ~(1 << (p_idx MOD 8)) & 255);
+  RETURN INSERT(p_bitmap, p_idx DIV 8 + 1, 1, CHAR(v_byte USING binary));
+END //
+
+DROP FUNCTION IF EXISTS bitmap_first_clear //
+CREATE FUNCTION bitmap_first_clear(p_bitmap VARBINARY(255), p_capacity INT)
+RETURNS INT
+DETERMINISTIC
+BEGIN
+  -- Index of the first free seat, NULL if every seat is taken.
+  -- Full bytes are skipped eight seats at a time.
+  DECLARE v_byte_no INT DEFAULT 0;
+  DECLARE v_byte INT;
+  DECLARE v_bit INT;
+  WHILE v_byte_no * 8 < p_capacity DO
+    SET v_byte = ORD(SUBSTRING(p_bitmap, v_byte_no + 1, 1));
+    IF v_byte != 255 THEN
+      SET v_bit = 0;
+      WHILE v_bit < 8 AND v_byte_no * 8 + v_bit < p_capacity DO
+        IF (v_byte & (1 << v_bit)) = 0 THEN
+          RETURN v_byte_no * 8 + v_bit;
+        END IF;
+        SET v_bit = v_bit + 1;
+      END WHILE;
+    END IF;
+    SET v_byte_no = v_byte_no + 1;
+  END WHILE;
+  RETURN NULL;
+END //
+
+DELIMITER ;
@@ -0,0 +1,206 @@
+-- Stored procedures: booking engine and the maintenance / rebuild routines.
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS update_points //
+CREATE PROCEDURE update_points(IN p_passenger_id INT, IN p_amount DECIMAL(10,2))
+BEGIN
+  -- Award 1 point for every 100 currency units spent
+  UPDATE passenger
+  SET total_points = total_points + FLOOR(p_amount / 100)
+  WHERE passenger_id = p_passenger_id;
+END //
+
+DROP PROCEDURE IF EXISTS book_flight //
+CREATE PROCEDURE book_flight(
+    IN p_passenger_id INT,
+    IN p_flight_id INT,
+    IN p_seat_no VARCHAR(8),
+    IN p_booked_by VARCHAR(50)
+)
+BEGIN
+    DECLARE v_booking_id INT;
+    DECLARE v_fare DECIMAL(10,2);
+    DECLARE v_flight_status VARCHAR(30);
+    DECLARE v_layout VARCHAR(12);
+    DECLARE v_capacity INT;
+    DECLARE v_bitmap VARBINARY(255);
+    DECLARE v_seat_idx INT;
+    DECLARE v_seat_no VARCHAR(8) DEFAULT p_seat_no;
+    
+    -- Seat already held by another confirmed booking (uq_booking_confirmed_seat)
+    DECLARE EXIT HANDLER FOR 1062
+    BEGIN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat is already taken.';
+    END;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+    
+    -- Get flight details
+    SELECT f.current_fare, f.status
+    INTO v_fare, v_flight_status
+    FROM flight f
+    WHERE f.flight_id = p_flight_id;
+    
+    IF v_flight_status IS NULL OR v_flight_status != 'Scheduled' THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is not available for booking.';
+    END IF;
+    
+    START TRANSACTION;
+    
+    -- Reserve a seat atomically: the conditional decrement row-locks the flight's
+    -- inventory row, so concurrent bookings can never take the last seat twice
+    UPDATE flight_inventory
+    SET seats_booked = seats_booked + 1,
+        seats_remaining = seats_remaining - 1
+    WHERE flight_id = p_flight_id AND seats_remaining > 0;
+    
+    IF ROW_COUNT() = 0 THEN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is full.';
+    END IF;
+    
+    -- Claim the seat's bit on the seat map. The inventory row lock above already
+    -- serializes bookings on this flight, so the map read here is current.
+    -- An empty seat number (or 'AUTO') takes the first free seat.
+    SELECT layout, capacity, occupied
+    INTO v_layout, v_capacity, v_bitmap
+    FROM seat_map
+    WHERE flight_id = p_flight_id;
+    
+    IF v_layout IS NOT NULL THEN
+        IF p_seat_no IS NULL OR TRIM(p_seat_no) = '' OR UPPER(TRIM(p_seat_no)) = 'AUTO' THEN
+            SET v_seat_idx = bitmap_first_clear(v_bitmap, v_capacity);
+            IF v_seat_idx IS NULL THEN
+                ROLLBACK;
+                SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is full.';
+            END IF;
+        ELSE
+            SET v_seat_idx = seat_index(p_seat_no, v_layout, v_capacity);
+            IF v_seat_idx IS NULL THEN
+                ROLLBACK;
+                SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Invalid seat number for this aircraft.';
+            END IF;
+        END IF;
+        
+        UPDATE seat_map
+        SET occupied = bitmap_set(occupied, v_seat_idx, TRUE)
+        WHERE flight_id = p_flight_id AND NOT bitmap_test(occupied, v_seat_idx);
+        
+        IF ROW_COUNT() = 0 THEN
+            ROLLBACK;
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat is already taken.';
+        END IF;
+        SET v_seat_no = seat_label(v_seat_idx, v_layout);
+    END IF;
+    
+    -- 1. Create booking
+    INSERT INTO booking (passenger_id, flight_id, seat_no, status, booked_by)
+    VALUES (p_passenger_id, p_flight_id, v_seat_no, 'Confirmed', p_booked_by);
+    
+    SET v_booking_id = LAST_INSERT_ID();
+    
+    -- 2. Create payment record
+    INSERT INTO payment (booking_id, amount, method)
+    VALUES (v_booking_id, v_fare, 'Internal');
+    
+    -- 3. Update loyalty points
+    CALL update_points(p_passenger_id, v_fare);
+    
+    -- Keep the materialized passenger summary current
+    INSERT INTO passenger_summary_mv (passenger_id, total_bookings, total_spent)
+    VALUES (p_passenger_id, 1, v_fare)
+    ON DUPLICATE KEY UPDATE
+        total_bookings = total_bookings + 1,
+        total_spent = total_spent + v_fare;
+    
+    -- 4. Log this action (will also be caught by trigger, but good for procedure logic)
+    INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+    VALUES ('booking', v_booking_id, 'CREATE', 'New booking via procedure', p_booked_by);
+    
+    -- 5. Adjust the fare off the same seat counter (25% over 80% full, 10% over 50% full)
+    UPDATE flight f
+    JOIN flight_inventory fi ON fi.flight_id = f.flight_id
+    SET f.current_fare = CASE
+        WHEN fi.seats_booked / fi.capacity > 0.80 THEN f.base_fare * 1.25
+        WHEN fi.seats_booked / fi.capacity > 0.50 THEN f.base_fare * 1.10
+        ELSE f.current_fare
+    END
+    WHERE f.flight_id = p_flight_id;
+    
+    COMMIT;
+    
+    SELECT v_booking_id AS new_booking_id, v_seat_no AS seat_no, 'Booking successful' AS message;
+END //
+
+DROP PROCEDURE IF EXISTS sp_update_flight_statuses //
+CREATE PROCEDURE sp_update_flight_statuses()
+BEGIN
+    -- This procedure can be run by an admin or a scheduled event
+    -- to clean up flight statuses.
+    UPDATE flight
+    SET status = 'Completed'
+    WHERE arrival_time < NOW() AND status = 'Scheduled';
+    
+    UPDATE flight
+    SET status = 'Cancelled'
+    WHERE departure_time < NOW() AND status = 'Scheduled';
+END //
+
+DROP PROCEDURE IF EXISTS sp_reconcile_flight_inventory //
+CREATE PROCEDURE sp_reconcile_flight_inventory()
+BEGIN
+    -- Rebuilds flight_inventory from the booking table in a single pass.
+    -- Safe to run at any time, e.g. after bookings were edited by hand.
+    INSERT INTO flight_inventory (flight_id, capacity, seats_booked, seats_remaining)
+    SELECT
+        f.flight_id,
+        COALESCE(ac.capacity, 0),
+        COALESCE(bc.booked, 0),
+        IF(f.status = 'Scheduled', GREATEST(COALESCE(ac.capacity, 0) - COALESCE(bc.booked, 0), 0), 0)
+    FROM flight f
+    LEFT JOIN aircraft ac ON f.aircraft_id = ac.aircraft_id
+    LEFT JOIN (
+        SELECT flight_id, COUNT(*) AS booked
+        FROM booking
+        WHERE status = 'Confirmed'
+        GROUP BY flight_id
+    ) bc ON bc.flight_id = f.flight_id
+    ON DUPLICATE KEY UPDATE
+        capacity = VALUES(capacity),
+        seats_booked = VALUES(seats_booked),
+        seats_remaining = VALUES(seats_remaining);
+    
+    DELETE fi FROM flight_inventory fi
+    LEFT JOIN flight f ON f.flight_id = fi.flight_id
+    WHERE f.flight_id IS NULL;
+END //
+
+DROP PROCEDURE IF EXISTS sp_rebuild_passenger_summary //
+CREATE PROCEDURE sp_rebuild_passenger_summary()
+BEGIN
+    -- Recomputes passenger_summary_mv from the live passenger_summary view
+    INSERT INTO passenger_summary_mv (passenger_id, total_bookings, total_spent)
+    SELECT passenger_id, total_bookings, total_spent
+    FROM passenger_summary
+    ON DUPLICATE KEY UPDATE
+        total_bookings = VALUES(total_bookings),
+        total_spent = VALUES(total_spent);
+END //
+
+DROP PROCEDURE IF EXISTS sp_refresh_dashboard_counters //
+CREATE PROCEDURE sp_refresh_dashboard_counters()
+BEGIN
+    -- Recomputes every dashboard counter in one statement
+    INSERT INTO dashboard_counter (name, value)
+    SELECT 'passengers', COUNT(*) FROM passenger
+    UNION ALL SELECT 'employees', COUNT(*) FROM employee
+    UNION ALL SELECT 'flights', COUNT(*) FROM flight WHERE status = 'Scheduled'
+    UNION ALL SELECT 'bookings', COUNT(*) FROM booking WHERE status = 'Confirmed'
+    ON DUPLICATE KEY UPDATE value = VALUES(value);
+END //
+
+DELIMITER ;
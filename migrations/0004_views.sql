@@ -0,0 +1,54 @@
+-- Views used by the dashboards.
+CREATE OR REPLACE VIEW upcoming_flights AS
+SELECT 
+    f.flight_id, 
+    f.flight_no, 
+    f.airline, 
+    f.route_id,
+    r.source_code, 
+    r.source_name,
+    r.dest_code, 
+    r.dest_name,
+    f.departure_time, 
+    f.arrival_time, 
+    f.current_fare, 
+    f.status, 
+    f.gate,
+    ac.model AS aircraft_model,
+    ac.capacity,
+    fi.seats_booked,
+    fi.seats_remaining,
+    fi.load_factor
+FROM flight f
+JOIN route r ON f.route_id = r.route_id
+JOIN aircraft ac ON f.aircraft_id = ac.aircraft_id
+JOIN flight_inventory fi ON fi.flight_id = f.flight_id
+WHERE f.departure_time > NOW() AND f.status = 'Scheduled';
+
+CREATE OR REPLACE VIEW passenger_summary AS
+SELECT 
+    p.passenger_id, 
+    p.name, 
+    p.email,
+    p.passport_no,
+    p.total_points,
+    COUNT(DISTINCT b.booking_id) AS total_bookings, 
+    COALESCE(SUM(CASE WHEN b.status = 'Confirmed' THEN pay.amount ELSE 0 END), 0) AS total_spent
+FROM passenger p
+LEFT JOIN booking b ON p.passenger_id = b.passenger_id
+LEFT JOIN payment pay ON b.booking_id = pay.booking_id
+GROUP BY p.passenger_id, p.name, p.email, p.passport_no, p.total_points;
+
+CREATE OR REPLACE VIEW employee_assignments AS
+SELECT
+    e.emp_id,
+    e.name,
+    e.role,
+    f.flight_no,
+    f.departure_time,
+    f.status,
+    sa.role_on_flight
+FROM employee e
+JOIN staff_assignment sa ON e.emp_id = sa.emp_id
+JOIN flight f ON sa.flight_id = f.flight_id
+WHERE f.departure_time > NOW() AND f.status = 'Scheduled';
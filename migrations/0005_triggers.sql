@@ -0,0 +1,224 @@
+-- Triggers: audit log, inventory, seat maps, summaries and dashboard counters.
+DELIMITER //
+
+-- Audit Log Triggers
+-- Bulk loads (@bulk_import = 1, see schedule_import.py and benchmarks/generate_data.py)
+-- skip the per-row triggers and write the derived rows set-based instead.
+DROP TRIGGER IF EXISTS trg_audit_passenger_insert //
+CREATE TRIGGER trg_audit_passenger_insert
+AFTER INSERT ON passenger
+FOR EACH ROW
+BEGIN
+    IF @bulk_import IS NULL THEN
+        INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+        VALUES ('passenger', NEW.passenger_id, 'CREATE', CONCAT('New passenger: ', NEW.name), 'System');
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_summary_passenger_insert //
+CREATE TRIGGER trg_summary_passenger_insert
+AFTER INSERT ON passenger
+FOR EACH ROW
+BEGIN
+    IF @bulk_import IS NULL THEN
+        INSERT IGNORE INTO passenger_summary_mv (passenger_id) VALUES (NEW.passenger_id);
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_audit_passenger_update //
+CREATE TRIGGER trg_audit_passenger_update
+AFTER UPDATE ON passenger
+FOR EACH ROW
+BEGIN
+    INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+    VALUES ('passenger', NEW.passenger_id, 'UPDATE', CONCAT('Updated passenger: ', NEW.name), 'System');
+END //
+
+DROP TRIGGER IF EXISTS trg_audit_flight_insert //
+CREATE TRIGGER trg_audit_flight_insert
+AFTER INSERT ON flight
+FOR EACH ROW
+BEGIN
+    -- Bulk schedule imports (@bulk_import = 1) write their audit rows set-based
+    IF @bulk_import IS NULL THEN
+        INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+        VALUES ('flight', NEW.flight_id, 'CREATE', CONCAT('New flight: ', NEW.flight_no), 'Admin');
+    END IF;
+END //
+
+-- Seat inventory row for every new flight
+DROP TRIGGER IF EXISTS trg_inventory_flight_insert //
+CREATE TRIGGER trg_inventory_flight_insert
+AFTER INSERT ON flight
+FOR EACH ROW
+BEGIN
+    IF @bulk_import IS NULL THEN
+        INSERT INTO flight_inventory (flight_id, capacity, seats_booked, seats_remaining)
+        SELECT NEW.flight_id, COALESCE(MAX(ac.capacity), 0), 0, COALESCE(MAX(ac.capacity), 0)
+        FROM aircraft ac
+        WHERE ac.aircraft_id = NEW.aircraft_id;
+        
+        INSERT INTO seat_map (flight_id, layout, capacity, occupied)
+        SELECT NEW.flight_id, seat_layout(MAX(ac.model)), COALESCE(MAX(ac.capacity), 0),
+               UNHEX(REPEAT('00', CEIL(COALESCE(MAX(ac.capacity), 0) / 8)))
+        FROM aircraft ac
+        WHERE ac.aircraft_id = NEW.aircraft_id;
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_audit_booking_update //
+CREATE TRIGGER trg_audit_booking_update
+AFTER UPDATE ON booking
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'Cancelled' AND OLD.status != 'Cancelled' THEN
+        -- Log cancellation
+        INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+        VALUES ('booking', NEW.booking_id, 'CANCEL', CONCAT('Booking cancelled: ', NEW.booking_id), 'System');
+        
+        -- Trigger refund
+        UPDATE payment
+        SET refunded = TRUE, refund_amount = amount
+        WHERE booking_id = NEW.booking_id;
+        
+        -- Release the seat back to the flight's inventory
+        UPDATE flight_inventory fi
+        JOIN flight f ON f.flight_id = fi.flight_id
+        SET fi.seats_booked = GREATEST(fi.seats_booked - 1, 0),
+            fi.seats_remaining = IF(f.status = 'Scheduled', fi.seats_remaining + 1, 0)
+        WHERE fi.flight_id = NEW.flight_id AND OLD.status = 'Confirmed';
+        
+        -- Free the seat on the seat map
+        UPDATE seat_map
+        SET occupied = bitmap_set(occupied, seat_index(NEW.seat_no, layout, capacity), FALSE)
+        WHERE flight_id = NEW.flight_id AND OLD.status = 'Confirmed'
+          AND seat_index(NEW.seat_no, layout, capacity) IS NOT NULL;
+        
+        -- A cancelled booking no longer counts towards the passenger's spend
+        IF OLD.status = 'Confirmed' THEN
+            UPDATE passenger_summary_mv
+            SET total_spent = GREATEST(total_spent - (
+                SELECT COALESCE(SUM(amount), 0) FROM payment WHERE booking_id = NEW.booking_id
+            ), 0)
+            WHERE passenger_id = NEW.passenger_id;
+        END IF;
+    END IF;
+END //
+
+-- Dashboard counter triggers
+DROP TRIGGER IF EXISTS trg_stats_passenger_insert //
+CREATE TRIGGER trg_stats_passenger_insert
+AFTER INSERT ON passenger
+FOR EACH ROW
+BEGIN
+    IF @bulk_import IS NULL THEN
+        UPDATE dashboard_counter SET value = value + 1 WHERE name = 'passengers';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_passenger_delete //
+CREATE TRIGGER trg_stats_passenger_delete
+AFTER DELETE ON passenger
+FOR EACH ROW
+BEGIN
+    IF @bulk_import IS NULL THEN
+        UPDATE dashboard_counter SET value = value - 1 WHERE name = 'passengers';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_employee_insert //
+CREATE TRIGGER trg_stats_employee_insert
+AFTER INSERT ON employee
+FOR EACH ROW
+BEGIN
+    IF @bulk_import IS NULL THEN
+        UPDATE dashboard_counter SET value = value + 1 WHERE name = 'employees';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_employee_delete //
+CREATE TRIGGER trg_stats_employee_delete
+AFTER DELETE ON employee
+FOR EACH ROW
+BEGIN
+    IF @bulk_import IS NULL THEN
+        UPDATE dashboard_counter SET value = value - 1 WHERE name = 'employees';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_flight_insert //
+CREATE TRIGGER trg_stats_flight_insert
+AFTER INSERT ON flight
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'Scheduled' AND @bulk_import IS NULL THEN
+        UPDATE dashboard_counter SET value = value + 1 WHERE name = 'flights';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_flight_update //
+CREATE TRIGGER trg_stats_flight_update
+AFTER UPDATE ON flight
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.status <=> NEW.status) THEN
+        UPDATE dashboard_counter
+        SET value = value + (NEW.status <=> 'Scheduled') - (OLD.status <=> 'Scheduled')
+        WHERE name = 'flights';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_flight_delete //
+CREATE TRIGGER trg_stats_flight_delete
+AFTER DELETE ON flight
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'Scheduled' AND @bulk_import IS NULL THEN
+        UPDATE dashboard_counter SET value = value - 1 WHERE name = 'flights';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_booking_insert //
+CREATE TRIGGER trg_stats_booking_insert
+AFTER INSERT ON booking
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'Confirmed' AND @bulk_import IS NULL THEN
+        UPDATE dashboard_counter SET value = value + 1 WHERE name = 'bookings';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_booking_update //
+CREATE TRIGGER trg_stats_booking_update
+AFTER UPDATE ON booking
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.status <=> NEW.status) THEN
+        UPDATE dashboard_counter
+        SET value = value + (NEW.status <=> 'Confirmed') - (OLD.status <=> 'Confirmed')
+        WHERE name = 'bookings';
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_stats_booking_delete //
+CREATE TRIGGER trg_stats_booking_delete
+AFTER DELETE ON booking
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'Confirmed' AND @bulk_import IS NULL THEN
+        UPDATE dashboard_counter SET value = value - 1 WHERE name = 'bookings';
+    END IF;
+END //
+
+-- Set initial fare on flight creation
+DROP TRIGGER IF EXISTS trg_set_initial_fare //
+CREATE TRIGGER trg_set_initial_fare
+BEFORE INSERT ON flight
+FOR EACH ROW
+BEGIN
+    IF @bulk_import IS NULL THEN
+        SET NEW.current_fare = NEW.base_fare;
+    END IF;
+END //
+
+DELIMITER ;
@@ -0,0 +1,18 @@
+-- Hourly flight status clean-up. Needs the event scheduler (SET GLOBAL event_scheduler = ON).
+DELIMITER //
+DROP EVENT IF EXISTS evt_auto_cancel_flights //
+CREATE EVENT evt_auto_cancel_flights
+ON SCHEDULE EVERY 1 HOUR
+DO
+BEGIN
+    -- Mark flights as 'Cancelled' if they are past departure time but still 'Scheduled'
+    UPDATE flight
+    SET status = 'Cancelled'
+    WHERE departure_time < NOW() AND status = 'Scheduled';
+    
+    -- Mark flights as 'Completed' if they are past arrival time
+    UPDATE flight
+    SET status = 'Completed'
+    WHERE arrival_time < NOW() AND status IN ('Scheduled', 'Departed');
+END //
+DELIMITER ;
@@ -0,0 +1,152 @@
+-- audit_log range-partitioned by month, with a created_at index and a daily retention job.
+--
+-- Partition pYYYYMM holds the rows created in that month, p_future anything later.
+-- MySQL wants the partitioning column in every unique key, so the primary key becomes
+-- (log_id, created_at); log_id stays unique on its own through AUTO_INCREMENT.
+
+CREATE TABLE IF NOT EXISTS audit_log_archive (
+  log_id INT NOT NULL,
+  table_name VARCHAR(100),
+  record_id INT,
+  action_type VARCHAR(20),
+  description TEXT,
+  changed_by VARCHAR(100),
+  created_at DATETIME NOT NULL,
+  archived_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (log_id, created_at),
+  INDEX idx_audit_archive_created (created_at)
+);
+
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS sp_audit_log_add_partitions //
+CREATE PROCEDURE sp_audit_log_add_partitions(IN p_months_ahead INT)
+BEGIN
+    -- Splits p_future so every month up to p_months_ahead from now has its own partition
+    DECLARE v_next DATE;
+    DECLARE v_last DATE DEFAULT DATE_FORMAT(NOW() + INTERVAL p_months_ahead MONTH, '%Y-%m-01');
+    DECLARE v_parts TEXT DEFAULT '';
+
+    SELECT FROM_DAYS(MAX(CAST(partition_description AS UNSIGNED)))
+    INTO v_next
+    FROM information_schema.PARTITIONS
+    WHERE table_schema = DATABASE() AND table_name = 'audit_log'
+      AND partition_description <> 'MAXVALUE';
+    SET v_next = COALESCE(v_next, DATE_FORMAT(NOW(), '%Y-%m-01'));
+
+    WHILE v_next <= v_last DO
+        SET v_parts = CONCAT(v_parts, 'PARTITION p', DATE_FORMAT(v_next, '%Y%m'),
+                             ' VALUES LESS THAN (', TO_DAYS(v_next + INTERVAL 1 MONTH), '), ');
+        SET v_next = v_next + INTERVAL 1 MONTH;
+    END WHILE;
+
+    IF v_parts <> '' THEN
+        SET @audit_ddl = CONCAT('ALTER TABLE audit_log REORGANIZE PARTITION p_future INTO (',
+                                v_parts, 'PARTITION p_future VALUES LESS THAN MAXVALUE)');
+        PREPARE stmt FROM @audit_ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END //
+
+DROP PROCEDURE IF EXISTS sp_audit_log_retention //
+CREATE PROCEDURE sp_audit_log_retention(IN p_keep_months INT, IN p_archive BOOLEAN)
+BEGIN
+    -- Drops the monthly partitions older than p_keep_months (the current month counts),
+    -- copying their rows to audit_log_archive first when p_archive is set.
+    -- Dropping a partition is a metadata change, unlike a DELETE over the old rows.
+    DECLARE v_cutoff INT DEFAULT TO_DAYS(DATE_FORMAT(NOW() - INTERVAL (GREATEST(p_keep_months, 1) - 1) MONTH, '%Y-%m-01'));
+    DECLARE v_parts TEXT;
+    DECLARE v_part VARCHAR(64);
+    DECLARE v_rest TEXT;
+    DECLARE v_dropped INT DEFAULT 0;
+    DECLARE v_archived INT DEFAULT 0;
+
+    SELECT GROUP_CONCAT(partition_name ORDER BY partition_ordinal_position), COUNT(*)
+    INTO v_parts, v_dropped
+    FROM information_schema.PARTITIONS
+    WHERE table_schema = DATABASE() AND table_name = 'audit_log'
+      AND partition_description <> 'MAXVALUE'
+      AND CAST(partition_description AS UNSIGNED) <= v_cutoff;
+
+    IF v_dropped > 0 THEN
+        IF p_archive THEN
+            SET v_rest = v_parts;
+            WHILE v_rest <> '' DO
+                SET v_part = SUBSTRING_INDEX(v_rest, ',', 1);
+                SET v_rest = IF(LOCATE(',', v_rest) > 0, SUBSTRING(v_rest, LOCATE(',', v_rest) + 1), '');
+                SET @audit_ddl = CONCAT('INSERT IGNORE INTO audit_log_archive ',
+                                        '(log_id, table_name, record_id, action_type, description, changed_by, created_at) ',
+                                        'SELECT log_id, table_name, record_id, action_type, description, changed_by, created_at ',
+                                        'FROM audit_log PARTITION (', v_part, ')');
+                PREPARE stmt FROM @audit_ddl;
+                EXECUTE stmt;
+                SET v_archived = v_archived + ROW_COUNT();
+                DEALLOCATE PREPARE stmt;
+            END WHILE;
+        END IF;
+
+        SET @audit_ddl = CONCAT('ALTER TABLE audit_log DROP PARTITION ', v_parts);
+        PREPARE stmt FROM @audit_ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+
+    SELECT v_dropped AS partitions_dropped, v_archived AS rows_archived;
+END //
+
+-- One-off conversion of the existing table. Does nothing once audit_log is partitioned.
+DROP PROCEDURE IF EXISTS sp_audit_log_partition //
+CREATE PROCEDURE sp_audit_log_partition()
+BEGIN
+    DECLARE v_month DATE;
+    DECLARE v_now DATE DEFAULT DATE_FORMAT(NOW(), '%Y-%m-01');
+    DECLARE v_parts TEXT DEFAULT '';
+
+    IF NOT EXISTS (SELECT 1 FROM information_schema.PARTITIONS
+                   WHERE table_schema = DATABASE() AND table_name = 'audit_log'
+                     AND partition_name IS NOT NULL) THEN
+        UPDATE audit_log SET created_at = NOW() WHERE created_at IS NULL;
+
+        ALTER TABLE audit_log
+            MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (log_id, created_at),
+            ADD INDEX idx_audit_created (created_at);
+
+        -- One partition per month from the oldest row to this month
+        SELECT DATE_FORMAT(COALESCE(MIN(created_at), NOW()), '%Y-%m-01') INTO v_month FROM audit_log;
+        WHILE v_month <= v_now DO
+            SET v_parts = CONCAT(v_parts, 'PARTITION p', DATE_FORMAT(v_month, '%Y%m'),
+                                 ' VALUES LESS THAN (', TO_DAYS(v_month + INTERVAL 1 MONTH), '), ');
+            SET v_month = v_month + INTERVAL 1 MONTH;
+        END WHILE;
+
+        SET @audit_ddl = CONCAT('ALTER TABLE audit_log PARTITION BY RANGE (TO_DAYS(created_at)) (',
+                                v_parts, 'PARTITION p_future VALUES LESS THAN MAXVALUE)');
+        PREPARE stmt FROM @audit_ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END //
+
+DELIMITER ;
+
+CALL sp_audit_log_partition();
+DROP PROCEDURE sp_audit_log_partition;
+
+-- Three months of empty partitions ahead, so inserts never land in p_future
+CALL sp_audit_log_add_partitions(3);
+
+-- Daily: keep three months of partitions ahead and archive + drop the ones past a year.
+-- Needs the event scheduler, like evt_auto_cancel_flights.
+DELIMITER //
+DROP EVENT IF EXISTS evt_audit_log_maintenance //
+CREATE EVENT evt_audit_log_maintenance
+ON SCHEDULE EVERY 1 DAY
+DO
+BEGIN
+    CALL sp_audit_log_add_partitions(3);
+    CALL sp_audit_log_retention(12, TRUE);
+END //
+DELIMITER ;
@@ -0,0 +1,188 @@
+-- Audit rows off the booking path: connections with @audit_deferred = 1 (the app's, see
+-- audit_writer.py) write the booking and cancellation audit rows themselves, in batches,
+-- after the transaction. Loyalty point updates no longer log a passenger UPDATE.
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS book_flight //
+CREATE PROCEDURE book_flight(
+    IN p_passenger_id INT,
+    IN p_flight_id INT,
+    IN p_seat_no VARCHAR(8),
+    IN p_booked_by VARCHAR(50)
+)
+BEGIN
+    DECLARE v_booking_id INT;
+    DECLARE v_fare DECIMAL(10,2);
+    DECLARE v_flight_status VARCHAR(30);
+    DECLARE v_layout VARCHAR(12);
+    DECLARE v_capacity INT;
+    DECLARE v_bitmap VARBINARY(255);
+    DECLARE v_seat_idx INT;
+    DECLARE v_seat_no VARCHAR(8) DEFAULT p_seat_no;
+    
+    -- Seat already held by another confirmed booking (uq_booking_confirmed_seat)
+    DECLARE EXIT HANDLER FOR 1062
+    BEGIN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat is already taken.';
+    END;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+    
+    -- Get flight details
+    SELECT f.current_fare, f.status
+    INTO v_fare, v_flight_status
+    FROM flight f
+    WHERE f.flight_id = p_flight_id;
+    
+    IF v_flight_status IS NULL OR v_flight_status != 'Scheduled' THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is not available for booking.';
+    END IF;
+    
+    START TRANSACTION;
+    
+    -- Reserve a seat atomically: the conditional decrement row-locks the flight's
+    -- inventory row, so concurrent bookings can never take the last seat twice
+    UPDATE flight_inventory
+    SET seats_booked = seats_booked + 1,
+        seats_remaining = seats_remaining - 1
+    WHERE flight_id = p_flight_id AND seats_remaining > 0;
+    
+    IF ROW_COUNT() = 0 THEN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is full.';
+    END IF;
+    
+    -- Claim the seat's bit on the seat map. The inventory row lock above already
+    -- serializes bookings on this flight, so the map read here is current.
+    -- An empty seat number (or 'AUTO') takes the first free seat.
+    SELECT layout, capacity, occupied
+    INTO v_layout, v_capacity, v_bitmap
+    FROM seat_map
+    WHERE flight_id = p_flight_id;
+    
+    IF v_layout IS NOT NULL THEN
+        IF p_seat_no IS NULL OR TRIM(p_seat_no) = '' OR UPPER(TRIM(p_seat_no)) = 'AUTO' THEN
+            SET v_seat_idx = bitmap_first_clear(v_bitmap, v_capacity);
+            IF v_seat_idx IS NULL THEN
+                ROLLBACK;
+                SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is full.';
+            END IF;
+        ELSE
+            SET v_seat_idx = seat_index(p_seat_no, v_layout, v_capacity);
+            IF v_seat_idx IS NULL THEN
+                ROLLBACK;
+                SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Invalid seat number for this aircraft.';
+            END IF;
+        END IF;
+        
+        UPDATE seat_map
+        SET occupied = bitmap_set(occupied, v_seat_idx, TRUE)
+        WHERE flight_id = p_flight_id AND NOT bitmap_test(occupied, v_seat_idx);
+        
+        IF ROW_COUNT() = 0 THEN
+            ROLLBACK;
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat is already taken.';
+        END IF;
+        SET v_seat_no = seat_label(v_seat_idx, v_layout);
+    END IF;
+    
+    -- 1. Create booking
+    INSERT INTO booking (passenger_id, flight_id, seat_no, status, booked_by)
+    VALUES (p_passenger_id, p_flight_id, v_seat_no, 'Confirmed', p_booked_by);
+    
+    SET v_booking_id = LAST_INSERT_ID();
+    
+    -- 2. Create payment record
+    INSERT INTO payment (booking_id, amount, method)
+    VALUES (v_booking_id, v_fare, 'Internal');
+    
+    -- 3. Update loyalty points
+    CALL update_points(p_passenger_id, v_fare);
+    
+    -- Keep the materialized passenger summary current
+    INSERT INTO passenger_summary_mv (passenger_id, total_bookings, total_spent)
+    VALUES (p_passenger_id, 1, v_fare)
+    ON DUPLICATE KEY UPDATE
+        total_bookings = total_bookings + 1,
+        total_spent = total_spent + v_fare;
+    
+    -- 4. Log this action, unless the caller logs it itself (@audit_deferred, see audit_writer.py)
+    IF @audit_deferred IS NULL THEN
+        INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+        VALUES ('booking', v_booking_id, 'CREATE', 'New booking via procedure', p_booked_by);
+    END IF;
+    
+    -- 5. Adjust the fare off the same seat counter (25% over 80% full, 10% over 50% full)
+    UPDATE flight f
+    JOIN flight_inventory fi ON fi.flight_id = f.flight_id
+    SET f.current_fare = CASE
+        WHEN fi.seats_booked / fi.capacity > 0.80 THEN f.base_fare * 1.25
+        WHEN fi.seats_booked / fi.capacity > 0.50 THEN f.base_fare * 1.10
+        ELSE f.current_fare
+    END
+    WHERE f.flight_id = p_flight_id;
+    
+    COMMIT;
+    
+    SELECT v_booking_id AS new_booking_id, v_seat_no AS seat_no, 'Booking successful' AS message;
+END //
+
+DROP TRIGGER IF EXISTS trg_audit_passenger_update //
+CREATE TRIGGER trg_audit_passenger_update
+AFTER UPDATE ON passenger
+FOR EACH ROW
+BEGIN
+    -- Loyalty points move with every booking, which is logged already: only profile edits are audited
+    IF NOT (OLD.name <=> NEW.name AND OLD.email <=> NEW.email AND OLD.phone <=> NEW.phone
+            AND OLD.passport_no <=> NEW.passport_no AND OLD.dob <=> NEW.dob) THEN
+        INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+        VALUES ('passenger', NEW.passenger_id, 'UPDATE', CONCAT('Updated passenger: ', NEW.name), 'System');
+    END IF;
+END //
+
+DROP TRIGGER IF EXISTS trg_audit_booking_update //
+CREATE TRIGGER trg_audit_booking_update
+AFTER UPDATE ON booking
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'Cancelled' AND OLD.status != 'Cancelled' THEN
+        -- Log cancellation, unless the application logs it itself (@audit_deferred)
+        IF @audit_deferred IS NULL THEN
+            INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+            VALUES ('booking', NEW.booking_id, 'CANCEL', CONCAT('Booking cancelled: ', NEW.booking_id), 'System');
+        END IF;
+        
+        -- Trigger refund
+        UPDATE payment
+        SET refunded = TRUE, refund_amount = amount
+        WHERE booking_id = NEW.booking_id;
+        
+        -- Release the seat back to the flight's inventory
+        UPDATE flight_inventory fi
+        JOIN flight f ON f.flight_id = fi.flight_id
+        SET fi.seats_booked = GREATEST(fi.seats_booked - 1, 0),
+            fi.seats_remaining = IF(f.status = 'Scheduled', fi.seats_remaining + 1, 0)
+        WHERE fi.flight_id = NEW.flight_id AND OLD.status = 'Confirmed';
+        
+        -- Free the seat on the seat map
+        UPDATE seat_map
+        SET occupied = bitmap_set(occupied, seat_index(NEW.seat_no, layout, capacity), FALSE)
+        WHERE flight_id = NEW.flight_id AND OLD.status = 'Confirmed'
+          AND seat_index(NEW.seat_no, layout, capacity) IS NOT NULL;
+        
+        -- A cancelled booking no longer counts towards the passenger's spend
+        IF OLD.status = 'Confirmed' THEN
+            UPDATE passenger_summary_mv
+            SET total_spent = GREATEST(total_spent - (
+                SELECT COALESCE(SUM(amount), 0) FROM payment WHERE booking_id = NEW.booking_id
+            ), 0)
+            WHERE passenger_id = NEW.passenger_id;
+        END IF;
+    END IF;
+END //
+
+DELIMITER ;
@@ -0,0 +1,34 @@
+-- Background job queue (see jobs.py). Flight statuses move to the app's worker, which
+-- replaces the hourly evt_auto_cancel_flights event.
+
+CREATE TABLE IF NOT EXISTS job_run (
+  job_id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(50) NOT NULL,
+  status VARCHAR(20) NOT NULL DEFAULT 'Queued',  -- Queued, Running, Done, Failed
+  requested_by VARCHAR(150),
+  enqueued_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  started_at DATETIME,
+  finished_at DATETIME,
+  stats JSON,
+  error TEXT,
+  INDEX idx_job_run_status (status, job_id),
+  INDEX idx_job_run_name (name, status, job_id)
+);
+
+-- The status job walks (status, arrival_time) the way it walks idx_flight_status_departure
+DELIMITER //
+DROP PROCEDURE IF EXISTS sp_add_flight_arrival_index //
+CREATE PROCEDURE sp_add_flight_arrival_index()
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.STATISTICS
+                   WHERE table_schema = DATABASE() AND table_name = 'flight'
+                     AND index_name = 'idx_flight_status_arrival') THEN
+        ALTER TABLE flight ADD INDEX idx_flight_status_arrival (status, arrival_time);
+    END IF;
+END //
+DELIMITER ;
+
+CALL sp_add_flight_arrival_index();
+DROP PROCEDURE sp_add_flight_arrival_index;
+
+DROP EVENT IF EXISTS evt_auto_cancel_flights;
@@ -0,0 +1,123 @@
+-- Fares move to the batch repricer (pricing.py, the 'reprice' job): book_flight no
+-- longer updates flight.current_fare on every booking.
+DELIMITER //
+
+DROP PROCEDURE IF EXISTS book_flight //
+CREATE PROCEDURE book_flight(
+    IN p_passenger_id INT,
+    IN p_flight_id INT,
+    IN p_seat_no VARCHAR(8),
+    IN p_booked_by VARCHAR(50)
+)
+BEGIN
+    DECLARE v_booking_id INT;
+    DECLARE v_fare DECIMAL(10,2);
+    DECLARE v_flight_status VARCHAR(30);
+    DECLARE v_layout VARCHAR(12);
+    DECLARE v_capacity INT;
+    DECLARE v_bitmap VARBINARY(255);
+    DECLARE v_seat_idx INT;
+    DECLARE v_seat_no VARCHAR(8) DEFAULT p_seat_no;
+    
+    -- Seat already held by another confirmed booking (uq_booking_confirmed_seat)
+    DECLARE EXIT HANDLER FOR 1062
+    BEGIN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat is already taken.';
+    END;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+    
+    -- Get flight details
+    SELECT f.current_fare, f.status
+    INTO v_fare, v_flight_status
+    FROM flight f
+    WHERE f.flight_id = p_flight_id;
+    
+    IF v_flight_status IS NULL OR v_flight_status != 'Scheduled' THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is not available for booking.';
+    END IF;
+    
+    START TRANSACTION;
+    
+    -- Reserve a seat atomically: the conditional decrement row-locks the flight's
+    -- inventory row, so concurrent bookings can never take the last seat twice
+    UPDATE flight_inventory
+    SET seats_booked = seats_booked + 1,
+        seats_remaining = seats_remaining - 1
+    WHERE flight_id = p_flight_id AND seats_remaining > 0;
+    
+    IF ROW_COUNT() = 0 THEN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is full.';
+    END IF;
+    
+    -- Claim the seat's bit on the seat map. The inventory row lock above already
+    -- serializes bookings on this flight, so the map read here is current.
+    -- An empty seat number (or 'AUTO') takes the first free seat.
+    SELECT layout, capacity, occupied
+    INTO v_layout, v_capacity, v_bitmap
+    FROM seat_map
+    WHERE flight_id = p_flight_id;
+    
+    IF v_layout IS NOT NULL THEN
+        IF p_seat_no IS NULL OR TRIM(p_seat_no) = '' OR UPPER(TRIM(p_seat_no)) = 'AUTO' THEN
+            SET v_seat_idx = bitmap_first_clear(v_bitmap, v_capacity);
+            IF v_seat_idx IS NULL THEN
+                ROLLBACK;
+                SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Flight is full.';
+            END IF;
+        ELSE
+            SET v_seat_idx = seat_index(p_seat_no, v_layout, v_capacity);
+            IF v_seat_idx IS NULL THEN
+                ROLLBACK;
+                SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Invalid seat number for this aircraft.';
+            END IF;
+        END IF;
+        
+        UPDATE seat_map
+        SET occupied = bitmap_set(occupied, v_seat_idx, TRUE)
+        WHERE flight_id = p_flight_id AND NOT bitmap_test(occupied, v_seat_idx);
+        
+        IF ROW_COUNT() = 0 THEN
+            ROLLBACK;
+            SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat is already taken.';
+        END IF;
+        SET v_seat_no = seat_label(v_seat_idx, v_layout);
+    END IF;
+    
+    -- 1. Create booking
+    INSERT INTO booking (passenger_id, flight_id, seat_no, status, booked_by)
+    VALUES (p_passenger_id, p_flight_id, v_seat_no, 'Confirmed', p_booked_by);
+    
+    SET v_booking_id = LAST_INSERT_ID();
+    
+    -- 2. Create payment record
+    INSERT INTO payment (booking_id, amount, method)
+    VALUES (v_booking_id, v_fare, 'Internal');
+    
+    -- 3. Update loyalty points
+    CALL update_points(p_passenger_id, v_fare);
+    
+    -- Keep the materialized passenger summary current
+    INSERT INTO passenger_summary_mv (passenger_id, total_bookings, total_spent)
+    VALUES (p_passenger_id, 1, v_fare)
+    ON DUPLICATE KEY UPDATE
+        total_bookings = total_bookings + 1,
+        total_spent = total_spent + v_fare;
+    
+    -- 4. Log this action, unless the caller logs it itself (@audit_deferred, see audit_writer.py)
+    IF @audit_deferred IS NULL THEN
+        INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+        VALUES ('booking', v_booking_id, 'CREATE', 'New booking via procedure', p_booked_by);
+    END IF;
+    
+    COMMIT;
+    
+    SELECT v_booking_id AS new_booking_id, v_seat_no AS seat_no, 'Booking successful' AS message;
+END //
+
+DELIMITER ;
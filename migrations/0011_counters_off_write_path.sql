@@ -0,0 +1,20 @@
+-- Dashboard counters leave the write path: every booking, passenger, employee and flight
+-- write used to update one dashboard_counter row, so concurrent bookings queued on its row
+-- lock even with AIRLINE_STATS_USE_COUNTERS off. The worker's 'dashboard_counters' job now
+-- recomputes the table with sp_refresh_dashboard_counters instead (see dashboard_stats.py).
+DELIMITER //
+
+DROP TRIGGER IF EXISTS trg_stats_passenger_insert //
+DROP TRIGGER IF EXISTS trg_stats_passenger_delete //
+DROP TRIGGER IF EXISTS trg_stats_employee_insert //
+DROP TRIGGER IF EXISTS trg_stats_employee_delete //
+DROP TRIGGER IF EXISTS trg_stats_flight_insert //
+DROP TRIGGER IF EXISTS trg_stats_flight_update //
+DROP TRIGGER IF EXISTS trg_stats_flight_delete //
+DROP TRIGGER IF EXISTS trg_stats_booking_insert //
+DROP TRIGGER IF EXISTS trg_stats_booking_update //
+DROP TRIGGER IF EXISTS trg_stats_booking_delete //
+
+DELIMITER ;
+
+CALL sp_refresh_dashboard_counters();
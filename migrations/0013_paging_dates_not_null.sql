@@ -0,0 +1,9 @@
+-- The admin bookings and payroll listings page on (booking_date, booking_id) and
+-- (pay_date, payroll_id) with keyset seeks, which never match a NULL date: such rows were
+-- unreachable after the first page. Both dates are now required. Rows without one get
+-- their creation time, or the lowest date (where MySQL sorted the NULLs).
+UPDATE booking SET booking_date = COALESCE(created_at, '1000-01-01 00:00:00') WHERE booking_date IS NULL;
+UPDATE payroll SET pay_date = '1000-01-01 00:00:00' WHERE pay_date IS NULL;
+
+ALTER TABLE booking MODIFY booking_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE payroll MODIFY pay_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP;
@@ -0,0 +1,152 @@
+"""
+Keyset (cursor) pagination for the admin listing pages.
+
+Instead of LIMIT/OFFSET, each page remembers the sort key of its first and last row and
+the next query seeks past it with an indexed WHERE clause, so every page costs the same
+no matter how deep into the table it is. Sort keys always end in the primary key so the
+order is stable even when names or dates repeat.
+"""
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(v) if v is not None else None for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Returns the list of key values in a cursor, or None if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Clamps a requested page size to [1, MAX_PAGE_SIZE]."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+class Page:
+    """One page of rows plus the cursors needed to move forwards and backwards."""
+
+    def __init__(self, rows, size, next_cursor=None, prev_cursor=None):
+        self.rows = rows
+        self.size = size
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class KeysetPager:
+    """
+    :param select_sql: SELECT ... FROM ... JOIN ... without WHERE / ORDER BY / LIMIT
+    :param keys: [(sql expression, row field)] making up the sort key, ending in a unique column;
+                 the columns must be NOT NULL, since the seek never matches a NULL
+    :param descending: True to list newest / largest first
+    """
+
+    def __init__(self, select_sql, keys, descending=False):
+        self.select_sql = select_sql
+        self.keys = keys
+        self.descending = descending
+
+    def _seek(self, values, forward):
+        """Builds 'k1 > v1 OR (k1 = v1 AND k2 > v2) ...' for the requested direction."""
+        ascending = forward != self.descending
+        op = '>' if ascending else '<'
+        clauses, params = [], []
+        for i, (expr, _) in enumerate(self.keys):
+            parts = [f"{prev_expr} = %s" for prev_expr, _ in self.keys[:i]]
+            parts.append(f"{expr} {op} %s")
+            clauses.append('(' + ' AND '.join(parts) + ')')
+            params.extend(values[:i + 1])
+        return '(' + ' OR '.join(clauses) + ')', params
+
+    def _order(self, forward):
+        ascending = forward != self.descending
+        direction = 'ASC' if ascending else 'DESC'
+        return ', '.join(f"{expr} {direction}" for expr, _ in self.keys)
+
+    def ordered_sql(self, where=None):
+        """The full listing in page order, e.g. for streaming exports."""
+        sql = self.select_sql
+        if where:
+            sql += f" WHERE {where}"
+        return sql + f" ORDER BY {self._order(True)}"
+
+    def _cursor(self, row):
+        return encode_cursor([row[field] for _, field in self.keys])
+
+    def build(self, after=None, before=None, size=DEFAULT_PAGE_SIZE, where=None, params=()):
+        """
+        Builds the SQL for one page without running it.
+        :param after: cursor of the last row of the previous page (move forwards)
+        :param before: cursor of the first row of the next page (move backwards)
+        :param where: optional extra filter (SQL without the WHERE keyword)
+        :return: (sql, params, state); pass the rows and state to to_page()
+        """
+        size = page_size(size)
+        cursor, forward = (before, False) if before else (after, True)
+        values = decode_cursor(cursor) if cursor else None
+        if values is not None and len(values) != len(self.keys):
+            values = None
+
+        conditions, sql_params = [], list(params)
+        if where:
+            conditions.append(where)
+        if values is not None:
+            seek_sql, seek_params = self._seek(values, forward)
+            conditions.append(seek_sql)
+            sql_params.extend(seek_params)
+
+        sql = self.select_sql
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {self._order(forward)} LIMIT %s"
+        sql_params.append(size + 1)
+        return sql, tuple(sql_params), (size, forward, values is not None)
+
+    def to_page(self, rows, state):
+        """Turns the rows fetched for build()'s SQL into a Page."""
+        size, forward, seeked = state
+        rows = list(rows or [])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if not forward:
+            rows.reverse()
+        if not rows:
+            return Page(rows, size)
+
+        if forward:
+            has_next, has_prev = has_more, seeked
+        else:
+            has_next, has_prev = True, has_more
+        return Page(
+            rows, size,
+            next_cursor=self._cursor(rows[-1]) if has_next else None,
+            prev_cursor=self._cursor(rows[0]) if has_prev else None,
+        )
+
+    def fetch(self, query, after=None, before=None, size=DEFAULT_PAGE_SIZE, where=None, params=()):
+        """
+        Fetches one page.
+        :param query: the app's db_query helper
+        """
+        sql, sql_params, state = self.build(after, before, size, where, params)
+        return self.to_page(query(sql, sql_params, fetchall=True), state)
@@ -0,0 +1,51 @@
+"""
+Admin password hashing.
+
+Passwords are stored as werkzeug hashes, 'method$salt$hash', where the method carries the
+work factor (e.g. 'scrypt:16384:8:1' is scrypt with N=16384, r=8, p=1, or
+'pbkdf2:sha256:600000'). The app hashes with its PASSWORD_HASH_METHOD setting. When a
+login succeeds against a hash made with a different method, or against a password still
+stored in plaintext from before hashing, verify() asks for a rehash. So raising or
+lowering the work factor takes effect one login at a time, and
+'flask hash-admin-passwords' converts the remaining plaintext rows at once.
+
+The login query only looks the admin up by username, and the password is checked here in
+constant time. An unknown username is checked against a dummy hash, so it takes as long
+to refuse as a wrong password.
+"""
+import hmac
+import re
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt:16384:8:1'
+
+HASH_RE = re.compile(r'^(scrypt|pbkdf2):[^$]*\$[^$]*\$[0-9a-f]+$')
+
+_dummy_hashes = {}
+
+
+def is_hashed(stored):
+    return bool(stored) and HASH_RE.match(stored) is not None
+
+
+def hash_password(password, method=DEFAULT_METHOD):
+    return generate_password_hash(password, method=method)
+
+
+def verify(stored, password, method=DEFAULT_METHOD):
+    """
+    Checks a password against the stored value (a hash, or legacy plaintext).
+    :param stored: the admin row's password column, None for an unknown username
+    :return: (matches, needs_rehash)
+    """
+    if stored is None:
+        if method not in _dummy_hashes:
+            _dummy_hashes[method] = hash_password('dummy password', method)
+        check_password_hash(_dummy_hashes[method], password)
+        return False, False
+    if not is_hashed(stored):
+        matches = hmac.compare_digest(stored.encode(), password.encode())
+        return matches, matches
+    matches = check_password_hash(stored, password)
+    return matches, matches and stored.split('$', 1)[0] != method
@@ -0,0 +1,174 @@
+"""
+Dynamic fares, computed in Python and written in bulk.
+
+A flight's fare is its base fare times three multipliers:
+
+  * load factor: seats booked / capacity (the 50% / 80% tiers book_flight used to apply)
+  * days to departure: late bookings pay more, early ones a little less
+  * route demand: how full the route's upcoming flights are compared with the whole
+    network, so a busy route prices up and a quiet one down
+
+clamped to [MIN_FACTOR, MAX_FACTOR] x base fare and rounded to the paisa.
+
+    repricer = FareRepricer(pool)
+    repricer.run()      # every upcoming flight: one SELECT, one pass, one UPDATE
+
+run() reads the upcoming flights in one query along the (status, departure_time) index.
+It prices them a column at a time (the tiers are bisect lookups, the route demand one
+aggregation over the batch) and puts only the fares that changed into a temporary table.
+A single UPDATE ... JOIN then writes them all. Bookings no longer touch flight fares, so
+fares follow the load with the repricer's interval as lag (the 'reprice' job, see jobs.py).
+
+price() prices one flight with the same rules, for quotes and for the per-row comparison
+in benchmarks/bench_pricing.py.
+"""
+import bisect
+import time
+
+import mysql.connector
+
+# (lower bound, multiplier): the highest bound <= the value applies
+LOAD_TIERS = ((0.0, 1.00), (0.50, 1.10), (0.80, 1.25), (0.95, 1.40))
+DAYS_TIERS = ((0, 1.30), (3, 1.15), (7, 1.05), (21, 1.00), (60, 0.95))
+# Route demand: multiplier moves DEMAND_WEIGHT per unit of load above / below the network's,
+# within DEMAND_RANGE
+DEMAND_WEIGHT = 0.30
+DEMAND_RANGE = (0.90, 1.15)
+MIN_FACTOR = 0.85
+MAX_FACTOR = 2.00
+
+_LOAD_BREAKS = [bound for bound, _ in LOAD_TIERS]
+_LOAD_MULTS = [mult for _, mult in LOAD_TIERS]
+_DAYS_BREAKS = [bound for bound, _ in DAYS_TIERS]
+_DAYS_MULTS = [mult for _, mult in DAYS_TIERS]
+
+UPCOMING_SQL = """
+    SELECT f.flight_id, f.route_id, f.base_fare, f.current_fare,
+           TIMESTAMPDIFF(SECOND, NOW(), f.departure_time) / 86400 AS days_left,
+           fi.capacity, fi.seats_booked
+    FROM flight f
+    JOIN flight_inventory fi ON fi.flight_id = f.flight_id
+    WHERE f.status = 'Scheduled' AND f.departure_time > NOW() AND f.base_fare IS NOT NULL
+"""
+
+
+def load_multiplier(load):
+    return _LOAD_MULTS[bisect.bisect_right(_LOAD_BREAKS, load) - 1]
+
+
+def days_multiplier(days_left):
+    return _DAYS_MULTS[max(bisect.bisect_right(_DAYS_BREAKS, days_left) - 1, 0)]
+
+
+def demand_multiplier(route_load, network_load):
+    low, high = DEMAND_RANGE
+    return min(max(1 + DEMAND_WEIGHT * (route_load - network_load), low), high)
+
+
+def price(base_fare, seats_booked, capacity, days_left, route_load=0.0, network_load=0.0):
+    """The fare of one flight."""
+    load = seats_booked / capacity if capacity else 0.0
+    factor = (load_multiplier(load) * days_multiplier(days_left)
+              * demand_multiplier(route_load, network_load))
+    return round(float(base_fare) * min(max(factor, MIN_FACTOR), MAX_FACTOR), 2)
+
+
+def route_loads(route_ids, seats_booked, capacities):
+    """({route_id: booked / capacity over its flights}, booked / capacity over all of them)."""
+    booked, seats = {}, {}
+    for route_id, b, c in zip(route_ids, seats_booked, capacities):
+        booked[route_id] = booked.get(route_id, 0) + b
+        seats[route_id] = seats.get(route_id, 0) + c
+    total_seats = sum(seats.values())
+    network = sum(booked.values()) / total_seats if total_seats else 0.0
+    return {r: booked[r] / seats[r] if seats[r] else 0.0 for r in seats}, network
+
+
+def reprice(flight_ids, route_ids, base_fares, seats_booked, capacities, days_left):
+    """
+    Fares of a batch of flights, given as columns.
+    :return: list of fares, in the order of flight_ids
+    """
+    routes, network = route_loads(route_ids, seats_booked, capacities)
+    load_mult = [load_multiplier(b / c if c else 0.0) for b, c in zip(seats_booked, capacities)]
+    days_mult = [days_multiplier(d) for d in days_left]
+    demand = {r: demand_multiplier(load, network) for r, load in routes.items()}
+    return [round(float(base) * min(max(lm * dm * demand[r], MIN_FACTOR), MAX_FACTOR), 2)
+            for base, lm, dm, r in zip(base_fares, load_mult, days_mult, route_ids)]
+
+
+class FareRepricer:
+    """
+    :param pool: a ConnectionPool
+    :param chunk: rows per INSERT into the temporary table of new fares
+    :param on_change: called with no arguments when a run changed any fare (cache invalidation)
+    """
+
+    def __init__(self, pool, chunk=5000, on_change=None):
+        self.pool = pool
+        self.chunk = chunk
+        self.on_change = on_change
+
+    def __call__(self):
+        return self.run()
+
+    def run(self):
+        """Reprices every upcoming flight. Returns the run stats."""
+        stats = {'flights': 0, 'changed': 0}
+        conn = self.pool.get_connection()
+        cursor = conn.cursor()
+        try:
+            started = time.perf_counter()
+            cursor.execute(UPCOMING_SQL)
+            rows = cursor.fetchall()
+            stats['read_seconds'] = round(time.perf_counter() - started, 3)
+            stats['flights'] = len(rows)
+            if not rows:
+                return stats
+
+            started = time.perf_counter()
+            flight_ids, route_ids, base_fares, current, days_left, capacities, booked = zip(*rows)
+            fares = reprice(flight_ids, route_ids, base_fares, booked, capacities, [float(d) for d in days_left])
+            changed = [(flight_id, fare) for flight_id, fare, old in zip(flight_ids, fares, current)
+                       if old is None or fare != float(old)]
+            stats['compute_seconds'] = round(time.perf_counter() - started, 3)
+            stats['changed'] = len(changed)
+
+            started = time.perf_counter()
+            if changed:
+                write_fares(cursor, changed, self.chunk)
+                conn.commit()
+            stats['write_seconds'] = round(time.perf_counter() - started, 3)
+        except mysql.connector.Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+        if self.on_change and stats['changed']:
+            self.on_change()
+        return stats
+
+
+def write_fares(cursor, fares, chunk=5000):
+    """
+    Sets flight.current_fare for [(flight_id, fare)] with one UPDATE. Opens a transaction
+    the caller commits (or rolls back).
+    """
+    cursor.execute("""
+        CREATE TEMPORARY TABLE IF NOT EXISTS fare_update (
+          flight_id INT PRIMARY KEY,
+          fare DECIMAL(10,2) NOT NULL
+        )
+    """)
+    cursor.execute("TRUNCATE TABLE fare_update")
+    cursor.execute("START TRANSACTION")
+    for start in range(0, len(fares), chunk):
+        cursor.executemany("INSERT INTO fare_update (flight_id, fare) VALUES (%s, %s)", fares[start:start + chunk])
+    cursor.execute("""
+        UPDATE flight f
+        JOIN fare_update u ON u.flight_id = f.flight_id
+        SET f.current_fare = u.fare
+        WHERE f.status = 'Scheduled'
+    """)
+    return cursor.rowcount
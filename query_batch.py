@@ -0,0 +1,80 @@
+"""
+Runs a page's independent reads at the same time instead of one after another.
+
+    batch = QueryBatch(borrow, max_workers=8)
+    outcomes = batch.run({
+        'flights': ("SELECT * FROM upcoming_flights ORDER BY departure_time", ()),
+        'role': ("SELECT role FROM employee WHERE emp_id = %s", (emp_id,), 'one'),
+    })
+    outcomes['flights'].result
+
+Each statement borrows its own pooled connection on a shared worker thread, so the page
+waits for the slowest query rather than for their sum. Statements are name=(sql, params)
+for fetchall or name=(sql, params, 'one') for fetchone, as in async_db.AsyncDatabase.gather.
+
+Nothing here touches Flask: the caller records timings and reports errors, see db_batch in
+app.py.
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import mysql.connector
+
+# result: rows (or one row), None on error; seconds: execution time; wait: time spent
+# borrowing the connection; error: the mysql.connector.Error raised, if any
+Outcome = namedtuple('Outcome', 'result seconds wait rows error')
+
+
+class QueryBatch:
+    """
+    :param borrow: borrow(read) -> a pooled connection whose close() gives it back;
+                   read is False when the statements must see the primary
+    :param max_workers: threads shared by every batch in the process; further
+                        statements queue for a free thread
+    """
+
+    def __init__(self, borrow, max_workers=8):
+        self.borrow = borrow
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='query_batch')
+
+    def _execute(self, spec, read):
+        sql, params = spec[0], spec[1]
+        fetchone = spec[2:] == ('one',)
+        started = time.perf_counter()
+        try:
+            conn = self.borrow(read)
+        except mysql.connector.Error as err:
+            return Outcome(None, 0.0, time.perf_counter() - started, 0, err)
+        wait = time.perf_counter() - started
+
+        started = time.perf_counter()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(sql, params or ())
+            if fetchone:
+                result = cursor.fetchone()
+                rows = 1 if result else 0
+            else:
+                result = cursor.fetchall()
+                rows = len(result)
+            return Outcome(result, time.perf_counter() - started, wait, rows, None)
+        except mysql.connector.Error as err:
+            return Outcome(None, time.perf_counter() - started, wait, 0, err)
+        finally:
+            cursor.close()
+            conn.close()
+
+    def run(self, statements, read=True):
+        """
+        Runs the statements concurrently and waits for all of them.
+        :param statements: {name: (sql, params[, 'one'])}
+        :param read: False to run them on the primary
+        :return: {name: Outcome}, in the order given
+        """
+        futures = {name: self._executor.submit(self._execute, spec, read) for name, spec in statements.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
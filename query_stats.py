@@ -0,0 +1,139 @@
+"""
+Request-scoped database instrumentation.
+
+db_query and get_db_connection report every statement and pool checkout here. Per
+request it keeps the query count, total and per-statement time, rows returned and time
+spent waiting for a pooled connection, then:
+
+  * adds a Server-Timing header (db, pool and app durations) to the response
+  * writes one JSON line per statement slower than SLOW_QUERY_MS to the slow-query log
+  * logs a warning when the same statement runs more than N_PLUS_ONE_THRESHOLD times in
+    one request, which is almost always a query inside a loop (N+1)
+
+Statements are grouped by fingerprint: whitespace is collapsed and IN (%s, %s, ...)
+lists are folded, so the same query with different parameters counts as one statement.
+"""
+import json
+import logging
+import re
+import time
+
+from flask import g, has_app_context, has_request_context, request
+
+slow_log = logging.getLogger('airline.slow_query')
+n_plus_one_log = logging.getLogger('airline.n_plus_one')
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER_LIST = re.compile(r'%s(\s*,\s*%s)+')
+
+
+def fingerprint(sql):
+    """Normalizes a statement so repeated executions with different parameters match."""
+    return _PLACEHOLDER_LIST.sub('%s, ...', _WHITESPACE.sub(' ', sql).strip())
+
+
+class RequestStats:
+    """Database activity of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.pool_wait = 0.0
+        self.by_statement = {}  # fingerprint -> [count, seconds]
+
+    def record(self, sql, seconds, rows):
+        self.queries += 1
+        self.db_seconds += seconds
+        self.rows += max(rows or 0, 0)
+        entry = self.by_statement.setdefault(fingerprint(sql), [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def repeated(self, threshold):
+        """Statements run more than threshold times, most frequent first."""
+        hits = [(sql, count, seconds) for sql, (count, seconds) in self.by_statement.items() if count > threshold]
+        return sorted(hits, key=lambda h: -h[1])
+
+    def server_timing(self):
+        app_ms = (time.perf_counter() - self.started) * 1000
+        return (f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries, {self.rows} rows", '
+                f'pool;dur={self.pool_wait * 1000:.1f}, '
+                f'app;dur={app_ms:.1f}')
+
+
+class QueryInstrumentation:
+    """
+    Hooks request start/end and collects what db_query reports.
+
+    Settings: SLOW_QUERY_MS, SLOW_QUERY_LOG (file path, default stderr),
+    N_PLUS_ONE_THRESHOLD and SERVER_TIMING.
+    """
+
+    def __init__(self, app=None):
+        self.slow_seconds = 0.2
+        self.n_plus_one = 5
+        self.server_timing = True
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.slow_seconds = app.config.get('SLOW_QUERY_MS', 200) / 1000
+        self.n_plus_one = app.config.get('N_PLUS_ONE_THRESHOLD', 5)
+        self.server_timing = app.config.get('SERVER_TIMING', True)
+
+        if not slow_log.handlers:
+            path = app.config.get('SLOW_QUERY_LOG')
+            handler = logging.FileHandler(path) if path else logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            slow_log.addHandler(handler)
+            slow_log.setLevel(logging.INFO)
+            slow_log.propagate = False
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def current(self):
+        """The running request's stats, or None outside a request."""
+        if not has_app_context():
+            return None
+        stats = g.get('_query_stats')
+        if stats is None:
+            stats = g._query_stats = RequestStats()
+        return stats
+
+    def _start(self):
+        g._query_stats = RequestStats()
+
+    def record_pool_wait(self, seconds):
+        stats = self.current()
+        if stats is not None:
+            stats.pool_wait += seconds
+
+    def record(self, sql, params, seconds, rows):
+        """Called by db_query after every statement."""
+        stats = self.current()
+        if stats is not None:
+            stats.record(sql, seconds, rows)
+        if seconds >= self.slow_seconds:
+            slow_log.info(json.dumps({
+                'ts': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'ms': round(seconds * 1000, 1),
+                'rows': rows,
+                'endpoint': request.endpoint if has_request_context() else None,
+                'sql': fingerprint(sql),
+                # Parameter values are left out, they include login credentials
+                'params': len(params or ()),
+            }))
+
+    def _finish(self, response):
+        stats = g.pop('_query_stats', None)
+        if stats is None:
+            return response
+        for sql, count, seconds in stats.repeated(self.n_plus_one):
+            n_plus_one_log.warning("Possible N+1 on %s %s: %d x %s (%.1f ms total)",
+                                   request.method, request.path, count, sql, seconds * 1000)
+        if self.server_timing:
+            response.headers['Server-Timing'] = stats.server_timing()
+        return response
@@ -0,0 +1,188 @@
+"""
+Rendered-page reuse for the dashboards: data versions, template fragments and conditional GET.
+
+Every table a page is rendered from has a data version in the cache shared by the worker
+processes. It is the time the table last changed, set by bump() on the app's write paths
+and the worker's jobs. A version expires after `ttl` seconds and then starts again from the
+current time, so a change made outside the app (a seed, a script, a trigger on another
+table) shows up within `ttl` seconds at the latest.
+
+Fragments: a template block wrapped in
+
+    {% cache 'admin_vendor_rows', 'vendor' %} ... {% endcache %}
+
+is rendered once and its HTML is reused until a version of the listed tables changes (the
+first argument names the fragment and may be any expression, e.g. 'rows:' ~ terminal).
+Fragments are shared by the worker processes too.
+
+Conditional GET: a view decorated with
+
+    @render_cache.conditional(lambda: ('booking', 'flight'))
+
+answers with an ETag (user, URL, table versions, templates) and a Last-Modified date (the
+newest version). A browser revalidating a copy that is still current gets 304 Not Modified
+before the view runs, so neither its queries nor the template are run. Return None from the
+callback for pages that must always be rendered. Responses that show flashed messages
+get no validators, since a 304 would show the flashes again. Views that don't go through
+the decorator (the ASGI app's native pages) call revalidate() and stamp() themselves.
+"""
+import datetime
+import hashlib
+import os
+import time
+from functools import wraps
+
+from flask import get_flashed_messages, make_response, request, session
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+class RenderCache:
+    """
+    :param cache: a cachelib cache shared across workers
+    :param ttl: seconds a data version (and a rendered fragment) lives without a change
+    """
+
+    def __init__(self, cache, ttl=60):
+        self.cache = cache
+        self.ttl = ttl
+        self.templates_version = ''
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        app.jinja_env.add_extension(FragmentCacheExtension)
+        app.jinja_env.render_cache = self
+        # Fragments and ETags made from older templates must not be reused after a deploy
+        stamps = []
+        for root, _, files in os.walk(os.path.join(app.root_path, app.template_folder)):
+            stamps.extend(f"{name}:{os.stat(os.path.join(root, name)).st_mtime_ns}" for name in sorted(files))
+        self.templates_version = hashlib.blake2b(','.join(sorted(stamps)).encode(), digest_size=8).hexdigest()
+
+    # ---- data versions ----
+
+    def versions(self, *tables):
+        """{table: version}, the version being the time the table last changed (or its version started)."""
+        found = self.cache.get_many(*(f'data_version:{t}' for t in tables))
+        versions = {}
+        for table, version in zip(tables, found):
+            if version is None:
+                # add() keeps the version another worker may have just started
+                self.cache.add(f'data_version:{table}', time.time(), timeout=self.ttl)
+                version = self.cache.get(f'data_version:{table}') or time.time()
+            versions[table] = version
+        return versions
+
+    def bump(self, *tables):
+        """Records a change to the given tables: pages and fragments rendered from them are stale."""
+        now = time.time()
+        for table in tables:
+            self.cache.set(f'data_version:{table}', now, timeout=self.ttl)
+
+    # ---- fragments ----
+
+    def fragment(self, name, tables, render):
+        """The cached HTML of a fragment, rendered with render() on a miss."""
+        versions = self.versions(*tables)
+        key = 'fragment:' + hashlib.blake2b(
+            repr((self.templates_version, str(name), sorted(versions.items()))).encode(), digest_size=16).hexdigest()
+        html = self.cache.get(key)
+        if html is None:
+            self.misses += 1
+            html = str(render())
+            self.cache.set(key, html, timeout=self.ttl)
+        else:
+            self.hits += 1
+        return Markup(html)
+
+    # ---- conditional GET ----
+
+    def validators(self, tables):
+        """(ETag, Last-Modified) of the current request's page when rendered from the given tables."""
+        versions = self.versions(*tables)
+        user = (session.get('role'), session.get('user_id'))
+        etag = hashlib.blake2b(repr((self.templates_version, user, request.full_path,
+                                     sorted(versions.items()))).encode(), digest_size=16).hexdigest()
+        newest = max(versions.values(), default=time.time())
+        return etag, datetime.datetime.fromtimestamp(int(newest), datetime.timezone.utc)
+
+    def revalidate(self, tables):
+        """
+        The conditional-GET check of the current request, for a page rendered from the given
+        tables: (etag, last_modified, current), current being True when the browser's copy
+        can be answered with 304. None when the page must not be cached (no tables, not a
+        GET, or flashed messages waiting to be shown).
+        """
+        if tables is None or request.method != 'GET' or session.get('_flashes'):
+            return None
+        etag, last_modified = self.validators(tables)
+        if request.if_none_match:
+            current = request.if_none_match.contains(etag)
+        else:
+            current = request.if_modified_since is not None and last_modified <= request.if_modified_since
+        return etag, last_modified, current
+
+    def stamp(self, response, checked):
+        """
+        Adds the validators from revalidate() to a 304 or to the rendered page. A page that
+        failed or showed flashed messages is returned unchanged.
+        """
+        if checked is None or (response.status_code != 304 and
+                               (response.status_code != 200 or get_flashed_messages())):
+            return response
+        etag, last_modified, _ = checked
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.vary.add('Cookie')
+        return response
+
+    def conditional(self, tables_for):
+        """
+        Decorator adding ETag / Last-Modified to a GET view and answering 304 when the
+        browser's copy is current.
+        :param tables_for: called in the request, returns the tables the page shows (None = don't cache)
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                checked = self.revalidate(tables_for())
+                if checked is None:
+                    return f(*args, **kwargs)
+                if checked[2]:
+                    return self.stamp(make_response('', 304), checked)
+                return self.stamp(make_response(f(*args, **kwargs)), checked)
+            return decorated_function
+        return decorator
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'fragment_hits': self.hits,
+            'fragment_misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'ttl': self.ttl,
+        }
+
+
+class FragmentCacheExtension(Extension):
+    """The {% cache name, table, ... %} ... {% endcache %} tag (see RenderCache.fragment)."""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', [args[0], nodes.List(args[1:])]),
+                               [], [], body).set_lineno(lineno)
+
+    def _render(self, name, tables, caller):
+        render_cache = getattr(self.environment, 'render_cache', None)
+        if render_cache is None:
+            return caller()
+        return render_cache.fragment(name, tables, caller)
@@ -0,0 +1,253 @@
+"""
+Bulk flight schedule import.
+
+Reads a CSV or JSON schedule, validates every row against the route and aircraft
+catalogues, then loads it chunk by chunk:
+
+  1. the chunk goes into a temporary staging table with one multi-row INSERT
+  2. inside one transaction it is copied into flight with INSERT ... SELECT, and the audit
+     rows, flight_inventory and seat_map rows are written set-based from the same staging
+     table
+
+The per-row flight triggers are skipped with the @bulk_import session variable, so a
+chunk of thousands of flights costs a handful of statements instead of thousands.
+
+Accepted columns: flight_no, airline, route_id (or source_code + dest_code),
+aircraft_id (or registration_no), departure_time, arrival_time, base_fare, gate (optional).
+"""
+import csv
+import datetime
+import decimal
+import io
+import json
+import time
+
+import mysql.connector
+
+DEFAULT_CHUNK_SIZE = 5000
+
+STAGE_DDL = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS flight_import_stage (
+      flight_no VARCHAR(20) PRIMARY KEY,
+      airline VARCHAR(100),
+      route_id INT,
+      aircraft_id INT,
+      departure_time DATETIME,
+      arrival_time DATETIME,
+      base_fare DECIMAL(10,2),
+      gate VARCHAR(30)
+    )
+"""
+
+STAGE_COLUMNS = ('flight_no', 'airline', 'route_id', 'aircraft_id',
+                 'departure_time', 'arrival_time', 'base_fare', 'gate')
+
+COPY_SQL = """
+    INSERT INTO flight (flight_no, airline, route_id, aircraft_id, departure_time, arrival_time,
+                        base_fare, current_fare, gate)
+    SELECT flight_no, airline, route_id, aircraft_id, departure_time, arrival_time,
+           base_fare, base_fare, gate
+    FROM flight_import_stage
+"""
+
+AUDIT_SQL = """
+    INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+    SELECT 'flight', f.flight_id, 'CREATE', CONCAT('New flight: ', f.flight_no), %s
+    FROM flight_import_stage s
+    JOIN flight f ON f.flight_no = s.flight_no
+"""
+
+INVENTORY_SQL = """
+    INSERT INTO flight_inventory (flight_id, capacity, seats_booked, seats_remaining)
+    SELECT f.flight_id, COALESCE(ac.capacity, 0), 0, COALESCE(ac.capacity, 0)
+    FROM flight_import_stage s
+    JOIN flight f ON f.flight_no = s.flight_no
+    LEFT JOIN aircraft ac ON ac.aircraft_id = f.aircraft_id
+"""
+
+SEAT_MAP_SQL = """
+    INSERT INTO seat_map (flight_id, layout, capacity, occupied)
+    SELECT f.flight_id, seat_layout(ac.model), COALESCE(ac.capacity, 0),
+           UNHEX(REPEAT('00', CEIL(COALESCE(ac.capacity, 0) / 8)))
+    FROM flight_import_stage s
+    JOIN flight f ON f.flight_no = s.flight_no
+    LEFT JOIN aircraft ac ON ac.aircraft_id = f.aircraft_id
+"""
+
+DATETIME_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M')
+
+
+class ImportReport:
+    def __init__(self):
+        self.inserted = 0
+        self.errors = []  # (row number, message)
+        self.seconds = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.inserted / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        return (f"{self.inserted} flights imported in {self.seconds:.2f}s "
+                f"({self.rows_per_sec:,.0f} rows/sec), {len(self.errors)} rows rejected")
+
+
+def read_schedule(stream, fmt):
+    """
+    Parses a schedule file into a list of dicts.
+    :param stream: a text file object
+    :param fmt: 'csv' or 'json' (a JSON array, or one object per line)
+    """
+    if fmt == 'csv':
+        return list(csv.DictReader(stream))
+    text = stream.read().strip()
+    if text.startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _parse_datetime(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(str(value).strip(), fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"bad datetime '{value}'")
+
+
+class ScheduleImporter:
+    """
+    :param pool: the app's MySQL connection pool
+    :param catalogue: CatalogueCache used to validate routes and aircraft
+    """
+
+    def __init__(self, pool, catalogue, chunk_size=DEFAULT_CHUNK_SIZE, changed_by='Admin'):
+        self.pool = pool
+        self.catalogue = catalogue
+        self.chunk_size = chunk_size
+        self.changed_by = changed_by
+
+    def _lookups(self):
+        routes = self.catalogue.routes()
+        aircraft = self.catalogue.aircraft()
+        return (
+            {r['route_id'] for r in routes},
+            {((r['source_code'] or '').upper(), (r['dest_code'] or '').upper()): r['route_id'] for r in routes},
+            {a['aircraft_id'] for a in aircraft},
+            {(a['registration_no'] or '').upper(): a['aircraft_id'] for a in aircraft},
+        )
+
+    def validate(self, rows):
+        """Returns (staged tuples, [(row number, error)]) for the parsed schedule rows."""
+        route_ids, route_by_codes, aircraft_ids, aircraft_by_reg = self._lookups()
+        valid, errors, seen = [], [], set()
+
+        for n, row in enumerate(rows, start=1):
+            try:
+                flight_no = (row.get('flight_no') or '').strip()
+                if not flight_no:
+                    raise ValueError("missing flight_no")
+                if flight_no in seen:
+                    raise ValueError(f"duplicate flight_no {flight_no} in file")
+
+                if row.get('route_id'):
+                    route_id = int(row['route_id'])
+                    if route_id not in route_ids:
+                        raise ValueError(f"unknown route_id {route_id}")
+                else:
+                    codes = ((row.get('source_code') or '').upper(), (row.get('dest_code') or '').upper())
+                    route_id = route_by_codes.get(codes)
+                    if route_id is None:
+                        raise ValueError(f"unknown route {codes[0]}->{codes[1]}")
+
+                if row.get('aircraft_id'):
+                    aircraft_id = int(row['aircraft_id'])
+                    if aircraft_id not in aircraft_ids:
+                        raise ValueError(f"unknown aircraft_id {aircraft_id}")
+                else:
+                    aircraft_id = aircraft_by_reg.get((row.get('registration_no') or '').upper())
+                    if aircraft_id is None:
+                        raise ValueError(f"unknown aircraft {row.get('registration_no')}")
+
+                departure = _parse_datetime(row.get('departure_time'))
+                arrival = _parse_datetime(row.get('arrival_time'))
+                if arrival <= departure:
+                    raise ValueError("arrival_time must be after departure_time")
+
+                fare = decimal.Decimal(str(row.get('base_fare')))
+                if fare <= 0:
+                    raise ValueError("base_fare must be positive")
+            except (ValueError, TypeError, decimal.InvalidOperation) as err:
+                errors.append((n, str(err)))
+                continue
+
+            seen.add(flight_no)
+            valid.append((n, (flight_no, row.get('airline'), route_id, aircraft_id,
+                              departure, arrival, fare, row.get('gate') or None)))
+        return valid, errors
+
+    def _existing_flight_nos(self, cursor, flight_nos):
+        cursor.execute(f"SELECT flight_no FROM flight WHERE flight_no IN ({', '.join(['%s'] * len(flight_nos))})",
+                       tuple(flight_nos))
+        return {row[0] for row in cursor.fetchall()}
+
+    def _load_chunk(self, conn, cursor, chunk):
+        cursor.execute("DELETE FROM flight_import_stage")
+        placeholders = '(' + ', '.join(['%s'] * len(STAGE_COLUMNS)) + ')'
+        cursor.execute(
+            f"INSERT INTO flight_import_stage ({', '.join(STAGE_COLUMNS)}) VALUES "
+            + ', '.join([placeholders] * len(chunk)),
+            tuple(value for row in chunk for value in row)
+        )
+        conn.start_transaction()
+        cursor.execute(COPY_SQL)
+        inserted = cursor.rowcount
+        cursor.execute(AUDIT_SQL, (self.changed_by,))
+        cursor.execute(INVENTORY_SQL)
+        cursor.execute(SEAT_MAP_SQL)
+        conn.commit()
+        return inserted
+
+    def run(self, rows):
+        """Validates and imports the schedule rows. Returns an ImportReport."""
+        report = ImportReport()
+        started = time.perf_counter()
+        valid, report.errors = self.validate(rows)
+
+        conn = self.pool.get_connection()
+        cursor = conn.cursor(buffered=True)
+        try:
+            cursor.execute(STAGE_DDL)
+            cursor.execute("SET @bulk_import = 1")
+            for i in range(0, len(valid), self.chunk_size):
+                chunk = valid[i:i + self.chunk_size]
+                existing = self._existing_flight_nos(cursor, [row[0] for _, row in chunk])
+                report.errors.extend((n, f"flight_no {row[0]} already exists") for n, row in chunk if row[0] in existing)
+                chunk = [row for _, row in chunk if row[0] not in existing]
+                if not chunk:
+                    continue
+                try:
+                    report.inserted += self._load_chunk(conn, cursor, chunk)
+                except mysql.connector.Error as err:
+                    conn.rollback()
+                    report.errors.append((0, f"chunk starting at {chunk[0][0]} rolled back: {err.msg}"))
+        finally:
+            try:
+                cursor.execute("SET @bulk_import = NULL")
+                cursor.execute("DROP TEMPORARY TABLE IF EXISTS flight_import_stage")
+            except mysql.connector.Error:
+                pass
+            cursor.close()
+            conn.close()
+
+        report.errors.sort(key=lambda e: e[0])
+        report.seconds = time.perf_counter() - started
+        return report
+
+
+def read_upload(file_storage):
+    """Parses an uploaded schedule (werkzeug FileStorage), picking the format from the file name."""
+    fmt = 'json' if file_storage.filename.lower().endswith(('.json', '.ndjson')) else 'csv'
+    return read_schedule(io.TextIOWrapper(file_storage.stream, encoding='utf-8-sig'), fmt)
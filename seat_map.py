@@ -0,0 +1,149 @@
+"""
+Per-flight seat maps.
+
+Every flight has one seat_map row holding its cabin layout (seat letters per row, e.g.
+'ABCDEF') and an `occupied` bitmap with one bit per seat, seat i being row i // width + 1,
+letter layout[i % width]. Booking sets the seat's bit with a single conditional UPDATE
+inside book_flight, and cancellation clears it, so claiming or releasing a seat never
+looks at the booking table. Listing the free seats is a pass over ~capacity / 8 bytes.
+
+The SQL side (seat_index, seat_label, bitmap_set, bitmap_first_clear) lives in
+migrations/; the helpers here mirror it for the API and for rebuilding the maps.
+"""
+import re
+
+SEAT_RE = re.compile(r'^\s*(\d+)\s*([A-Za-z])\s*$')
+WIDE_BODY_RE = re.compile(r'747|767|777|787|A330|A350|A380', re.IGNORECASE)
+
+SEAT_MAP_SQL = "SELECT flight_id, layout, capacity, occupied FROM seat_map WHERE flight_id = %s"
+
+# Recreates the map of every flight that lacks one (e.g. flights imported before seat maps)
+MISSING_MAPS_SQL = """
+    INSERT INTO seat_map (flight_id, layout, capacity, occupied)
+    SELECT f.flight_id, seat_layout(ac.model), COALESCE(ac.capacity, 0),
+           UNHEX(REPEAT('00', CEIL(COALESCE(ac.capacity, 0) / 8)))
+    FROM flight f
+    LEFT JOIN aircraft ac ON ac.aircraft_id = f.aircraft_id
+    LEFT JOIN seat_map sm ON sm.flight_id = f.flight_id
+    WHERE sm.flight_id IS NULL
+"""
+
+
+def seat_layout(model):
+    """Seat letters per row: 3-3-3 on wide-bodies, 3-3 on everything else (as seat_layout() in SQL)."""
+    return 'ABCDEFHJK' if WIDE_BODY_RE.search(model or '') else 'ABCDEF'
+
+
+def seat_index(label, layout, capacity):
+    """Returns the bit index of a seat label such as '12A', or None if the aircraft has no such seat."""
+    match = SEAT_RE.match(label or '')
+    if not match:
+        return None
+    row, letter = int(match.group(1)), match.group(2).upper()
+    col = layout.find(letter)
+    if row < 1 or col < 0:
+        return None
+    index = (row - 1) * len(layout) + col
+    return index if index < capacity else None
+
+
+def seat_label(index, layout):
+    return f"{index // len(layout) + 1}{layout[index % len(layout)]}"
+
+
+def is_taken(bitmap, index):
+    return bool(bitmap[index >> 3] & (1 << (index & 7)))
+
+
+def build_bitmap(indices, capacity):
+    """Builds an occupied bitmap with the given seat indices set."""
+    bitmap = bytearray((capacity + 7) // 8)
+    for index in indices:
+        bitmap[index >> 3] |= 1 << (index & 7)
+    return bytes(bitmap)
+
+
+def free_indices(bitmap, capacity):
+    """Yields the index of every free seat, skipping full bytes eight seats at a time."""
+    for byte_no, byte in enumerate(bitmap):
+        if byte == 0xFF:
+            continue
+        base = byte_no << 3
+        for bit in range(8):
+            if base + bit >= capacity:
+                return
+            if not byte & (1 << bit):
+                yield base + bit
+
+
+def first_free(bitmap, capacity):
+    return next(free_indices(bitmap, capacity), None)
+
+
+class SeatMaps:
+    """
+    Read side of the seat maps for the passenger pages.
+    :param query: the app's db_query helper
+    """
+
+    def __init__(self, query):
+        self.query = query
+
+    def for_flight(self, flight_id):
+        """Returns the flight's cabin as rows of seats, or None if it has no seat map."""
+        row = self.query(SEAT_MAP_SQL, (flight_id,), fetchone=True)
+        if not row:
+            return None
+        layout, capacity, bitmap = row['layout'], row['capacity'], bytes(row['occupied'] or b'')
+        bitmap = bitmap.ljust((capacity + 7) // 8, b'\x00')
+        width = len(layout)
+
+        rows = []
+        for index in range(capacity):
+            if index % width == 0:
+                rows.append([])
+            rows[-1].append({'seat': seat_label(index, layout), 'taken': is_taken(bitmap, index)})
+        available = [seat_label(i, layout) for i in free_indices(bitmap, capacity)]
+        return {
+            'flight_id': row['flight_id'],
+            'layout': layout,
+            'capacity': capacity,
+            'available_count': len(available),
+            'available': available,
+            'next_free': available[0] if available else None,
+            'rows': rows,
+        }
+
+
+def rebuild(pool):
+    """
+    Recreates missing seat maps and recomputes every bitmap from the confirmed bookings.
+    Returns (maps created, maps rewritten, [(booking_id, seat_no)] that fit no seat).
+    """
+    conn = pool.get_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(MISSING_MAPS_SQL)
+        created = cursor.rowcount
+        cursor.execute("SELECT flight_id, layout, capacity FROM seat_map")
+        maps = {row['flight_id']: row for row in cursor.fetchall()}
+
+        taken, unmapped = {flight_id: [] for flight_id in maps}, []
+        cursor.execute("SELECT booking_id, flight_id, seat_no FROM booking WHERE status = 'Confirmed'")
+        for row in cursor.fetchall():
+            seat_map = maps.get(row['flight_id'])
+            index = seat_index(row['seat_no'], seat_map['layout'], seat_map['capacity']) if seat_map else None
+            if index is None:
+                unmapped.append((row['booking_id'], row['seat_no']))
+            else:
+                taken[row['flight_id']].append(index)
+
+        cursor.executemany(
+            "UPDATE seat_map SET occupied = %s WHERE flight_id = %s",
+            [(build_bitmap(taken[flight_id], m['capacity']), flight_id) for flight_id, m in maps.items()]
+        )
+        conn.commit()
+        return created, len(maps), unmapped
+    finally:
+        cursor.close()
+        conn.close()
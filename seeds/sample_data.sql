@@ -0,0 +1,103 @@
+-- Sample data for a fresh database, loaded by `python migrate.py --fast-bootstrap` (or --seed).
+INSERT INTO admin (username, password, full_name)
+VALUES ('admin', 'scrypt:16384:8:1$927ZW0drh2TBclg3$b73bb466c96e59530983377b7935fb9f4b334710d4246a279d70b26e889ee03c1efd7ad59b4dfe581fed6d0965ff5cd9f0d6cf9bd6ba97f0abe560fdc48f7011', 'System Administrator');  -- password: admin123
+
+INSERT INTO passenger (name, email, phone, passport_no, dob, total_points)
+VALUES 
+('Alice Smith', 'alice@example.com', '555-1234', 'P12345678', '1990-05-15', 150),
+('Bob Johnson', 'bob@example.com', '555-5678', 'P87654321', '1985-11-30', 50),
+('Charlie Brown', 'charlie@example.com', '555-9012', 'P55566777', '2000-01-20', 0);
+
+INSERT INTO employee (name, role, email, date_of_joining, salary)
+VALUES
+('John Doe', 'Pilot', 'john.doe@airline.com', '2018-06-01', 120000.00),
+('Jane Roe', 'Flight Attendant', 'jane.roe@airline.com', '2019-03-15', 55000.00),
+('Mike Ross', 'Maintenance Engineer', 'mike.ross@airline.com', '2017-10-20', 75000.00),
+('Sarah Jenkins', 'Ground Staff', 'sarah.j@airline.com', '2021-02-10', 48000.00);
+
+INSERT INTO aircraft (registration_no, model, capacity, last_maintenance, status)
+VALUES 
+('VT-A320','Airbus A320', 160, '2025-10-15 08:00:00', 'Operational'),
+('VT-B737','Boeing 737', 180, '2025-10-01 10:00:00', 'Operational'),
+('VT-A321','Airbus A321neo', 220, '2025-09-20 12:00:00', 'Operational'),
+('VT-B787','Boeing 787', 250, '2025-10-22 14:00:00', 'Maintenance');
+
+INSERT INTO route (source_code, source_name, dest_code, dest_name, distance_km)
+VALUES 
+('BOM', 'Mumbai', 'DEL', 'New Delhi', 1400),
+('BOM', 'Mumbai', 'BLR', 'Bengaluru', 830),
+('DEL', 'New Delhi', 'JFK', 'New York', 11760),
+('LHR', 'London', 'BOM', 'Mumbai', 7170),
+('BLR', 'Bengaluru', 'SIN', 'Singapore', 3600);
+
+-- Note: We are on Oct 26, 2025.
+INSERT INTO flight (flight_no, airline, route_id, aircraft_id, departure_time, arrival_time, base_fare, gate)
+VALUES
+-- Flight 1: Already departed
+('AI-202','Air India', 1, 1, '2025-10-25 18:00:00', '2025-10-25 20:15:00', 6500.00, 'T1-A6'),
+-- Flight 2: Upcoming today
+('6E-505','IndiGo', 2, 2, '2025-10-26 09:30:00', '2025-10-26 11:00:00', 3200.00, 'T2-B2'),
+-- Flight 3: Upcoming in 2 days
+('UK-901','Vistara', 1, 3, '2025-10-28 14:00:00', '2025-10-28 16:20:00', 7000.00, 'T2-C1'),
+-- Flight 4: International
+('BA-198','British Airways', 4, 3, '2025-11-01 10:00:00', '2025-11-01 23:30:00', 45000.00, 'T5-G8');
+
+-- Bookings, written the way book_flight would. The seeds load in one transaction and
+-- book_flight commits, so they are plain rows here.
+-- Alice books flight 6E-505, Bob books flight UK-901
+INSERT INTO booking (passenger_id, flight_id, seat_no, status, booked_by)
+VALUES
+(1, 2, '12A', 'Confirmed', 'Passenger'),
+(2, 3, '5F', 'Confirmed', 'Passenger');
+
+INSERT INTO payment (booking_id, amount, method)
+SELECT b.booking_id, f.current_fare, 'Internal'
+FROM booking b
+JOIN flight f ON f.flight_id = b.flight_id;
+
+UPDATE passenger p
+JOIN (
+    SELECT b.passenger_id, SUM(FLOOR(pay.amount / 100)) AS points
+    FROM booking b
+    JOIN payment pay ON pay.booking_id = b.booking_id
+    GROUP BY b.passenger_id
+) earned ON earned.passenger_id = p.passenger_id
+SET p.total_points = p.total_points + earned.points;
+
+-- One booking per flight, so each seat map row takes one seat
+UPDATE seat_map sm
+JOIN booking b ON b.flight_id = sm.flight_id AND b.status = 'Confirmed'
+SET sm.occupied = bitmap_set(sm.occupied, seat_index(b.seat_no, sm.layout, sm.capacity), TRUE);
+
+INSERT INTO audit_log (table_name, record_id, action_type, description, changed_by)
+SELECT 'booking', booking_id, 'CREATE', 'New booking (seed data)', booked_by
+FROM booking;
+
+CALL sp_reconcile_flight_inventory();
+CALL sp_rebuild_passenger_summary();
+CALL sp_refresh_dashboard_counters();
+
+-- Staff Assignments
+INSERT INTO staff_assignment (emp_id, flight_id, role_on_flight)
+VALUES
+(1, 2, 'Captain'), (2, 2, 'Lead Attendant'),
+(1, 3, 'Captain'), (2, 3, 'Lead Attendant');
+
+-- Payroll
+INSERT INTO payroll (emp_id, base_salary, bonus, deductions, pay_date)
+VALUES
+(1, 120000.00, 5000.00, 1500.00, '2025-10-01 00:00:00'),
+(2, 55000.00, 1000.00, 500.00, '2025-10-01 00:00:00'),
+(3, 75000.00, 0.00, 800.00, '2025-10-01 00:00:00');
+
+-- Vendors
+INSERT INTO vendor (name, amenity_type, terminal, location_desc)
+VALUES
+('Starbucks', 'Cafe', 'T2', 'Near Gate B5'),
+('Duty Free Shoppe', 'Retail', 'T2', 'International Departures Hall'),
+('Plaza Premium Lounge', 'Lounge', 'T1', 'Domestic, After Security');
+
+-- Maintenance
+INSERT INTO maintenance (aircraft_id, emp_id, notes, maintenance_date)
+VALUES
+(4, 3, 'Scheduled C-Check. Engine diagnostics.', '2025-10-22 14:00:00');
@@ -0,0 +1,60 @@
+"""
+Profiles of logged-in users, cached so protected pages know who the user is without a query.
+
+Login already reads the user's row, so it stores the profile here. Pages then read it
+from the cache shared by every worker process (for instance the employee's job role,
+which decides whether the maintenance page is shown). Only identity fields are kept,
+never passwords or salaries.
+
+An entry goes away on logout, and wherever the row is edited (edit_employee) the app
+calls evict(). A cache miss (expiry, or a user logged in on a second device after a
+logout) reads the row again.
+"""
+
+FIELDS = {
+    'admin': ('admin_id', 'username', 'full_name'),
+    'passenger': ('passenger_id', 'name', 'email', 'passport_no'),
+    'employee': ('emp_id', 'name', 'role', 'email'),
+}
+
+QUERIES = {
+    'admin': "SELECT admin_id, username, full_name FROM admin WHERE admin_id = %s",
+    'passenger': "SELECT passenger_id, name, email, passport_no FROM passenger WHERE passenger_id = %s",
+    'employee': "SELECT emp_id, name, role, email FROM employee WHERE emp_id = %s",
+}
+
+
+class UserProfiles:
+    """
+    :param query: the app's db_query helper (or anything with the same signature)
+    :param cache: a cachelib cache shared across workers
+    :param ttl: seconds a profile stays cached
+    """
+
+    def __init__(self, query, cache, ttl=3600):
+        self.query = query
+        self.cache = cache
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(role, user_id):
+        return f'profile:{role}:{user_id}'
+
+    def store(self, role, user_id, row):
+        """Caches the profile from a row the caller already has (e.g. the login query's)."""
+        profile = {field: row.get(field) for field in FIELDS[role]}
+        self.cache.set(self._key(role, user_id), profile, timeout=self.ttl)
+        return profile
+
+    def get(self, role, user_id):
+        """The user's profile, read from the database on a cache miss. None if the user is gone."""
+        profile = self.cache.get(self._key(role, user_id))
+        if profile is None:
+            row = self.query(QUERIES[role], (user_id,), fetchone=True)
+            if row is None:
+                return None
+            profile = self.store(role, user_id, row)
+        return profile
+
+    def evict(self, role, user_id):
+        self.cache.delete(self._key(role, user_id))